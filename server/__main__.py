@@ -1,10 +1,13 @@
 from pathlib import Path
+import multiprocessing
 
 import click
 import uvicorn
 
-from server.core.config import set_root_path, with_config_parser
-from server.core.web import app
+from server.core.config import set_root_path, with_config_parser, with_config_loader, prepare_worker_environment
+from server.core.routing import with_browser_open
+from server.core.web import create_app
+from server.snapshot import ensure_snapshot
 
 from server.logging_conf import configure_logging, logging
 
@@ -21,9 +24,32 @@ def _get_port() -> int:
     return _DEFAULT_PORT
 
 
+def _ensure_snapshot_in_process(har_folder: Path):
+    configure_logging()
+    set_root_path(har_folder)
+    ensure_snapshot()
+
+
+def _run_workers(har_folder: Path, port: int, workers: int):
+    # The snapshot is built in a separate process so the parent process, which only supervises
+    # the workers, does not hold on to a copy of the route table.
+    process = multiprocessing.Process(target=_ensure_snapshot_in_process, args=(har_folder,))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        return print('Failed to build the route snapshot required by the worker processes.')
+
+    prepare_worker_environment(har_folder)
+    with_browser_open(with_config_loader(with_config_parser())).open_browser_once_listening()
+
+    _log.info(f'Starting server on port: [{port}] with [{workers}] workers.')
+    uvicorn.run('server.core.web.workers:create_worker_app', factory=True, host='0.0.0.0', port=port, workers=workers)
+
+
 @click.command()
 @click.argument('har')
-def run(har: str):
+@click.option('--workers', default=1, type=click.IntRange(min=1), help='The number of worker processes to serve requests with.')
+def run(har: str, workers: int):
 
     configure_logging()
 
@@ -33,8 +59,11 @@ def run(har: str):
     set_root_path(har_folder)
 
     port = _get_port()
+    if workers > 1:
+        return _run_workers(har_folder, port, workers)
+
     _log.info(f'Starting server on port: [{port}].')
-    uvicorn.run(app, host='0.0.0.0', port=port)
+    uvicorn.run(create_app(), host='0.0.0.0', port=port)
 
 
 if __name__ == '__main__':
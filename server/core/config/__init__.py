@@ -2,3 +2,4 @@ from .root import get_root_path as get_root_path, set_root_path as set_root_path
 from .config_loader import with_config_loader as with_config_loader, ConfigLoader as ConfigLoader, reset_config_loader as reset_config_loader
 from .config_parser import with_config_parser as with_config_parser, ConfigParser as ConfigParser, reset_config_parser as reset_config_parser
 from .models import AppConfig as AppConfig
+from .workers import prepare_worker_environment as prepare_worker_environment, is_worker_process as is_worker_process, get_worker_root_path as get_worker_root_path
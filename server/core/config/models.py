@@ -1,4 +1,4 @@
-from typing import List, Any
+from typing import List, Any, Literal
 
 from pydantic import BaseModel
 
@@ -9,10 +9,31 @@ class Debug(BaseModel):
     enable_debug_logs: bool = False
     log_stack_traces: bool = False
     enable_metrics: bool = False
+    enable_miss_log: bool = False
+    miss_log_size: int = 50
+
+
+class MatchingFallback(BaseModel):
+    enabled: bool = False
+    max_candidates: int = 64
+
+
+class Replay(BaseModel):
+    mode: Literal['first', 'sequence', 'round-robin'] = 'first'
+    client_header: str | None = None
+    max_cursors: int = 10000
 
 
 class Matchers(BaseModel):
     rules: List[str] = []
+    path_templates: List[str] = []
+    ignored_json_paths: List[str] = []
+    default_origin: str = ''
+    fallback: MatchingFallback = MatchingFallback()
+    replay: Replay = Replay()
+
+    def model_post_init(self, context: Any):
+        self.default_origin = self.default_origin.lower()
 
 
 # ===== ===== ===== Request Rewrite ===== ===== =====
@@ -37,6 +58,7 @@ class RequestRewriteRules(BaseModel):
 # ===== ===== ===== Response Rewrite ===== ===== =====
 class ResponseRuleConfig(BaseModel):
     excluded_domains: List[str] = []
+    preserve_origins: bool = False
     removable_headers: List[str] = []
     removable_cookies: List[str] = []
 
@@ -47,6 +69,8 @@ class ResponseRuleConfig(BaseModel):
 
 class ResponseRewriteRules(BaseModel):
     rules: List[str] = []
+    lazy: bool = False
+    lazy_memoize_to_disk: bool = False
 
     config: ResponseRuleConfig = ResponseRuleConfig()
 # ===== ===== ===== Response Rewrite ===== ===== =====
@@ -68,6 +92,16 @@ class ExclusionRules(BaseModel):
 # ===== ===== ===== Exclusions ===== ===== =====
 
 
+class Ingestion(BaseModel):
+    processes: int = 1
+
+
+class Serving(BaseModel):
+    lean_asgi: bool = False
+    resolution_cache_size: int = 1024
+    negative_cache_size: int = 1024
+
+
 class Rewrite(BaseModel):
     request: RequestRewriteRules = RequestRewriteRules()
     response: ResponseRewriteRules = ResponseRewriteRules()
@@ -79,6 +113,8 @@ class AppConfig(BaseModel):
     request_matching: Matchers = Matchers()
     rewrite: Rewrite = Rewrite()
     exclusions: ExclusionRules = ExclusionRules()
+    ingestion: Ingestion = Ingestion()
+    serving: Serving = Serving()
 
     port: int = 8080
     open_browser: str | None = None
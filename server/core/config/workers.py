@@ -0,0 +1,38 @@
+from pathlib import Path
+from typing import Final
+import os
+
+
+_ROOT_PATH_VARIABLE: Final[str] = 'HAR_SERVER_WORKER_ROOT_PATH'
+
+
+def prepare_worker_environment(root_path: Path):
+    """
+    Exposes the root path to the worker processes through an environment variable. Worker processes
+    are spawned rather than forked so they do not inherit the root path set in the parent process.
+
+    :param root_path: The root folder containing the .har files.
+    """
+    os.environ[_ROOT_PATH_VARIABLE] = str(root_path.absolute())
+
+
+def is_worker_process() -> bool:
+    """
+    Checks if the server is being run using multiple worker processes.
+
+    :return: True if the worker environment has been prepared, otherwise false.
+    """
+    return _ROOT_PATH_VARIABLE in os.environ
+
+
+def get_worker_root_path() -> Path:
+    """
+    Gets the root path previously exposed by prepare_worker_environment.
+
+    :return: The root folder containing the .har files.
+    :raise RuntimeError: if the worker environment has not been prepared.
+    """
+    root_path = os.environ.get(_ROOT_PATH_VARIABLE)
+    if root_path is None:
+        raise RuntimeError('The root path has not been shared with the worker processes.')
+    return Path(root_path)
@@ -0,0 +1,55 @@
+from typing import Annotated, Any, Callable, Dict, TypeVar, get_args, get_origin
+import inspect
+
+from fastapi.params import Depends
+
+
+T = TypeVar('T')
+
+
+class UnresolvableDependencyException(Exception):
+
+    _MESSAGE_TEMPLATE = 'Parameter [{}] of [{}] is not annotated with a Depends marker and cannot be resolved.'
+
+    def __init__(self, parameter: str, factory: Callable):
+        super().__init__(UnresolvableDependencyException._MESSAGE_TEMPLATE.format(parameter, factory.__name__))
+
+
+def resolve_dependency(factory: Callable[..., T]) -> T:
+    """
+    Resolves the result of a with_* factory outside of a FastAPI request, such as from the lean ASGI application
+    or the snapshot command, by walking the same Annotated[..., Depends(...)] graph FastAPI walks.
+
+    Each factory is called with keyword arguments, as FastAPI does, so the lru_cache of each factory is hit using
+    the same key and the resolved components are the same instances the FastAPI endpoints receive.
+
+    :param factory: The with_* factory to resolve.
+    :return: The result of calling the factory with all of its dependencies resolved.
+    :raise UnresolvableDependencyException: if a parameter of a factory in the graph is not annotated with Depends.
+    """
+    return _resolve(factory, dict())
+
+
+def _resolve(factory: Callable[..., T], resolved: Dict[Callable, Any]) -> T:
+    if factory in resolved:
+        return resolved[factory]
+
+    arguments: Dict[str, Any] = dict()
+    for name, parameter in inspect.signature(factory).parameters.items():
+        dependency = _get_dependency(parameter)
+        if dependency is None:
+            raise UnresolvableDependencyException(name, factory)
+        arguments[name] = _resolve(dependency, resolved)
+
+    result = factory(**arguments)
+    resolved[factory] = result
+    return result
+
+
+def _get_dependency(parameter: inspect.Parameter) -> Callable | None:
+    if get_origin(parameter.annotation) is not Annotated:
+        return None
+    for metadata in get_args(parameter.annotation)[1:]:
+        if isinstance(metadata, Depends):
+            return metadata.dependency
+    return None
@@ -4,9 +4,19 @@ from .models import (
     HarEntry as HarEntry,
     HarEntryRequest as HarEntryRequest,
     HarEntryResponse as HarEntryResponse,
+    BodyHandle as BodyHandle,
+    FreezableModel as FreezableModel,
+    FrozenModelError as FrozenModelError,
     HarParseError as HarParseError,
+    RenderedResponse as RenderedResponse,
     ResponseContent as ResponseContent,
     NameValuePair as NameValuePair,
     RequestPostData as RequestPostData,
     SupportedBodyContentTypes as SupportedBodyContentTypes
 )
+from .origin import (
+    ORIGIN_PATH_PREFIX as ORIGIN_PATH_PREFIX,
+    get_origin_of_url as get_origin_of_url,
+    get_origin_of_host as get_origin_of_host,
+    split_origin_path as split_origin_path
+)
@@ -1,12 +1,12 @@
 from typing import Generator
 from functools import lru_cache
 from pathlib import Path
-import json
 import logging
 import os
 
 from server.core.config import get_root_path
-from .models import HarFileContent, HarParseError
+from .models import HarEntry, HarParseError
+from .har_stream_reader import HarStreamReader
 
 
 _log = logging.getLogger(__file__)
@@ -14,46 +14,60 @@ _log = logging.getLogger(__file__)
 
 class HarParser:
 
-    def get_har_file_contents(self) -> Generator[HarFileContent, None, None]:
+    def get_har_file_paths(self) -> Generator[Path, None, None]:
         """
-        Parses and returns the contents of a .har file one by one.
+        Finds and returns the path to each .har file one by one.
 
-        This will also search through nested directories to find addition files with the .har extension.
+        This will also search through nested directories to find addition files with the .har extension. Files
+        and directories are visited in sorted order so the order of the paths is stable between runs.
 
-        :return: The list of parsed har files. This will not yield any entries if the .har file
-            does not contain any entries.
-        :raise HarParseError: if an error occurs while parsing any of the har files. This error will contain
-            the original error that caused the parsing to fail.
+        :return: The paths of each of the .har files found within the root folder.
         """
 
         har_root_folder = get_root_path()
         _log.info(f'Parsing har files from folder: [{har_root_folder}]')
-        for root, _, files in os.walk(har_root_folder):
-            for file_name in files:
+        for root, directories, files in os.walk(har_root_folder):
+            directories.sort()
+            for file_name in sorted(files):
                 if not file_name.endswith('.har'):
                     _log.info(f'Skipping file since it does not have a .har extension: [{file_name}]')
                     continue
 
-                file_path = Path(root).joinpath(file_name)
-                _log.info(f'Parsing har file: [{file_path}]')
+                yield Path(root).joinpath(file_name)
 
-                parsed_har_file = self._parse_har_file(file_path)
-                if len(parsed_har_file.log.entries) == 0:
-                    _log.info(f'Excluding har file since it has no entries: [{file_path}]')
-                    continue
+    def get_har_file_contents(self) -> Generator[Generator[HarEntry, None, None], None, None]:
+        """
+        Parses and returns the contents of each .har file one by one.
+
+        The contents of each file are themselves a generator that parses and yields the entries of the file
+        one at a time so no more than a single entry needs to be held in memory while the file is being read.
+
+        :return: A generator, per .har file, yielding the parsed entries of the file. The generator will not yield
+            any entries if the .har file does not contain any entries.
+        :raise HarParseError: if an error occurs while parsing any of the har files. This error will contain
+            the original error that caused the parsing to fail.
+        """
+        for file_path in self.get_har_file_paths():
+            yield self.parse_har_file(file_path)
 
-                yield parsed_har_file
+    def parse_har_file(self, har_path: Path) -> Generator[HarEntry, None, None]:
+        """
+        Incrementally parses and yields the entries of a single .har file.
 
-    def _parse_har_file(self, har_path: Path) -> HarFileContent:
+        :param har_path: The path to the .har file to parse.
+        :return: A generator yielding each of the entries within the har file.
+        :raise HarParseError: if an error occurs while parsing the har file.
+        """
+        _log.info(f'Parsing har file: [{har_path}]')
         try:
-            return self._do_parse_har_file(har_path)
+            yield from self._do_parse_har_file(har_path)
         except Exception as e:
             raise HarParseError(f'Could not parse har file [{har_path}]', e) from e
-    
-    def _do_parse_har_file(self, har_path: Path) -> HarFileContent:
+
+    def _do_parse_har_file(self, har_path: Path) -> Generator[HarEntry, None, None]:
         with open(har_path, 'r', encoding='utf-8') as file:
-            contents = ''.join(file.readlines())
-            return HarFileContent(**json.loads(contents))
+            for entry in HarStreamReader(file).read_entries():
+                yield HarEntry(**entry)
 
 
 @lru_cache()
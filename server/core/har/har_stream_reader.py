@@ -0,0 +1,139 @@
+from typing import Any, Dict, Generator, TextIO, Final
+import json
+import re
+
+
+_WHITESPACE: Final[re.Pattern[str]] = re.compile(r'[ \t\n\r]*')
+
+
+class HarStreamReader:
+    """
+    Incrementally reads the entries from the log.entries array of a .har file.
+
+    Only the entry currently being decoded, plus a single read chunk, is held in memory at any one time.
+    Every other property of the .har file is decoded and immediately discarded.
+    """
+
+    _DEFAULT_CHUNK_SIZE: Final[int] = 1024 * 1024
+
+    def __init__(self, file: TextIO, chunk_size: int = _DEFAULT_CHUNK_SIZE):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._position = 0
+        self._eof = False
+
+    def read_entries(self) -> Generator[Dict[str, Any], None, None]:
+        """
+        Reads and yields each of the raw entries from the log.entries array one by one.
+
+        :return: A generator yielding the decoded JSON of each entry.
+        :raise ValueError: if the file is not valid JSON or does not contain the log.entries array.
+        """
+        found_entries = False
+        for key in self._iterate_object():
+            if key != 'log':
+                self._read_value()
+                continue
+            for log_key in self._iterate_object():
+                if log_key != 'entries':
+                    self._read_value()
+                    continue
+                found_entries = True
+                for _ in self._iterate_array():
+                    entry = self._read_value()
+                    if not isinstance(entry, dict):
+                        raise ValueError(f'Expected har entry to be an object but found: [{type(entry).__name__}]')
+                    yield entry
+
+        if not found_entries:
+            raise ValueError('Har file does not contain a log.entries property.')
+
+    def _iterate_object(self) -> Generator[str, None, None]:
+        # Yields each key of the object. The caller is expected to consume the value
+        # associated with the key before requesting the next key.
+        self._expect('{')
+        if self._peek() == '}':
+            self._position += 1
+            return
+        while True:
+            key = self._read_value()
+            if not isinstance(key, str):
+                raise ValueError(f'Expected object key to be a string but found: [{key}]')
+            self._expect(':')
+            yield key
+            separator = self._next_character()
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f'Expected [,] or [}}] but found: [{separator}]')
+
+    def _iterate_array(self) -> Generator[None, None, None]:
+        # Yields once for each element of the array. The caller is expected to consume
+        # the element before requesting the next one.
+        self._expect('[')
+        if self._peek() == ']':
+            self._position += 1
+            return
+        while True:
+            yield
+            separator = self._next_character()
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f'Expected [,] or []] but found: [{separator}]')
+
+    def _read_value(self) -> Any:
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._read_more()
+                continue
+
+            # A number or literal that ends exactly on the end of the buffer may continue
+            # into the next chunk so it needs to be decoded again once more content is available.
+            if end == len(self._buffer) and not self._eof:
+                self._read_more()
+                continue
+
+            self._position = end
+            return value
+
+    def _expect(self, expected: str):
+        actual = self._next_character()
+        if actual != expected:
+            raise ValueError(f'Expected [{expected}] but found: [{actual}]')
+
+    def _next_character(self) -> str:
+        character = self._peek()
+        self._position += 1
+        return character
+
+    def _peek(self) -> str:
+        self._skip_whitespace()
+        if self._position >= len(self._buffer):
+            raise ValueError('Unexpected end of har file.')
+        return self._buffer[self._position]
+
+    def _skip_whitespace(self):
+        while True:
+            match = _WHITESPACE.match(self._buffer, self._position)
+            self._position = match.end()  # type: ignore
+            if self._position < len(self._buffer) or self._eof:
+                return
+            self._read_more()
+
+    def _read_more(self):
+        # Discard everything that has already been consumed and grow the read size with
+        # the amount of pending content so large values are decoded in a linear number of passes.
+        self._buffer = self._buffer[self._position:]
+        self._position = 0
+        chunk = self._file.read(max(self._chunk_size, len(self._buffer)))
+        if chunk == '':
+            self._eof = True
+        self._buffer = self._buffer + chunk
@@ -1,15 +1,16 @@
 from __future__ import annotations
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Tuple
 from urllib.parse import unquote, urlparse
 import uuid
 import json
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 
 class SupportedBodyContentTypes:
     APPLICATION_JSON = 'application/json'
     FORM_URL_ENCODED = 'application/x-www-form-urlencoded'
+    MULTIPART_FORM_DATA = 'multipart/form-data'
 
 
 class HarParseError(Exception):
@@ -18,7 +19,62 @@ class HarParseError(Exception):
         super().__init__(message, e)
 
 
-class NameValuePair(BaseModel):
+class FrozenModelError(Exception):
+
+    def __init__(self, model: BaseModel, name: str):
+        super().__init__(f'Cannot set [{name}] on frozen [{type(model).__name__}]. Use mutable_copy to make a modifiable copy.')
+
+
+class FreezableModel(BaseModel):
+    """
+    A model that can be modified freely until it is frozen. Once frozen any attempt to set an attribute
+    on the model, or on any of the models nested within it, will raise a FrozenModelError.
+
+    This allows entries to be built up and rewritten in place while the .har files are processed and then
+    shared between requests, without making a defensive copy for each request, once processing completes.
+    """
+
+    _frozen: bool = PrivateAttr(default=False)
+
+    def __setattr__(self, name: str, value: Any):
+        if self._frozen and name != '_frozen':
+            raise FrozenModelError(self, name)
+        super().__setattr__(name, value)
+
+    def freeze(self):
+        """
+        Freezes this model and every model nested within it.
+        """
+        self._set_frozen(True)
+
+    def is_frozen(self) -> bool:
+        return self._frozen
+
+    def mutable_copy(self):
+        """
+        Creates a deep copy of this model that is not frozen so it can be modified without affecting the original.
+
+        :return: The modifiable copy.
+        """
+        copy = self.model_copy(deep=True)
+        copy._set_frozen(False)
+        return copy
+
+    def _set_frozen(self, frozen: bool):
+        self._frozen = frozen
+        for name in type(self).model_fields:
+            _set_frozen(getattr(self, name), frozen)
+
+
+def _set_frozen(value: Any, frozen: bool):
+    if isinstance(value, FreezableModel):
+        value._set_frozen(frozen)
+    elif isinstance(value, list):
+        for item in value:
+            _set_frozen(item, frozen)
+
+
+class NameValuePair(FreezableModel):
     name: str
     value: str
 
@@ -26,7 +82,7 @@ class NameValuePair(BaseModel):
         self.name = self.name.lower()
 
 
-class RequestPostData(BaseModel):
+class RequestPostData(FreezableModel):
     model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
 
     mime_type: str = Field(alias='mimeType', default='')
@@ -34,25 +90,30 @@ class RequestPostData(BaseModel):
     text: str = ''
     parsed_json: Dict[str, Any] = Field(exclude=True, default={})
 
+    # The digest of a body that was digested while it was being received, rather than being kept as text,
+    # such as a binary or multipart body of an incoming request.
+    body_digest: str = Field(exclude=True, default='')
+
     def model_post_init(self, context: Any):
         self.mime_type = self.mime_type.lower()
         if 'application/json' in self.mime_type:
             self.parsed_json = json.loads(self.text)
 
 
-class RequestHashes(BaseModel):
+class RequestHashes(FreezableModel):
     query_params: str = ''
     headers: str = ''
     cookies: str = ''
     post_data: str = ''
 
 
-class HarEntryRequest(BaseModel):
+class HarEntryRequest(FreezableModel):
     model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
 
     method: str
     url: str
     path: str = Field(default='')
+    origin: str | None = Field(default=None)
     query_params: List[NameValuePair] = Field(alias='queryString')
     headers: List[NameValuePair]
     cookies: List[NameValuePair]
@@ -61,11 +122,16 @@ class HarEntryRequest(BaseModel):
     hashes: RequestHashes = Field(exclude=True, default=RequestHashes())
 
     def model_post_init(self, context: Any):
-        self.path = unquote(urlparse(self.url).path)
+        if self.path == '' or self.origin is None:
+            parsed_url = urlparse(self.url)
+            if self.path == '':
+                self.path = unquote(parsed_url.path)
+            if self.origin is None:
+                self.origin = parsed_url.hostname or ''
         self.method = self.method.lower()
 
 
-class ResponseContent(BaseModel):
+class ResponseContent(FreezableModel):
     model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
 
     mime_type: str = Field(alias='mimeType', default='')
@@ -73,7 +139,21 @@ class ResponseContent(BaseModel):
     text: str = ''
 
 
-class HarEntryResponse(BaseModel):
+class BodyHandle(FreezableModel):
+    offset: int
+    length: int
+
+
+class RenderedResponse(FreezableModel):
+    status: int
+    media_type: str
+    raw_headers: List[Tuple[bytes, bytes]]
+
+    # Only populated when the response body was not moved into the body store.
+    body: bytes = b''
+
+
+class HarEntryResponse(FreezableModel):
     model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
 
     status: int
@@ -81,8 +161,15 @@ class HarEntryResponse(BaseModel):
     cookies: List[NameValuePair]
     content: ResponseContent
 
+    # The location of the decoded response body within the body store. Once the
+    # body has been stored the content text is cleared.
+    body_handle: BodyHandle | None = Field(exclude=True, default=None)
+
+    # The ready to send representation of the response produced by the response renderer.
+    rendered: RenderedResponse | None = Field(exclude=True, default=None)
+
 
-class HarEntry(BaseModel):
+class HarEntry(FreezableModel):
     model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
 
     id: str = ''
@@ -0,0 +1,52 @@
+from typing import Final, FrozenSet, Tuple
+import urllib.parse
+
+
+# Prefixes the path of a URL whose origin was replaced with localhost, when the origins are preserved, so
+# the original origin of the URL can be recovered from the path of the request the browser sends back.
+ORIGIN_PATH_PREFIX: Final[str] = '/__origin__/'
+
+# Host names the server itself is reachable at. A request sent to one of these hosts does not identify
+# the origin the request was originally sent to.
+_LOCAL_HOST_NAMES: Final[FrozenSet[str]] = frozenset(['localhost', '127.0.0.1', '0.0.0.0', '::1'])
+
+
+def get_origin_of_url(url: str) -> str:
+    """
+    Gets the origin, the lowercase host name without the protocol or port, of the URL.
+
+    :param url: An absolute URL or a protocol relative URL such as //www.example.com/index.html.
+    :return: The origin of the URL or an empty string if the URL has no host.
+    """
+    return urllib.parse.urlsplit(url).hostname or ''
+
+
+def split_origin_path(path: str) -> Tuple[str, str]:
+    """
+    Splits a path prefixed with the origin path prefix, such as /__origin__/www.example.com/index.html,
+    into the origin and the original path.
+
+    :param path: The decoded path of an incoming request.
+    :return: A tuple of the origin and the path with the origin prefix removed. If the path is not prefixed
+        the origin will be an empty string and the path will be returned as is.
+    """
+    if not path.startswith(ORIGIN_PATH_PREFIX):
+        return '', path
+    origin, _, remainder = path[len(ORIGIN_PATH_PREFIX):].partition('/')
+    return origin.lower(), '/' + remainder
+
+
+def get_origin_of_host(host: str | None) -> str:
+    """
+    Gets the origin identified by the Host header of an incoming request.
+
+    :param host: The value of the Host header, if any.
+    :return: The origin of the host or an empty string if there is no Host header or the Host header
+        refers to the server itself, for example localhost:8080.
+    """
+    if not host:
+        return ''
+    origin = get_origin_of_url('//' + host)
+    if origin in _LOCAL_HOST_NAMES:
+        return ''
+    return origin
@@ -1 +1,2 @@
 from .metrics import MetricRecorder as MetricRecorder, with_metric_recorder as with_metric_recorder
+from .miss_log import MissLog as MissLog, with_miss_log as with_miss_log
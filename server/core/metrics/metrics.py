@@ -27,6 +27,11 @@ class MetricRecorder:
 
     def __init__(self, config_loader: ConfigLoader):
         self._recorded: List[Metric] = []
+        self._duplicate_bodies = 0
+        self._duplicate_body_bytes = 0
+        self._resolution_cache_hits = 0
+        self._resolution_cache_misses = 0
+        self._resolution_cache_known_misses = 0
         self._lock = Lock()
         self._is_enabled = config_loader.get_app_config().debug.enable_metrics
 
@@ -38,10 +43,79 @@ class MetricRecorder:
             else:
                 self._recorded.append(Metric(entry_id, response, [request]))
 
+    def record_duplicate_body(self, size: int):
+        """
+        Records that a response body was identical to a body that had already been stored and
+        so the memory required to store the body was saved.
+
+        :param size: The size, in bytes, of the duplicate body.
+        """
+        with self._lock:
+            self._duplicate_bodies = self._duplicate_bodies + 1
+            self._duplicate_body_bytes = self._duplicate_body_bytes + size
+
+    def record_resolution_cache_lookup(self, hit: bool, known_miss: bool = False):
+        """
+        Records whether the entry for an incoming request was found in the resolution cache.
+
+        :param hit: True if the entry was found in the cache, otherwise false.
+        :param known_miss: True if the request was found in the cache of requests that did not match any entry.
+        """
+        with self._lock:
+            if hit:
+                self._resolution_cache_hits = self._resolution_cache_hits + 1
+            elif known_miss:
+                self._resolution_cache_known_misses = self._resolution_cache_known_misses + 1
+            else:
+                self._resolution_cache_misses = self._resolution_cache_misses + 1
+
     def get_metrics(self) -> List[Dict[str, Any]]:
         with self._lock:
             return [metric.to_dict() for metric in self._recorded]
 
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Gets the statistics of the body deduplication and the resolution cache.
+
+        :return: The body deduplication and resolution cache statistics.
+        """
+        with self._lock:
+            return {
+                'body_deduplication': self._get_body_deduplication(),
+                'resolution_cache': {
+                    'hits': self._resolution_cache_hits,
+                    'misses': self._resolution_cache_misses,
+                    'known_misses': self._resolution_cache_known_misses
+                }
+            }
+
+    def get_body_deduplication(self) -> Dict[str, int]:
+        """
+        Gets the number of duplicate response bodies found while processing the .har files and the
+        number of bytes saved by storing each of them only once.
+
+        :return: The body deduplication statistics.
+        """
+        with self._lock:
+            return self._get_body_deduplication()
+
+    def restore_body_deduplication(self, body_deduplication: Dict[str, int]):
+        """
+        Restores the body deduplication statistics previously returned by get_body_deduplication, such as
+        when the entries are loaded from a route snapshot rather than processed again.
+
+        :param body_deduplication: The body deduplication statistics to restore.
+        """
+        with self._lock:
+            self._duplicate_bodies = body_deduplication['duplicate_bodies']
+            self._duplicate_body_bytes = body_deduplication['bytes_saved']
+
+    def _get_body_deduplication(self) -> Dict[str, int]:
+        return {
+            'duplicate_bodies': self._duplicate_bodies,
+            'bytes_saved': self._duplicate_body_bytes
+        }
+
     def is_enabled(self) -> bool:
         return self._is_enabled
 
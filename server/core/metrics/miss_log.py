@@ -0,0 +1,69 @@
+from typing import Annotated, Any, Dict, Final, Tuple
+from functools import lru_cache
+from threading import Lock
+
+from fastapi import Depends
+
+from server.core.config import with_config_loader, ConfigLoader
+
+
+# The number of distinct paths tracked for each path reported. Tracking more paths than are reported keeps
+# the reported counts accurate even when there are many paths that are only missed occasionally.
+_TRACKED_PATHS_PER_REPORTED_PATH: Final[int] = 10
+
+
+class MissLog:
+    """
+    Counts the requests that did not match any entry by method and path so the most frequently missed
+    paths can be reported.
+
+    The number of paths tracked is bounded. Once the limit is reached a newly missed path replaces the
+    tracked path with the lowest count and inherits said count, so a frequently missed path can always
+    make its way into the report while the memory used stays constant.
+    """
+
+    def __init__(self, config_loader: ConfigLoader):
+        debug_config = config_loader.get_app_config().debug
+        self._is_enabled = debug_config.enable_miss_log
+        self._report_size = debug_config.miss_log_size
+        self._max_tracked = max(1, debug_config.miss_log_size * _TRACKED_PATHS_PER_REPORTED_PATH)
+        self._counts: Dict[Tuple[str, str], int] = dict()
+        self._total = 0
+        self._lock = Lock()
+
+    def is_enabled(self) -> bool:
+        return self._is_enabled
+
+    def record(self, method: str, path: str):
+        """
+        Records that a request did not match any entry.
+
+        :param method: The http method of the request.
+        :param path: The path of the request.
+        """
+        key = (method, path)
+        with self._lock:
+            self._total = self._total + 1
+            count = self._counts.get(key)
+            if count is None and len(self._counts) >= self._max_tracked:
+                evicted = min(self._counts, key=self._counts.__getitem__)
+                count = self._counts.pop(evicted)
+            self._counts[key] = (count or 0) + 1
+
+    def get_misses(self) -> Dict[str, Any]:
+        """
+        Gets the most frequently missed paths, ordered from most to least frequently missed.
+
+        :return: The total number of misses and the most frequently missed paths with their counts.
+        """
+        with self._lock:
+            top = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)[:self._report_size]
+            return {
+                'total': self._total,
+                'misses': [{'method': method, 'path': path, 'count': count} for (method, path), count in top]
+            }
+
+
+@lru_cache()
+def with_miss_log(config_loader: Annotated[ConfigLoader, Depends(with_config_loader)]) -> MissLog:
+    return MissLog(config_loader)
@@ -0,0 +1 @@
+from .response_renderer import ResponseRenderer as ResponseRenderer, with_response_renderer as with_response_renderer
@@ -0,0 +1,94 @@
+from typing import Annotated, Dict, Iterable
+from functools import lru_cache
+import base64
+
+from fastapi import Depends, Response
+
+from server.core.har import HarEntry, HarEntryResponse, RenderedResponse
+from server.core.storage import BodyStore, with_body_store
+
+
+class ResponseRenderer:
+    """
+    Converts the responses from the har entries into the status, raw headers, and body that are sent back
+    to the browser. Since the responses do not change once the .har files have been processed each response
+    can be rendered once, when loaded, rather than on every request.
+    """
+
+    def __init__(self, body_store: BodyStore):
+        self._body_store = body_store
+
+    def render_entries(self, entries: Iterable[HarEntry]):
+        """
+        Renders the response of each entry and attaches the result to the response so it can be served as is.
+
+        :param entries: The accumulated entries. The entries must not have been frozen yet.
+        """
+        for entry in entries:
+            entry.response.rendered = self.render(entry.response)
+
+    def render(self, response: HarEntryResponse) -> RenderedResponse:
+        """
+        Renders the response into the status and raw headers that will be sent back to the browser.
+
+        Responses with base64 encoded content are rendered with only a content type. The recorded
+        headers and cookies are only rendered for text responses.
+
+        :param response: The response to render.
+        :return: The rendered response.
+        """
+        if response.body_handle is not None:
+            body = b''
+            body_length = response.body_handle.length
+        else:
+            body = self._decode_content(response)
+            body_length = len(body)
+
+        if response.content.encoding == 'base64':
+            headers: Dict[str, str] = dict()
+        else:
+            headers = {header.name: header.value for header in response.headers}
+
+        # The body is not read from the body store while rendering so the content length is added
+        # here rather than being computed by the response from the empty body.
+        if 'content-length' not in headers and not (response.status < 200 or response.status in (204, 304)):
+            headers['content-length'] = str(body_length)
+
+        api_response = Response(
+            content=body,
+            status_code=response.status,
+            media_type=response.content.mime_type,
+            headers=headers
+        )
+        if response.content.encoding != 'base64':
+            for cookie in response.cookies:
+                api_response.set_cookie(cookie.name, cookie.value)
+
+        return RenderedResponse(
+            status=response.status,
+            media_type=response.content.mime_type,
+            raw_headers=api_response.raw_headers,
+            body=body
+        )
+
+    def get_body(self, response: HarEntryResponse, rendered: RenderedResponse) -> bytes:
+        """
+        Gets the body to send for a previously rendered response.
+
+        :param response: The response that was rendered.
+        :param rendered: The rendered form of the response.
+        :return: The body of the response.
+        """
+        if response.body_handle is not None:
+            return self._body_store.read(response.body_handle)
+        return rendered.body
+
+    def _decode_content(self, response: HarEntryResponse) -> bytes:
+        if response.content.encoding == 'base64':
+            return base64.b64decode(response.content.text)
+        return response.content.text.encode('utf-8')
+
+
+@lru_cache()
+def with_response_renderer(body_store: Annotated[BodyStore, Depends(with_body_store)]) -> ResponseRenderer:
+    return ResponseRenderer(body_store)
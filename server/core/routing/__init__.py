@@ -1,4 +1,5 @@
 from .route_map import RouteMap as RouteMap, with_route_map as with_route_map
 from .pre_processor import PreProcessor as PreProcessor, with_pre_processor as with_pre_processor
+from .har_loader import HarLoader as HarLoader, with_har_loader as with_har_loader
 from .request_mapper import RequestMapper as RequestMapper
-from .browser_open import BrowserOpen as BrowserOpen
+from .browser_open import BrowserOpen as BrowserOpen, with_browser_open as with_browser_open
@@ -2,11 +2,13 @@ from threading import Thread
 from typing import Annotated
 import webbrowser
 import logging
+import socket
+import time
 from functools import lru_cache
 
 from fastapi import Depends
 
-from server.core.config import ConfigLoader
+from server.core.config import ConfigLoader, is_worker_process
 from server.core.config.config_loader import with_config_loader
 
 
@@ -15,8 +17,11 @@ _log = logging.getLogger(__file__)
 
 class BrowserOpen:
 
+    _LISTEN_TIMEOUT_SECONDS = 60
+
     def __init__(self, config_loader: ConfigLoader):
         app_config = config_loader.get_app_config()
+        self._port = app_config.port
         self._url = app_config.open_browser
         if self._url is not None:
             self._url = self._url.replace('{port}', str(app_config.port))
@@ -24,12 +29,38 @@ class BrowserOpen:
     def _do_open_browser(self, url: str):
         webbrowser.open(url)
 
+    def _wait_then_open_browser(self, url: str):
+        deadline = time.monotonic() + BrowserOpen._LISTEN_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            try:
+                with socket.create_connection(('localhost', self._port), timeout=1):
+                    break
+            except OSError:
+                time.sleep(0.25)
+        self._do_open_browser(url)
+
     def open_browser_in_background(self):
-        if self._url is None:
+        """
+        Opens the configured URL in the browser from a background thread.
+
+        Nothing will be opened within a worker process since the parent process is responsible for
+        opening the browser once, rather than once per worker.
+        """
+        if self._url is None or is_worker_process():
             return
         _log.info(f'Launching browser with URL: [{self._url}]')
         Thread(target=self._do_open_browser, args=(self._url,)).start()
 
+    def open_browser_once_listening(self):
+        """
+        Opens the configured URL in the browser from a background thread once the server is accepting
+        connections on the configured port.
+        """
+        if self._url is None:
+            return
+        _log.info(f'Launching browser with URL: [{self._url}] once the server is listening.')
+        Thread(target=self._wait_then_open_browser, args=(self._url,), daemon=True).start()
+
 
 @lru_cache()
 def with_browser_open(config_loader: Annotated[ConfigLoader, Depends(with_config_loader)]) -> BrowserOpen:
@@ -0,0 +1,116 @@
+from typing import Annotated, List
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+import logging
+import multiprocessing
+
+from fastapi import Depends
+
+from server.core.config import ConfigLoader, with_config_loader, with_config_parser, get_root_path, set_root_path
+from server.core.har import HarParser, HarEntry, with_har_parser
+from server.core.rules.exclusions import with_exclusion_filter
+from server.core.rules.rewrite.request import with_request_rewriter
+from server.core.rules.matching import RequestMatcher
+from server.core.rules.rewrite.response import with_response_rewriter
+from server.core.storage import RouteSnapshot, with_route_snapshot
+from server.logging_conf import configure_logging
+
+from .pre_processor import PreProcessor, with_pre_processor
+
+
+_log = logging.getLogger(__file__)
+
+
+def _initialize_worker(root_path: Path):
+    # The workers are spawned rather than forked so they inherit neither the root path nor the logging configuration.
+    configure_logging()
+    set_root_path(root_path)
+
+
+def _process_har_file_in_worker(har_path: Path) -> List[HarEntry]:
+    config_loader = with_config_loader(with_config_parser())
+
+    # Each file gets its own matcher so duplicates within the file can be dropped before
+    # the response rewrite rules are applied. The final, cross file, de-duplication happens
+    # in the main process which is also where the bodies are moved into the body store.
+    pre_processor = PreProcessor(
+        with_exclusion_filter(config_loader),
+        with_request_rewriter(config_loader),
+        RequestMatcher(config_loader),
+        with_response_rewriter(config_loader),
+        None,
+        None
+    )
+    return pre_processor.process_content(with_har_parser().parse_har_file(har_path))
+
+
+class HarLoader:
+
+    def __init__(self,
+                 config_loader: ConfigLoader,
+                 har_parser: HarParser,
+                 pre_processor: PreProcessor,
+                 route_snapshot: RouteSnapshot):
+
+        self._har_parser = har_parser
+        self._pre_processor = pre_processor
+        self._route_snapshot = route_snapshot
+        self._processes = config_loader.get_app_config().ingestion.processes
+
+    def load(self):
+        """
+        Parses, filters, rewrites, and accumulates the entries of every .har file found within the root folder.
+
+        If an up-to-date route snapshot exists the entries will be loaded from the snapshot instead.
+
+        If more than one ingestion process has been configured the files will be parsed and rewritten in a pool
+        of worker processes. The entries are always accumulated in the order of the files so the first entry to
+        match a given request is the same regardless of how many processes are used.
+        """
+        if self._route_snapshot.load():
+            return
+        self._load_har_files()
+
+    def build_snapshot(self):
+        """
+        Processes every .har file, ignoring any existing snapshot, and saves the result as a new route snapshot.
+        """
+        self._load_har_files()
+        self._route_snapshot.save()
+
+    def _load_har_files(self):
+        if self._processes > 1:
+            self._load_in_parallel()
+        else:
+            self._load_serially()
+
+    def _load_serially(self):
+        for entries in self._har_parser.get_har_file_contents():
+            self._pre_processor.process_content(entries)
+
+    def _load_in_parallel(self):
+        har_paths = list(self._har_parser.get_har_file_paths())
+        _log.info(f'Processing [{len(har_paths)}] har files using [{self._processes}] processes.')
+
+        # The files are usually loaded lazily from within the thread pool of the server. Forking a process that is
+        # already running other threads can deadlock on a lock held by one of those threads, so the workers are
+        # spawned instead.
+        with ProcessPoolExecutor(max_workers=self._processes,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_initialize_worker,
+                                 initargs=(get_root_path(),)) as executor:
+
+            # map yields results in the order of the input paths regardless of which file
+            # finishes processing first.
+            for entries in executor.map(_process_har_file_in_worker, har_paths):
+                self._pre_processor.accumulate_processed_content(entries)
+
+
+@lru_cache()
+def with_har_loader(config_loader: Annotated[ConfigLoader, Depends(with_config_loader)],
+                    har_parser: Annotated[HarParser, Depends(with_har_parser)],
+                    pre_processor: Annotated[PreProcessor, Depends(with_pre_processor)],
+                    route_snapshot: Annotated[RouteSnapshot, Depends(with_route_snapshot)]) -> HarLoader:
+
+    return HarLoader(config_loader, har_parser, pre_processor, route_snapshot)
@@ -0,0 +1,112 @@
+from typing import Annotated, Dict
+from functools import lru_cache
+from threading import Lock
+import base64
+import logging
+
+from fastapi import Depends
+from starlette.concurrency import run_in_threadpool
+
+from server.core.config import ConfigLoader, with_config_loader
+from server.core.har import HarEntry, HarEntryResponse
+from server.core.rendering import ResponseRenderer, with_response_renderer
+from server.core.rules.rewrite.response import ResponseRewriter, with_response_rewriter
+from server.core.storage import BodyStore, with_body_store
+
+
+_log = logging.getLogger(__file__)
+
+
+class LazyResponseRewriter:
+    """
+    Rewrites the response of an entry the first time the entry is served rather than while the .har files are
+    processed, so the cost of the response rewrite rules is only paid for the entries that are actually requested.
+
+    Each response is rewritten at most once. The rewrite runs in the thread pool so the event loop keeps serving
+    other requests while a large response is rewritten. Concurrent requests for the same entry wait on a lock
+    specific to said entry while the first of them rewrites the response. The rewritten, rendered, and frozen
+    response is then memoized and served for every subsequent request. If memoizing to disk is enabled the
+    rewritten body is written to the body store rather than being held in memory.
+    """
+
+    def __init__(self,
+                 config_loader: ConfigLoader,
+                 response_rewriter: ResponseRewriter,
+                 response_renderer: ResponseRenderer,
+                 body_store: BodyStore):
+
+        self._response_rewriter = response_rewriter
+        self._response_renderer = response_renderer
+        self._body_store = body_store
+        self._is_enabled = response_rewriter.is_lazy()
+        self._memoize_to_disk = config_loader.get_app_config().rewrite.response.lazy_memoize_to_disk
+        self._rewritten: Dict[str, HarEntryResponse] = dict()
+        self._entry_locks: Dict[str, Lock] = dict()
+
+    def is_enabled(self) -> bool:
+        return self._is_enabled
+
+    async def get_response(self, entry: HarEntry) -> HarEntryResponse:
+        """
+        Gets the rewritten response of the entry, rewriting the response in the thread pool if this is the first
+        time the entry has been served.
+
+        :param entry: The frozen entry that matched the incoming request.
+        :return: The rewritten and rendered response of the entry.
+        :raise RuleFailedException: if any of the response rewrite rules raised an exception.
+        """
+        rewritten = self._rewritten.get(entry.id)
+        if rewritten is not None:
+            return rewritten
+        return await run_in_threadpool(self._rewrite_once, entry)
+
+    def _rewrite_once(self, entry: HarEntry) -> HarEntryResponse:
+        # setdefault is atomic so concurrent requests for the same entry always share the same lock.
+        with self._entry_locks.setdefault(entry.id, Lock()):
+            rewritten = self._rewritten.get(entry.id)
+            if rewritten is None:
+                rewritten = self._rewrite(entry.response)
+                self._rewritten[entry.id] = rewritten
+            # Once the response is memoized every later request is served without the lock so it can be released.
+            self._entry_locks.pop(entry.id, None)
+            return rewritten
+
+    def _rewrite(self, response: HarEntryResponse) -> HarEntryResponse:
+        rewritten = response.mutable_copy()
+        rewritten.rendered = None
+        if rewritten.body_handle is not None:
+            rewritten.content.text = self._read_content(rewritten)
+            rewritten.body_handle = None
+
+        rewritten = self._response_rewriter.apply_response_rewrite_rules(rewritten)
+
+        if self._memoize_to_disk:
+            if self._body_store.is_read_only():
+                _log.debug('The body store is read-only. The rewritten body will be memoized in memory instead.')
+            else:
+                rewritten.body_handle = self._body_store.write(self._encode_content(rewritten))
+                rewritten.content.text = ''
+
+        rewritten.rendered = self._response_renderer.render(rewritten)
+        rewritten.freeze()
+        return rewritten
+
+    def _read_content(self, response: HarEntryResponse) -> str:
+        body = self._body_store.read(response.body_handle)  # type: ignore
+        if response.content.encoding == 'base64':
+            return base64.b64encode(body).decode('ascii')
+        return body.decode('utf-8')
+
+    def _encode_content(self, response: HarEntryResponse) -> bytes:
+        if response.content.encoding == 'base64':
+            return base64.b64decode(response.content.text)
+        return response.content.text.encode('utf-8')
+
+
+@lru_cache()
+def with_lazy_response_rewriter(config_loader: Annotated[ConfigLoader, Depends(with_config_loader)],
+                                response_rewriter: Annotated[ResponseRewriter, Depends(with_response_rewriter)],
+                                response_renderer: Annotated[ResponseRenderer, Depends(with_response_renderer)],
+                                body_store: Annotated[BodyStore, Depends(with_body_store)]) -> LazyResponseRewriter:
+
+    return LazyResponseRewriter(config_loader, response_rewriter, response_renderer, body_store)
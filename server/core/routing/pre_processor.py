@@ -1,15 +1,18 @@
-from typing import Annotated
+from typing import Annotated, Iterable, List, Dict
 from functools import lru_cache
-from itertools import filterfalse
 import logging
+import base64
+import hashlib
 
 from fastapi import Depends
 
-from server.core.har.models import HarFileContent
+from server.core.har.models import HarEntry, HarEntryResponse, BodyHandle
+from server.core.metrics import MetricRecorder, with_metric_recorder
 from server.core.rules.exclusions import ExclusionFilter, with_exclusion_filter
 from server.core.rules.rewrite.request import RequestRewriter, with_request_rewriter
 from server.core.rules.matching import RequestMatcher, with_request_matcher
 from server.core.rules.rewrite.response import ResponseRewriter, with_response_rewriter
+from server.core.storage import BodyStore, with_body_store
 
 
 _log = logging.getLogger(__file__)
@@ -21,38 +24,111 @@ class PreProcessor:
                  exclusion_filter: ExclusionFilter,
                  request_rewriter: RequestRewriter,
                  request_matcher: RequestMatcher,
-                 response_rewriter: ResponseRewriter):
+                 response_rewriter: ResponseRewriter,
+                 body_store: BodyStore | None,
+                 metric_recorder: MetricRecorder | None):
 
         self._exclusion_filter = exclusion_filter
         self._request_rewriter = request_rewriter
         self._request_matcher = request_matcher
         self._response_rewriter = response_rewriter
+        self._body_store = body_store
+        self._metric_recorder = metric_recorder
+        self._rewrites_lazily = response_rewriter.is_lazy()
 
-    def process_content(self, har_file_contents: HarFileContent):
-        entries = har_file_contents.log.entries
-        _log.debug(f'Har file contains [{len(entries)}] entries.')
+        # Maps the digest of each body already written to the body store to the handle
+        # of said body so identical bodies are only ever stored once.
+        self._stored_bodies: Dict[bytes, BodyHandle] = dict()
 
-        # filterfalse because we only want the list of entries to contain
-        # entries that are NOT excluded through the configured exclusion rules.
-        _log.debug('Applying entry exclusion rules...')
-        entries = list(filterfalse(self._exclusion_filter.should_exclude_entry, entries))
-        _log.debug(f'[{len(entries)}] remain after applying exclusion rules.')
+    def process_content(self, entries: Iterable[HarEntry]) -> List[HarEntry]:
+        """
+        Filters, rewrites, and accumulates the entries of a single har file.
 
-        _log.debug('Accumulating distinct entries...')
-        count = 0
+        The entries are consumed one at a time so the input can be a generator that lazily parses
+        each entry from the har file.
+
+        If lazy response rewriting is enabled the responses are left as they are and are instead rewritten
+        the first time they are served.
+
+        If a body store has been provided the body of each distinct response will be moved into the
+        body store once the response has been rewritten. Responses with identical bodies will share
+        a single copy of the body within the body store.
+
+        :param entries: The entries of a single har file.
+        :return: The distinct entries that were accumulated, in the order they appeared in the har file.
+        """
+        total = 0
+        remaining = 0
+        distinct: List[HarEntry] = []
         for entry in entries:
+            total = total + 1
+
+            # We only want to accumulate entries that are NOT excluded through
+            # the configured exclusion rules.
+            if self._exclusion_filter.should_exclude_entry(entry):
+                continue
+            remaining = remaining + 1
+
             entry.request = self._request_rewriter.apply_entry_request_rewrite_rules(entry.request)
             if self._request_matcher.accumulate(entry):
+                if not self._rewrites_lazily:
+                    entry.response = self._response_rewriter.apply_response_rewrite_rules(entry.response)
+                entry.response = self._store_body(entry.response)
+                distinct.append(entry)
+
+        _log.debug(f'Har file contains [{total}] entries.')
+        _log.debug(f'[{remaining}] remain after applying exclusion rules.')
+        _log.debug(f'[{len(distinct)}] distinct entries remain.')
+        return distinct
+
+    def accumulate_processed_content(self, entries: Iterable[HarEntry]) -> int:
+        """
+        Accumulates entries that have already been filtered and rewritten by process_content,
+        typically within a different process.
+
+        :param entries: The entries previously returned by process_content.
+        :return: The number of entries that were distinct and were accumulated.
+        """
+        count = 0
+        for entry in entries:
+            if self._request_matcher.accumulate(entry):
+                entry.response = self._store_body(entry.response)
                 count = count + 1
-                entry.response = self._response_rewriter.apply_response_rewrite_rules(entry.response)
-        _log.debug(f'[{count}] distinct entries remain.')
-        
+        _log.debug(f'[{count}] distinct entries accumulated.')
+        return count
+
+    def _store_body(self, response: HarEntryResponse) -> HarEntryResponse:
+        if self._body_store is None:
+            return response
+
+        if response.content.encoding == 'base64':
+            body = base64.b64decode(response.content.text)
+        else:
+            body = response.content.text.encode('utf-8')
+
+        response.body_handle = self._intern_body(body)
+        response.content.text = ''
+        return response
+
+    def _intern_body(self, body: bytes) -> BodyHandle:
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        existing = self._stored_bodies.get(digest)
+        if existing is not None:
+            if self._metric_recorder is not None:
+                self._metric_recorder.record_duplicate_body(len(body))
+            return existing
+
+        handle = self._body_store.write(body)  # type: ignore
+        self._stored_bodies[digest] = handle
+        return handle
 
 
 @lru_cache()
 def with_pre_processor(exclusion_filter: Annotated[ExclusionFilter, Depends(with_exclusion_filter)],
                        request_rewriter: Annotated[RequestRewriter, Depends(with_request_rewriter)],
                        request_matcher: Annotated[RequestMatcher, Depends(with_request_matcher)],
-                       response_rewriter: Annotated[ResponseRewriter, Depends(with_response_rewriter)]) -> PreProcessor:
+                       response_rewriter: Annotated[ResponseRewriter, Depends(with_response_rewriter)],
+                       body_store: Annotated[BodyStore, Depends(with_body_store)],
+                       metric_recorder: Annotated[MetricRecorder, Depends(with_metric_recorder)]) -> PreProcessor:
 
-    return PreProcessor(exclusion_filter, request_rewriter, request_matcher, response_rewriter)
+    return PreProcessor(exclusion_filter, request_rewriter, request_matcher, response_rewriter, body_store, metric_recorder)
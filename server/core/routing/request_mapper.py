@@ -1,56 +1,222 @@
-from typing import Dict, List, Any
+from typing import AsyncIterator, Collection, Dict, Final, List, Any, Mapping, Tuple
 from functools import lru_cache
 import logging
+import re
 import urllib.parse
 
 from fastapi import Request
+from starlette.datastructures import URL, Headers, QueryParams
+from starlette.requests import cookie_parser
+from starlette.types import Receive, Scope
 
-from server.core.har import HarEntryRequest
+from server.core.har import HarEntryRequest, NameValuePair, RequestPostData, SupportedBodyContentTypes, get_origin_of_host, split_origin_path
+from server.core.har.models import RequestHashes
+from server.core.rules.rewrite.request import create_digest, digest_bytes, digest_multipart, parse_multipart
 
 
 _log = logging.getLogger(__file__)
 
 
+# Paths containing any of these characters, or starting with //, are parsed differently when
+# included in a full URL so the path has to be extracted from the full URL instead.
+_URL_SENSITIVE_PATH_CHARACTERS: Final[re.Pattern[str]] = re.compile(r'[%?#;]')
+
+
+def _create_frozen_defaults():
+    post_data = RequestPostData()
+    post_data.freeze()
+    hashes = RequestHashes()
+    hashes.freeze()
+    return post_data, hashes
+
+
+# Shared by every key request that has no body, rather than copying the defaults for each request,
+# and frozen so they cannot be modified by any one request.
+_EMPTY_POST_DATA, _EMPTY_HASHES = _create_frozen_defaults()
+
+
+async def iterate_body(receive: Receive) -> AsyncIterator[bytes]:
+    """
+    Iterates over the chunks of the body of a raw ASGI Http request as they are received.
+
+    :param receive: The ASGI receive callable of the request.
+    :return: An async iterator of the chunks of the body.
+    """
+    more_body = True
+    while more_body:
+        message = await receive()
+        yield message.get('body', b'')
+        more_body = message.get('more_body', False)
+
+
+async def read_body(receive: Receive) -> bytes:
+    """
+    Reads the complete body of a raw ASGI Http request.
+
+    :param receive: The ASGI receive callable of the request.
+    :return: The body of the request.
+    """
+    return b''.join([chunk async for chunk in iterate_body(receive)])
+
+
 class RequestMapper:
 
     _APPLICATION_JSON_CONTENT_TYPE = 'application/json'
     _FORM_URL_ENCODED_CONTENT_TYPE = 'application/x-www-form-urlencoded'
 
+    # Bodies of these types are parsed before being digested so they have to be read in full.
+    _PARSED_CONTENT_TYPES: Final[List[str]] = [
+        SupportedBodyContentTypes.APPLICATION_JSON,
+        SupportedBodyContentTypes.FORM_URL_ENCODED,
+        SupportedBodyContentTypes.MULTIPART_FORM_DATA
+    ]
+
+    async def read_key_body(self, scope: Scope, chunks: AsyncIterator[bytes]) -> Tuple[bytes, str]:
+        """
+        Reads the body of a request for the purpose of matching the request by its body.
+
+        Bodies that need to be parsed, JSON, form url encoded, and multipart bodies, are read in full. Every other
+        body, such as a text or binary body, is digested as each chunk is received without buffering the body.
+
+        :param scope: The ASGI scope of the incoming Http request.
+        :param chunks: The chunks of the body of the request.
+        :return: A tuple of the complete body and an empty digest if the body was read in full or an empty body
+            and the digest of the body if the body was digested as it was received.
+        """
+        content_type = (Headers(scope=scope).get('content-type') or '').lower()
+        if any(parsed_type in content_type for parsed_type in RequestMapper._PARSED_CONTENT_TYPES):
+            return b''.join([chunk async for chunk in chunks]), ''
+
+        digest = create_digest()
+        length = 0
+        async for chunk in chunks:
+            digest.update(chunk)
+            length = length + len(chunk)
+        return b'', digest.hexdigest() if length > 0 else ''
+
     async def map_to_har_request(self, request: Request) -> HarEntryRequest:
         """
         Maps an incoming FastAPI request object to a har entry request. This will copy over the
         query params, headers, cookies, http method, json body, and url.
 
+        The origin of the request is resolved from the origin path prefix, if the path has one, or
+        otherwise from the Host header.
+
         :param request: The incoming FastAPI Http request.
         :return: The har entry request object.
         """
+        return self._map(
+            request.method,
+            request.url,
+            request.query_params,
+            request.headers,
+            request.cookies,
+            await request.body()
+        )
 
-        query_params: List[Dict[str, str | None]] = [{'name': key, 'value': request.query_params.get(key)} for key in request.query_params.keys()]
-        headers: List[Dict[str, str | None]] = [{'name': key, 'value': request.headers.get(key)} for key in request.headers.keys()]
-        cookies: List[Dict[str, str | None]] = [{'name': key, 'value': request.cookies.get(key)} for key in request.cookies.keys()]
+    def map_scope_to_har_request(self, scope: Scope, request_body: bytes) -> HarEntryRequest:
+        """
+        Maps the scope and body of a raw ASGI Http request to a har entry request without creating
+        a FastAPI request object. The resulting request is the same as the one produced by map_to_har_request.
+
+        :param scope: The ASGI scope of the incoming Http request.
+        :param request_body: The complete body of the incoming Http request.
+        :return: The har entry request object.
+        """
+        headers = Headers(scope=scope)
+        cookie_header = headers.get('cookie')
+        return self._map(
+            scope['method'],
+            URL(scope=scope),
+            QueryParams(scope['query_string']),
+            headers,
+            cookie_parser(cookie_header) if cookie_header is not None else {},
+            request_body
+        )
+
+    def map_scope_to_key_request(self,
+                                 scope: Scope,
+                                 request_body: bytes,
+                                 components: Collection[str],
+                                 body_digest: str = '') -> HarEntryRequest:
+        """
+        Maps the scope and body of a raw ASGI Http request to a har entry request that only contains the
+        properties required to compute the match key of the request.
+
+        Only the query params, headers, cookies, and body named in the components are mapped. The method,
+        path, and origin are always mapped. The request is built without validation so the resulting request should only be
+        used for matching and not, for example, for recording metrics.
+
+        :param scope: The ASGI scope of the incoming Http request.
+        :param request_body: The complete body of the incoming Http request. Only required if the
+            body is one of the components.
+        :param components: The names of the request matching rules that are enabled.
+        :param body_digest: The digest of the body if the body was digested by read_key_body rather than read.
+        :return: The partially mapped har entry request.
+        """
+        headers = Headers(scope=scope)
+
+        post_data = _EMPTY_POST_DATA
+        if 'body' in components and (len(request_body) > 0 or body_digest != ''):
+            post_data = RequestPostData(**self._map_post_data(headers.get('content-type'), request_body, body_digest))
+
+        cookie_header = headers.get('cookie') if 'cookies' in components else None
+        origin, path = self._resolve_origin(self._get_path(scope), headers.get('host'))
+
+        return HarEntryRequest.model_construct(
+            method=scope['method'].lower(),
+            url='',
+            path=path,
+            origin=origin,
+            query_params=self._to_pairs(QueryParams(scope['query_string'])) if 'query-params' in components else [],
+            headers=self._to_pairs(headers) if 'headers' in components else [],
+            cookies=self._to_pairs(cookie_parser(cookie_header)) if cookie_header is not None else [],
+            post_data=post_data,
+            hashes=_EMPTY_HASHES
+        )
+
+    def _get_path(self, scope: Scope) -> str:
+        path: str = scope['path']
+        if path.startswith('//') or _URL_SENSITIVE_PATH_CHARACTERS.search(path) is not None:
+            return urllib.parse.unquote(urllib.parse.urlparse(str(URL(scope=scope))).path)
+        return path
+
+    def _resolve_origin(self, path: str, host: str | None) -> Tuple[str, str]:
+        origin, path = split_origin_path(path)
+        if origin == '':
+            origin = get_origin_of_host(host)
+        return origin, path
+
+    def _to_pairs(self, values: Mapping[str, str]) -> List[NameValuePair]:
+        return [NameValuePair.model_construct(name=key, value=values.get(key)) for key in values.keys()]
+
+    def _map(self,
+             method: str,
+             url: URL,
+             request_query_params: Mapping[str, str],
+             request_headers: Mapping[str, str],
+             request_cookies: Mapping[str, str],
+             request_body: bytes) -> HarEntryRequest:
+
+        query_params: List[Dict[str, str | None]] = [{'name': key, 'value': request_query_params.get(key)} for key in request_query_params.keys()]
+        headers: List[Dict[str, str | None]] = [{'name': key, 'value': request_headers.get(key)} for key in request_headers.keys()]
+        cookies: List[Dict[str, str | None]] = [{'name': key, 'value': request_cookies.get(key)} for key in request_cookies.keys()]
+
+        url_text = str(url)
+        origin, path = self._resolve_origin(urllib.parse.unquote(urllib.parse.urlparse(url_text).path), request_headers.get('host'))
 
         request_options: Dict[str, Any] = {
             'queryString': query_params,
-            'method': request.method,
-            'url': str(request.url),
+            'method': method,
+            'url': url_text,
+            'path': path,
+            'origin': origin,
             'headers': headers,
             'cookies': cookies
         }
 
-        request_body = await request.body()
         if len(request_body) > 0:
-            if self._has_json_body(request_options):
-                request_options['postData'] = {
-                    'text': request_body,
-                    'params': [],
-                    'mimeType': RequestMapper._APPLICATION_JSON_CONTENT_TYPE
-                }
-            elif self._has_form_url_encoded_body(request_options):
-                request_options['postData'] = {
-                    'text': request_body,
-                    'params': self._parse_form_url_encoded_body(request_body),
-                    'mimeType': RequestMapper._FORM_URL_ENCODED_CONTENT_TYPE
-                }
+            request_options['postData'] = self._map_post_data(self._get_header(headers, 'content-type'), request_body)
 
         _log.debug(f'Mapping request options to har entry: [{request_options}]')
 
@@ -61,15 +227,30 @@ class RequestMapper:
         decoded_request_body = dict(urllib.parse.parse_qsl(decoded_url_params, keep_blank_values=True))
         return [{'name': key, 'value': value} for key, value in decoded_request_body.items()]
 
-    def _has_json_body(self, request: Dict[str, Any]) -> bool:
-        return self._has_content_type(request, RequestMapper._APPLICATION_JSON_CONTENT_TYPE)
-
-    def _has_form_url_encoded_body(self, request: Dict[str, Any]) -> bool:
-        return self._has_content_type(request, RequestMapper._FORM_URL_ENCODED_CONTENT_TYPE)
-
-    def _has_content_type(self, request: Dict[str, Any], content_type: str) -> bool:
-        content_type_header = self._get_header(request['headers'], 'content-type')
-        return content_type_header is not None and content_type in content_type_header
+    def _map_post_data(self, content_type: str | None, request_body: bytes, body_digest: str = '') -> Dict[str, Any]:
+        # Media types are case-insensitive.
+        content_type = (content_type or '').lower()
+        if body_digest != '':
+            return {'mimeType': content_type, 'body_digest': body_digest}
+        if RequestMapper._APPLICATION_JSON_CONTENT_TYPE in content_type:
+            return {
+                'text': request_body,
+                'params': [],
+                'mimeType': RequestMapper._APPLICATION_JSON_CONTENT_TYPE
+            }
+        elif RequestMapper._FORM_URL_ENCODED_CONTENT_TYPE in content_type:
+            return {
+                'text': request_body,
+                'params': self._parse_form_url_encoded_body(request_body),
+                'mimeType': RequestMapper._FORM_URL_ENCODED_CONTENT_TYPE
+            }
+        elif SupportedBodyContentTypes.MULTIPART_FORM_DATA in content_type:
+            return {
+                'mimeType': SupportedBodyContentTypes.MULTIPART_FORM_DATA,
+                'body_digest': digest_multipart(parse_multipart(request_body))
+            }
+        # Any other body is only matched by its digest so the body itself is not kept.
+        return {'mimeType': content_type, 'body_digest': digest_bytes(request_body)}
 
     def _get_header(self, headers: List[Dict[str, str | None]], name: str) -> str | None:
         for header in headers:
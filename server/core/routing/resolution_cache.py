@@ -0,0 +1,150 @@
+from typing import Annotated, Collection, Hashable, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+import hashlib
+
+from fastapi import Depends
+from starlette.types import Scope
+
+from server.core.config import ConfigLoader, with_config_loader
+from server.core.har import HarEntry
+from server.core.rules.matching import RequestMatcher, with_request_matcher
+
+
+_COOKIE_HEADER = b'cookie'
+_HOST_HEADER = b'host'
+_CONTENT_TYPE_HEADER = b'content-type'
+
+
+class ResolutionCache:
+    """
+    A bounded, least recently used, cache of the entries previously resolved for a request along with a
+    separately bounded, least recently used, cache of the requests that previously did not match any entry.
+
+    The entries are keyed by a fingerprint of the raw ASGI request that only includes the parts of the
+    request used by the enabled request matching rules. Two requests with the same fingerprint are always
+    mapped, rewritten, and matched to the same entry so a cached entry can be served without running the
+    request through the rewrite rules and matcher again.
+    """
+
+    def __init__(self, max_size: int, max_misses: int, components: Collection[str]):
+        self._max_size = max_size
+        self._max_misses = max_misses
+        self._includes_query_string = 'query-params' in components
+        self._includes_headers = 'headers' in components
+        self._includes_cookies = 'cookies' in components
+        self._includes_host = 'origin' in components
+        self._includes_body = 'body' in components
+        self._includes_any_header = self._includes_cookies or self._includes_host or self._includes_body
+        self._entries: OrderedDict[Hashable, HarEntry] = OrderedDict()
+        self._misses: OrderedDict[Hashable, None] = OrderedDict()
+        self._lock = Lock()
+
+    def is_enabled(self) -> bool:
+        return self._max_size > 0 or self._max_misses > 0
+
+    def fingerprint(self, scope: Scope, request_body: bytes, body_digest: str = '') -> Hashable:
+        """
+        Computes the fingerprint of a raw ASGI Http request.
+
+        :param scope: The ASGI scope of the incoming Http request.
+        :param request_body: The complete body of the request. Only used if the body is used to match requests.
+        :param body_digest: The digest of the body if the body was digested, rather than read, as it was received.
+        :return: The fingerprint of the request.
+        """
+        raw_headers = scope['headers']
+        headers: Tuple[Tuple[bytes, bytes], ...] = ()
+        if self._includes_headers:
+            headers = tuple(raw_headers)
+        elif self._includes_any_header:
+            headers = tuple(header for header in raw_headers if self._is_relevant_header(header[0]))
+
+        body: bytes | str | None = None
+        if self._includes_body:
+            if body_digest != '':
+                body = body_digest
+            elif len(request_body) > 0:
+                body = hashlib.blake2b(request_body, digest_size=16).digest()
+
+        return (
+            scope['method'],
+            scope['path'],
+            scope['query_string'] if self._includes_query_string else None,
+            headers,
+            body
+        )
+
+    def get(self, fingerprint: Hashable) -> HarEntry | None:
+        """
+        Gets the entry previously resolved for the fingerprint and marks it as the most recently used entry.
+
+        :param fingerprint: The fingerprint of the incoming request.
+        :return: The cached entry or None if there is no entry cached for the fingerprint.
+        """
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None:
+                self._entries.move_to_end(fingerprint)
+            return entry
+
+    def put(self, fingerprint: Hashable, entry: HarEntry):
+        """
+        Caches the entry resolved for the fingerprint, evicting the least recently used entry if the
+        cache is full.
+
+        :param fingerprint: The fingerprint of the incoming request.
+        :param entry: The entry that matched the request.
+        """
+        if self._max_size == 0:
+            return
+        with self._lock:
+            self._entries[fingerprint] = entry
+            self._entries.move_to_end(fingerprint)
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def is_known_miss(self, fingerprint: Hashable) -> bool:
+        """
+        Checks if a request with the fingerprint previously did not match any entry and marks the fingerprint
+        as the most recently used miss.
+
+        :param fingerprint: The fingerprint of the incoming request.
+        :return: True if the request is known to not match any entry, otherwise false.
+        """
+        with self._lock:
+            if fingerprint not in self._misses:
+                return False
+            self._misses.move_to_end(fingerprint)
+            return True
+
+    def put_miss(self, fingerprint: Hashable):
+        """
+        Records that a request with the fingerprint did not match any entry, evicting the least recently used
+        miss if the cache of misses is full.
+
+        :param fingerprint: The fingerprint of the incoming request.
+        """
+        if self._max_misses == 0:
+            return
+        with self._lock:
+            self._misses[fingerprint] = None
+            if len(self._misses) > self._max_misses:
+                self._misses.popitem(last=False)
+
+    def _is_relevant_header(self, name: bytes) -> bool:
+        return (name == _COOKIE_HEADER and self._includes_cookies) \
+            or (name == _HOST_HEADER and self._includes_host) \
+            or (name == _CONTENT_TYPE_HEADER and self._includes_body)
+
+
+@lru_cache()
+def with_resolution_cache(config_loader: Annotated[ConfigLoader, Depends(with_config_loader)],
+                          request_matcher: Annotated[RequestMatcher, Depends(with_request_matcher)]) -> ResolutionCache:
+
+    serving_config = config_loader.get_app_config().serving
+    return ResolutionCache(
+        serving_config.resolution_cache_size,
+        serving_config.negative_cache_size,
+        request_matcher.get_enabled_rules()
+    )
@@ -1,38 +1,62 @@
-from typing import Annotated
+from typing import Annotated, Hashable, Tuple
 from functools import lru_cache
 
 from fastapi import Depends
 from fastapi.requests import Request
+from starlette.types import Receive, Scope
 
-from server.core.har import with_har_parser, HarParser, HarEntryResponse
+from server.core.har import HarEntry, HarEntryResponse, HarEntryRequest
 from server.core.metrics import MetricRecorder, with_metric_recorder
+from server.core.rendering import ResponseRenderer, with_response_renderer
 from server.core.rules.rewrite.request import RequestRewriter, with_request_rewriter
 from server.core.rules.matching import with_request_matcher, RequestMatcher
 
-from .request_mapper import RequestMapper, with_request_mapper
-from .pre_processor import PreProcessor, with_pre_processor
+from .request_mapper import RequestMapper, with_request_mapper, read_body, iterate_body
+from .har_loader import HarLoader, with_har_loader
 from .browser_open import BrowserOpen, with_browser_open
+from .resolution_cache import ResolutionCache, with_resolution_cache
+from .lazy_response_rewriter import LazyResponseRewriter, with_lazy_response_rewriter
 
 
 class RouteMap:
 
     def __init__(self,
-                 har_parser: HarParser,
+                 har_loader: HarLoader,
                  request_rewriter: RequestRewriter,
                  request_matcher: RequestMatcher,
                  request_mapper: RequestMapper,
-                 pre_processor: PreProcessor,
                  metric_recorder: MetricRecorder,
+                 response_renderer: ResponseRenderer,
+                 resolution_cache: ResolutionCache,
+                 lazy_response_rewriter: LazyResponseRewriter,
                  browser_open: BrowserOpen):
 
         self._request_rewriter = request_rewriter
         self._request_matcher = request_matcher
         self._request_mapper = request_mapper
         self._metric_recorder = metric_recorder
+        self._key_components = request_matcher.get_enabled_rules()
+        self._is_metrics_enabled = metric_recorder.is_enabled()
+        self._replay_cursors = request_matcher.get_replay_cursors()
+        self._reads_body = 'body' in self._key_components
+
+        self._lazy_response_rewriter: LazyResponseRewriter | None = None
+        if lazy_response_rewriter.is_enabled():
+            self._lazy_response_rewriter = lazy_response_rewriter
+
+        self._resolution_cache: ResolutionCache | None = None
+        if resolution_cache.is_enabled():
+            self._resolution_cache = resolution_cache
+        # When replaying, repeated requests resolve to different entries so the resolved entries can't be cached.
+        # Misses are still cached since a request that matches no entry does so regardless of the replay cursors.
+        self._caches_resolved_entries = self._replay_cursors is None
+
+        har_loader.load()
+        # When rewriting lazily the responses are rendered once they have been rewritten instead.
+        if self._lazy_response_rewriter is None:
+            response_renderer.render_entries(request_matcher.get_entries())
+        request_matcher.freeze_entries()
 
-        for content in har_parser.get_har_file_contents():
-            pre_processor.process_content(content)
-        
         browser_open.open_browser_in_background()
 
     async def find_entry_for_request(self, request: Request) -> HarEntryResponse | None:
@@ -44,37 +68,144 @@ class RouteMap:
 
         If no match can be found then this will return None.
 
+        If the resolution cache is enabled and an identical request was previously matched the previously matched entry
+        is returned without rewriting or matching the request again. Likewise, if an identical request previously did
+        not match any entry None is returned without rewriting or matching the request again.
+
         :param request: The incoming Http request to match against the requests from each har entry.
         :return: The har entry whose recorded request matches the incoming Http request based on the matching rules.
             If no request matches then this will return None.
         """
-        incoming_request = await self._request_mapper.map_to_har_request(request)
-        rewritten_incoming_request = self._request_rewriter.apply_browser_request_rewrite_rules(incoming_request)
+        request_body, body_digest = b'', ''
+        if self._reads_body:
+            if self._is_metrics_enabled:
+                # The complete body is read, rather than streamed, so the request mapper can read it again.
+                request_body = await request.body()
+            else:
+                request_body, body_digest = await self._request_mapper.read_key_body(request.scope, request.stream())
+
+        fingerprint, cached_entry, is_known_miss = self._find_cached_entry(request.scope, request_body, body_digest)
+        if is_known_miss:
+            return None
+        if cached_entry is not None and not self._is_metrics_enabled:
+            return await self._get_response(cached_entry)
 
-        matching_entry = self._request_matcher.find_matching_entry(rewritten_incoming_request)
-        if matching_entry is None:
+        if self._is_metrics_enabled:
+            incoming_request = await self._request_mapper.map_to_har_request(request)
+        else:
+            incoming_request = self._request_mapper.map_scope_to_key_request(request.scope, request_body, self._key_components, body_digest)
+        return await self._find_entry(incoming_request, self._get_client_id(request.scope), fingerprint, cached_entry)
+
+    async def find_entry_for_scope(self, scope: Scope, receive: Receive) -> HarEntryResponse | None:
+        """
+        Attempts to find the har entry whose request matches a raw ASGI Http request.
+
+        The body of the request is only read if the body is used to match requests or metrics are enabled. Text and
+        binary bodies are digested as they are received rather than read in full, unless metrics are enabled.
+
+        Like find_entry_for_request, previously matched entries are served from the resolution cache if it is enabled.
+
+        :param scope: The ASGI scope of the incoming Http request.
+        :param receive: The ASGI receive callable of the incoming Http request.
+        :return: The response of the matching har entry or None if no entry matches.
+        """
+        request_body, body_digest = b'', ''
+        if self._is_metrics_enabled:
+            request_body = await read_body(receive)
+        elif self._reads_body:
+            request_body, body_digest = await self._request_mapper.read_key_body(scope, iterate_body(receive))
+
+        fingerprint, cached_entry, is_known_miss = self._find_cached_entry(scope, request_body, body_digest)
+        if is_known_miss:
             return None
+        if cached_entry is not None and not self._is_metrics_enabled:
+            return await self._get_response(cached_entry)
+
+        if self._is_metrics_enabled:
+            incoming_request = self._request_mapper.map_scope_to_har_request(scope, request_body)
+        else:
+            incoming_request = self._request_mapper.map_scope_to_key_request(scope, request_body, self._key_components, body_digest)
+        return await self._find_entry(incoming_request, self._get_client_id(scope), fingerprint, cached_entry)
 
-        if self._metric_recorder.is_enabled():
-            self._metric_recorder.record(matching_entry.id, rewritten_incoming_request, matching_entry.response)
-        return matching_entry.response
+    async def find_entry_for_har_request(self, incoming_request: HarEntryRequest, client_id: str = '') -> HarEntryResponse | None:
+        """
+        Attempts to find the har entry whose request matches an incoming request that has already
+        been mapped to a har entry request.
+
+        :param incoming_request: The incoming Http request mapped to a har entry request.
+        :param client_id: The id of the client that sent the request. Used to replay repeated requests.
+        :return: The response of the matching har entry or None if no entry matches.
+        """
+        return await self._find_entry(incoming_request, client_id, None, None)
+
+    def _find_cached_entry(self, scope: Scope, request_body: bytes, body_digest: str) \
+            -> Tuple[Hashable | None, HarEntry | None, bool]:
+
+        if self._resolution_cache is None:
+            return None, None, False
+
+        fingerprint = self._resolution_cache.fingerprint(scope, request_body, body_digest)
+        cached_entry = self._resolution_cache.get(fingerprint) if self._caches_resolved_entries else None
+        is_known_miss = cached_entry is None and self._resolution_cache.is_known_miss(fingerprint)
+        if self._is_metrics_enabled:
+            self._metric_recorder.record_resolution_cache_lookup(cached_entry is not None, is_known_miss)
+        return fingerprint, cached_entry, is_known_miss
+
+    async def _find_entry(self,
+                    incoming_request: HarEntryRequest,
+                    client_id: str,
+                    fingerprint: Hashable | None,
+                    cached_entry: HarEntry | None) -> HarEntryResponse | None:
+
+        # The request is still rewritten when there is a cached entry, which only happens when metrics are enabled,
+        # so the recorded request is the same as if the request had been matched.
+        rewritten_incoming_request = self._request_rewriter.apply_browser_request_rewrite_rules(incoming_request)
+
+        matching_entry = cached_entry
+        if matching_entry is None:
+            matching_entry = self._request_matcher.find_matching_entry(rewritten_incoming_request, client_id)
+            if matching_entry is None:
+                if fingerprint is not None:
+                    self._resolution_cache.put_miss(fingerprint)  # type: ignore
+                return None
+            if fingerprint is not None and self._caches_resolved_entries:
+                self._resolution_cache.put(fingerprint, matching_entry)  # type: ignore
+
+        response = await self._get_response(matching_entry)
+        if self._is_metrics_enabled:
+            self._metric_recorder.record(matching_entry.id, rewritten_incoming_request, response)
+        return response
+
+    async def _get_response(self, entry: HarEntry) -> HarEntryResponse:
+        if self._lazy_response_rewriter is None:
+            return entry.response
+        return await self._lazy_response_rewriter.get_response(entry)
+
+    def _get_client_id(self, scope: Scope) -> str:
+        if self._replay_cursors is None:
+            return ''
+        return self._replay_cursors.get_client_id(scope)
 
 
 @lru_cache()
-def with_route_map(har_parser: Annotated[HarParser, Depends(with_har_parser)],
+def with_route_map(har_loader: Annotated[HarLoader, Depends(with_har_loader)],
                    request_rewriter: Annotated[RequestRewriter, Depends(with_request_rewriter)],
                    request_matcher: Annotated[RequestMatcher, Depends(with_request_matcher)],
                    request_mapper: Annotated[RequestMapper, Depends(with_request_mapper)],
-                   preprocessor: Annotated[PreProcessor, Depends(with_pre_processor)],
                    metric_recorder: Annotated[MetricRecorder, Depends(with_metric_recorder)],
+                   response_renderer: Annotated[ResponseRenderer, Depends(with_response_renderer)],
+                   resolution_cache: Annotated[ResolutionCache, Depends(with_resolution_cache)],
+                   lazy_response_rewriter: Annotated[LazyResponseRewriter, Depends(with_lazy_response_rewriter)],
                    browser_open: Annotated[BrowserOpen, Depends(with_browser_open)]) -> RouteMap:
 
     return RouteMap(
-        har_parser,
+        har_loader,
         request_rewriter,
         request_matcher,
         request_mapper,
-        preprocessor,
         metric_recorder,
+        response_renderer,
+        resolution_cache,
+        lazy_response_rewriter,
         browser_open
     )
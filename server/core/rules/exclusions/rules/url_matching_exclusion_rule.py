@@ -1,4 +1,5 @@
-from typing import List, Any
+from typing import Final, List, Any
+import logging
 import re
 from re import Pattern
 
@@ -9,6 +10,14 @@ from server.core.rules.base import MissingConfigPropertyException
 from .base import ExclusionRule
 
 
+_log = logging.getLogger(__file__)
+
+
+# Expressions with back references, including conditional group references such as (?(1)...), are not
+# combined since combining them would shift the group numbers.
+_BACK_REFERENCE: Final[Pattern[str]] = re.compile(r'\\[1-9]|\(\?P=|\(\?\(')
+
+
 class UrlMatchingExclusionRule(ExclusionRule):
 
     def __init__(self):
@@ -21,7 +30,27 @@ class UrlMatchingExclusionRule(ExclusionRule):
         expressions = config_loader.get_app_config().exclusions.config.removable_url_expressions
         if len(expressions) == 0:
             raise MissingConfigPropertyException(self.get_name(), 'removable_url_expressions')
-        self._url_expressions = [re.compile(expression) for expression in expressions]
+        self._url_expressions = _combine_expressions(expressions)
 
     def should_filter_out(self, entry: HarEntry) -> bool:
         return any(expression.match(entry.request.url) for expression in self._url_expressions)
+
+
+def _combine_expressions(expressions: List[str]) -> List[Pattern[Any]]:
+    # Each expression is compiled individually first so an invalid expression is still reported as such.
+    compiled = [re.compile(expression) for expression in expressions]
+
+    combinable = [expression for expression in expressions if not _BACK_REFERENCE.search(expression)]
+    if len(combinable) < 2:
+        return compiled
+
+    # The expressions are joined into a single alternation so each url is matched against every expression in
+    # a single call into the regular expression engine.
+    try:
+        combined = re.compile('|'.join(f'(?:{expression})' for expression in combinable))
+    except re.error as e:
+        _log.debug(f'The removable url expressions could not be combined and will be matched one by one: [{e}]')
+        return compiled
+
+    separate = [pattern for pattern in compiled if _BACK_REFERENCE.search(pattern.pattern)]
+    return [combined] + separate
@@ -0,0 +1,102 @@
+from typing import Any, Callable, Dict, Final, FrozenSet, List, Tuple
+import json
+import logging
+
+from server.core.har import HarEntry, HarEntryRequest, NameValuePair
+
+
+_log = logging.getLogger(__file__)
+
+
+_Features = Tuple[FrozenSet[Tuple[str, str]], ...]
+
+
+def _pairs_features(pairs: List[NameValuePair]) -> FrozenSet[Tuple[str, str]]:
+    return frozenset((pair.name, pair.value) for pair in pairs)
+
+
+def _body_features(request: HarEntryRequest) -> FrozenSet[Tuple[str, str]]:
+    if len(request.post_data.params) > 0:
+        return _pairs_features(request.post_data.params)
+    parsed_json: Dict[str, Any] = request.post_data.parsed_json
+    return frozenset((key, json.dumps(value, sort_keys=True)) for key, value in parsed_json.items())
+
+
+def _similarity(first: FrozenSet[Tuple[str, str]], second: FrozenSet[Tuple[str, str]]) -> float:
+    if len(first) == 0 and len(second) == 0:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+class BestMatchIndex:
+    """
+    Indexes entries by their origin, method, and path so an incoming request that does not exactly match any entry
+    can fall back to the most similar entry with the same origin, method, and path.
+
+    The name value pairs of the query params, headers, cookies, and body of each entry are computed once, when
+    the entry is added, so scoring a candidate only requires a handful of set operations. Each method and path
+    holds at most max_candidates entries to keep the cost of a fallback lookup bounded.
+    """
+
+    _FEATURE_FUNCTIONS: Final[Dict[str, Callable[[HarEntryRequest], FrozenSet[Tuple[str, str]]]]] = {
+        'query-params': lambda request: _pairs_features(request.query_params),
+        'headers': lambda request: _pairs_features(request.headers),
+        'cookies': lambda request: _pairs_features(request.cookies),
+        'body': _body_features
+    }
+
+    def __init__(self,
+                 enabled_rules: List[str],
+                 max_candidates: int,
+                 get_path: Callable[[HarEntryRequest], str] = lambda request: request.path):
+
+        self._max_candidates = max_candidates
+        self._index_functions: List[Callable[[HarEntryRequest], str | None]] = []
+        if 'origin' in enabled_rules:
+            self._index_functions.append(lambda request: request.origin)
+        if 'method' in enabled_rules:
+            self._index_functions.append(lambda request: request.method)
+        if 'path' in enabled_rules:
+            self._index_functions.append(get_path)
+        self._feature_functions = [
+            function for name, function in BestMatchIndex._FEATURE_FUNCTIONS.items() if name in enabled_rules
+        ]
+        self._candidates: Dict[Tuple[str | None, ...], List[Tuple[HarEntry, _Features]]] = dict()
+
+    def add(self, entry: HarEntry):
+        """
+        Adds the entry as a fallback candidate for requests with the same method and path.
+
+        :param entry: An entry accumulated by the request matcher.
+        """
+        candidates = self._candidates.setdefault(self._get_index_key(entry.request), [])
+        if len(candidates) < self._max_candidates:
+            candidates.append((entry, self._get_features(entry.request)))
+
+    def find_best_match(self, request: HarEntryRequest) -> HarEntry | None:
+        """
+        Finds the candidate whose query params, headers, cookies, and body are most similar to those of the
+        request. If multiple candidates are equally similar the first one added is returned.
+
+        :param request: The rewritten incoming request.
+        :return: The most similar entry or None if there are no entries with the same method and path.
+        """
+        candidates = self._candidates.get(self._get_index_key(request))
+        if candidates is None:
+            return None
+
+        features = self._get_features(request)
+        best_entry, best_score = None, -1.0
+        for entry, entry_features in candidates:
+            score = sum(_similarity(first, second) for first, second in zip(features, entry_features, strict=True))
+            if score > best_score:
+                best_entry, best_score = entry, score
+
+        _log.debug(f'Falling back to entry [{best_entry.id if best_entry else None}] with a similarity score of [{best_score}].')
+        return best_entry
+
+    def _get_index_key(self, request: HarEntryRequest) -> Tuple[str | None, ...]:
+        return tuple(function(request) for function in self._index_functions)
+
+    def _get_features(self, request: HarEntryRequest) -> _Features:
+        return tuple(function(request) for function in self._feature_functions)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+from typing import Dict, List
+import re
+
+
+_PARAMETER_SEGMENT = re.compile(r'^\{[^/{}]+\}$|^\*$')
+_REMAINDER_SEGMENT = '**'
+
+
+class InvalidPathTemplateException(Exception):
+
+    _MESSAGE_TEMPLATE = 'Invalid path template [{}]: {}'
+
+    def __init__(self, template: str, reason: str):
+        super().__init__(InvalidPathTemplateException._MESSAGE_TEMPLATE.format(template, reason))
+
+
+class _TemplateNode:
+
+    def __init__(self):
+        self.literal_children: Dict[str, _TemplateNode] = dict()
+        self.parameter_child: _TemplateNode | None = None
+        self.remainder_template: str | None = None
+        self.template: str | None = None
+
+
+class PathTemplateIndex:
+    """
+    A trie of path templates, keyed by path segment, used to resolve the template a request path belongs to.
+
+    Each segment of a template can be a literal, a parameter that matches exactly one segment, written as either
+    {name} or *, or, as the last segment only, ** which matches all of the remaining segments including none.
+
+    When more than one template matches a path the most specific one wins: at each segment a literal is
+    preferred over a parameter and a parameter is preferred over **. When the preferred branch fails to match the
+    remaining segments the next branch is tried, so resolving a path visits each node of the trie at most once. In
+    the common case, where the first branch taken matches, the time taken is proportional to the depth of the path.
+    In the worst case, such as when literal and parameter templates overlap at many depths and none of them match
+    the end of the path, every node reachable along the path is visited. That is bounded by whichever is smaller of
+    the total number of segments across all of the templates and two to the power of the depth of the path.
+    """
+
+    def __init__(self, templates: List[str]):
+        self._root = _TemplateNode()
+        for template in templates:
+            self._add(template)
+
+    def resolve(self, path: str) -> str | None:
+        """
+        Finds the most specific template matching the path.
+
+        :param path: The decoded path of a request.
+        :return: The matching template or None if no template matches the path.
+        """
+        return self._resolve(self._root, path.split('/')[1:], 0)
+
+    def _resolve(self, node: _TemplateNode, segments: List[str], index: int) -> str | None:
+        if index == len(segments):
+            return node.template if node.template is not None else node.remainder_template
+
+        literal_child = node.literal_children.get(segments[index])
+        if literal_child is not None:
+            template = self._resolve(literal_child, segments, index + 1)
+            if template is not None:
+                return template
+
+        if node.parameter_child is not None:
+            template = self._resolve(node.parameter_child, segments, index + 1)
+            if template is not None:
+                return template
+
+        return node.remainder_template
+
+    def _add(self, template: str):
+        if not template.startswith('/'):
+            raise InvalidPathTemplateException(template, 'templates must start with /.')
+
+        segments = template.split('/')[1:]
+        node = self._root
+        for index, segment in enumerate(segments):
+            if segment == _REMAINDER_SEGMENT:
+                if index != len(segments) - 1:
+                    raise InvalidPathTemplateException(template, '** can only be the last segment.')
+                if node.remainder_template is None:
+                    node.remainder_template = template
+                return
+
+            if _PARAMETER_SEGMENT.match(segment):
+                if node.parameter_child is None:
+                    node.parameter_child = _TemplateNode()
+                node = node.parameter_child
+            else:
+                node = node.literal_children.setdefault(segment, _TemplateNode())
+        # When equivalent templates, such as /items/{id} and /items/*, are configured the first one is kept.
+        if node.template is None:
+            node.template = template
@@ -0,0 +1,61 @@
+from typing import Hashable, Tuple
+from collections import OrderedDict
+from threading import Lock
+
+from starlette.types import Scope
+
+
+class ReplayCursors:
+    """
+    Tracks, per client and per match key, how many times the entries recorded for the key have been replayed
+    so each client steps through the recorded responses independently of every other client.
+
+    In sequence mode each client is served the recorded responses in the order they were captured and the last
+    response is repeated once all of them have been served. In round-robin mode the client starts over from the
+    first response once all of them have been served.
+
+    The number of cursors is bounded since the client id is supplied by the client. Once the limit is reached the
+    least recently used cursor is evicted and the client it belonged to starts over from the first response.
+    """
+
+    def __init__(self, mode: str, client_header: str | None, max_cursors: int):
+        self._is_round_robin = mode == 'round-robin'
+        self._client_header = client_header.lower().encode('latin-1') if client_header else None
+        self._max_cursors = max_cursors
+        self._cursors: OrderedDict[Tuple[str, Hashable], int] = OrderedDict()
+        self._lock = Lock()
+
+    def get_client_id(self, scope: Scope) -> str:
+        """
+        Identifies the client that sent a request. The client is identified by the value of the configured client
+        header, if the header was sent, or otherwise by the host of the client.
+
+        :param scope: The ASGI scope of the incoming Http request.
+        :return: The id of the client.
+        """
+        if self._client_header is not None:
+            for name, value in scope['headers']:
+                if name == self._client_header:
+                    return value.decode('latin-1')
+        client = scope.get('client')
+        return client[0] if client else ''
+
+    def next_index(self, client_id: str, key: Hashable, length: int) -> int:
+        """
+        Gets the index of the entry the client should be served next and advances the cursor of the client.
+
+        :param client_id: The id of the client that sent the request.
+        :param key: The match key of the request.
+        :param length: The number of entries recorded for the key.
+        :return: The index of the entry to serve.
+        """
+        cursor_key = (client_id, key)
+        with self._lock:
+            count = self._cursors.get(cursor_key, 0)
+            self._cursors[cursor_key] = count + 1
+            self._cursors.move_to_end(cursor_key)
+            if len(self._cursors) > self._max_cursors:
+                self._cursors.popitem(last=False)
+        if self._is_round_robin:
+            return count % length
+        return min(count, length - 1)
@@ -1,7 +1,7 @@
-from typing import Annotated, Final, Dict, Callable
+from typing import Annotated, Final, Dict, Callable, List, Sequence, Set, Tuple
 from functools import lru_cache
-import copy
 import logging
+import operator
 
 from fastapi import Depends
 
@@ -9,51 +9,210 @@ from server.core.config import ConfigLoader, with_config_loader
 from server.core.har import HarEntryRequest, HarEntry
 from server.core.rules.base.error import RuleNotFoundException
 
+from .best_match import BestMatchIndex
+from .path_templates import PathTemplateIndex
+from .replay import ReplayCursors
+
 
 _log = logging.getLogger(__file__)
 
 
 class RequestMatcher:
 
-    _HASH_FUNCTIONS: Final[Dict[str, Callable[[HarEntryRequest], str]]] = {
-        'method': lambda request: request.method,
-        'path': lambda request: request.path if request.path is not None else '',
-        'query-params': lambda request: request.hashes.query_params,
-        'headers': lambda request: request.hashes.headers,
-        'cookies': lambda request: request.hashes.cookies,
-        'body': lambda request: request.hashes.post_data
+    # Maps each matching rule to the attribute of the request the rule matches on. The origin must
+    # remain first so it is always the first component of the key.
+    _KEY_ATTRIBUTES: Final[Dict[str, str]] = {
+        'origin': 'origin',
+        'method': 'method',
+        'path': 'path',
+        'query-params': 'hashes.query_params',
+        'headers': 'hashes.headers',
+        'cookies': 'hashes.cookies',
+        'body': 'hashes.post_data'
     }
 
     def __init__(self, config_loader: ConfigLoader):
-        self._enabled_rules = config_loader.get_app_config().request_matching.rules
+        matching_config = config_loader.get_app_config().request_matching
+        self._enabled_rules = matching_config.rules
         _log.info(f'Configured request matching rules: [{self._enabled_rules}]')
 
-        all_rules = list(self._HASH_FUNCTIONS.keys())
+        all_rules = list(self._KEY_ATTRIBUTES.keys())
         for enabled_rule in self._enabled_rules:
             if enabled_rule not in all_rules:
                 raise RuleNotFoundException('request-matcher', enabled_rule)
 
-        self._available_entries: Dict[str, HarEntry] = dict()
+        # Paths matching one of the configured templates are matched by the template rather than the path so
+        # every path matching the template, such as /api/items/12345 for /api/items/{id}, matches the same entry.
+        self._path_templates: PathTemplateIndex | None = None
+        if len(matching_config.path_templates) > 0:
+            _log.info(f'Configured path templates: [{matching_config.path_templates}]')
+            self._path_templates = PathTemplateIndex(matching_config.path_templates)
+
+        self._get_complete_hash = self._build_key_function(self._enabled_rules)
+
+        # Requests whose origin could not be resolved, such as the requests for the page initially opened
+        # at localhost, are matched by the configured default origin or, failing that, by the first entry
+        # accumulated with the same remaining key components regardless of the origin of the entry. An origin
+        # that no entry was recorded for, such as the LAN address or host name of the machine running the
+        # server, is treated the same as an origin that could not be resolved.
+        self._default_origin = matching_config.default_origin
+        self._recorded_origins: Set[str] = set()
+        # Maps the key of each request, without the origin, to the complete key of the first entry accumulated for it.
+        self._entries_without_origin: Dict[Tuple[str, ...], Tuple[str, ...]] | None = None
+        if 'origin' in self._enabled_rules:
+            self._get_hash_without_origin = self._build_key_function([rule for rule in self._enabled_rules if rule != 'origin'])
+            self._entries_without_origin = dict()
+
+        self._best_match_index: BestMatchIndex | None = None
+        if matching_config.fallback.enabled:
+            _log.info(f'Falling back to the best matching entry using up to [{matching_config.fallback.max_candidates}] candidates.')
+            self._best_match_index = BestMatchIndex(self._enabled_rules, matching_config.fallback.max_candidates, self._get_route_path)
+
+        # Unless the replay mode is first every entry is kept. The first entry for a key is always stored in the
+        # available entries and, only for keys with more than one entry, all of the entries are also stored in
+        # capture order in the replay sequences.
+        self._replay_cursors: ReplayCursors | None = None
+        if matching_config.replay.mode != 'first':
+            _log.info(f'Replaying repeated requests using the [{matching_config.replay.mode}] mode.')
+            self._replay_cursors = ReplayCursors(
+                matching_config.replay.mode,
+                matching_config.replay.client_header,
+                matching_config.replay.max_cursors
+            )
+        self._replay_sequences: Dict[Tuple[str, ...], Sequence[HarEntry]] = dict()
+
+        self._available_entries: Dict[Tuple[str, ...], HarEntry] = dict()
 
     def accumulate(self, entry: HarEntry) -> bool:
         key = self._get_complete_hash(entry.request)
-        if key not in self._available_entries:
+        first_entry = self._available_entries.get(key)
+        if first_entry is None:
             self._available_entries[key] = entry
+            if self._entries_without_origin is not None:
+                self._recorded_origins.add(entry.request.origin or '')
+                self._entries_without_origin.setdefault(self._get_hash_without_origin(entry.request), key)
+            if self._best_match_index is not None:
+                self._best_match_index.add(entry)
             return True
-        return False
 
-    def find_matching_entry(self, request: HarEntryRequest) -> HarEntry | None:
-        matching = self._available_entries.get(self._get_complete_hash(request))
-        if matching is not None:
-            return copy.deepcopy(matching)
-        return None
+        if self._replay_cursors is None:
+            return False
+        self._replay_sequences.setdefault(key, [first_entry]).append(entry)  # type: ignore
+        return True
+
+    def get_enabled_rules(self) -> List[str]:
+        """
+        Gets the names of the enabled request matching rules. Only the properties of a request named by
+        these rules are used to match the request.
+
+        :return: The names of the enabled rules.
+        """
+        return list(self._enabled_rules)
+
+    def get_replay_cursors(self) -> ReplayCursors | None:
+        """
+        Gets the cursors used to replay the entries of repeated requests.
+
+        :return: The replay cursors or None if the replay mode is first.
+        """
+        return self._replay_cursors
+
+    def get_entries(self) -> List[HarEntry]:
+        """
+        Gets all the entries that have been accumulated. The first entry accumulated for each distinct request
+        comes first, in the order they were accumulated, followed by any additional entries kept for replay.
+        Entries for the same request are always in the order they were accumulated.
+
+        :return: The list of accumulated entries.
+        """
+        entries = list(self._available_entries.values())
+        for sequence in self._replay_sequences.values():
+            entries.extend(sequence[1:])
+        return entries
+
+    def freeze_entries(self):
+        """
+        Freezes all the entries that have been accumulated so they can be safely shared between requests.
+        """
+        for entry in self.get_entries():
+            entry.freeze()
+        # No more entries can be accumulated once frozen so the sequences are compacted into tuples.
+        self._replay_sequences = {key: tuple(sequence) for key, sequence in self._replay_sequences.items()}
+
+    def find_matching_entry(self, request: HarEntryRequest, client_id: str = '') -> HarEntry | None:
+        """
+        Finds the accumulated entry whose request matches the input request.
+
+        The stored entry is returned as is, rather than as a copy, so the entries are expected to have been
+        frozen by freeze_entries. Any per request modification must be made to a copy of the entry created
+        using the mutable_copy method.
+
+        If the origin rule is enabled and the origin of the request is unknown, or no entry was recorded for the
+        origin of the request, the request is matched as if it had been sent to the default origin and, if that does not match, to the first entry with the same remaining
+        properties from any origin.
+
+        If the replay mode is not first and more than one entry was accumulated for the request, the entry
+        the client has not yet been served is returned based on the replay mode.
+
+        If no entry exactly matches and the matching fallback is enabled the entry with the same method and path
+        whose remaining properties are most similar to the request will be returned instead.
+
+        :param request: The rewritten incoming request.
+        :param client_id: The id of the client that sent the request. Only used when replaying.
+        :return: The matching entry or None if no entry matches.
+        """
+        if self._entries_without_origin is not None and not self._is_recorded_origin(request.origin):
+            matching = self._find_entry_without_origin(request, client_id)
+        else:
+            matching = self._find_entry(self._get_complete_hash(request), client_id)
+        if matching is None and self._best_match_index is not None:
+            return self._best_match_index.find_best_match(request)
+        return matching
     
-    def _get_complete_hash(self, request: HarEntryRequest) -> str:
-        entry_hash = ''
-        for key in RequestMatcher._HASH_FUNCTIONS.keys():
-            if key in self._enabled_rules:
-                entry_hash = entry_hash + '-' + RequestMatcher._HASH_FUNCTIONS[key](request)
-        return entry_hash
+    def _is_recorded_origin(self, origin: str | None) -> bool:
+        return origin is not None and origin != '' and origin in self._recorded_origins
+
+    def _find_entry(self, key: Tuple[str, ...], client_id: str) -> HarEntry | None:
+        matching = self._available_entries.get(key)
+        if matching is None or self._replay_cursors is None:
+            return matching
+        sequence = self._replay_sequences.get(key)
+        if sequence is None:
+            return matching
+        return sequence[self._replay_cursors.next_index(client_id, key, len(sequence))]
+
+    def _find_entry_without_origin(self, request: HarEntryRequest, client_id: str) -> HarEntry | None:
+        key = self._get_hash_without_origin(request)
+        if self._default_origin != '':
+            matching = self._find_entry((self._default_origin, *key), client_id)
+            if matching is not None:
+                return matching
+        complete_key = self._entries_without_origin.get(key)  # type: ignore
+        if complete_key is None:
+            return None
+        return self._find_entry(complete_key, client_id)
+
+    def _build_key_function(self, enabled_rules: List[str]) -> Callable[[HarEntryRequest], Tuple[str, ...]]:
+        # The attributes are resolved once, in a fixed order, so the key of a request is always built
+        # from the same components in the same positions without checking the enabled rules per request.
+        attributes = [attribute for name, attribute in RequestMatcher._KEY_ATTRIBUTES.items() if name in enabled_rules]
+        if len(attributes) == 0:
+            return lambda request: ()
+
+        if self._path_templates is not None and 'path' in attributes:
+            getters = [self._get_route_path if attribute == 'path' else operator.attrgetter(attribute) for attribute in attributes]
+            return lambda request: tuple(getter(request) for getter in getters)
+
+        getter = operator.attrgetter(*attributes)
+        if len(attributes) == 1:
+            return lambda request: (getter(request),)
+        return getter  # type: ignore
+
+    def _get_route_path(self, request: HarEntryRequest) -> str:
+        if self._path_templates is None:
+            return request.path
+        template = self._path_templates.resolve(request.path)
+        return template if template is not None else request.path
 
 
 @lru_cache()
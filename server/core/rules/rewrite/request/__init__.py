@@ -1 +1,11 @@
 from .request_rewriter import RequestRewriter as RequestRewriter, with_request_rewriter as with_request_rewriter
+from .digest import (
+    digest_pairs as digest_pairs,
+    digest_text as digest_text,
+    digest_json as digest_json,
+    compile_json_paths as compile_json_paths,
+    create_digest as create_digest,
+    digest_bytes as digest_bytes,
+    digest_multipart as digest_multipart
+)
+from .multipart import MultipartPart as MultipartPart, parse_multipart as parse_multipart
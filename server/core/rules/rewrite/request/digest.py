@@ -0,0 +1,197 @@
+from __future__ import annotations
+from typing import Any, Dict, Final, List
+import hashlib
+import json
+
+from server.core.har.models import NameValuePair
+
+from .multipart import MultipartPart
+
+
+_DIGEST_SIZE: Final[int] = 8
+
+_WILDCARD_SEGMENT: Final[str] = '*'
+
+# Encodes JSON values into their canonical form: sorted keys, no insignificant whitespace, and no escaping
+# of non-ASCII characters. The encoder is created once rather than on every call to json.dumps.
+_CANONICAL_JSON_ENCODER: Final[json.JSONEncoder] = json.JSONEncoder(
+    ensure_ascii=False,
+    check_circular=False,
+    sort_keys=True,
+    separators=(',', ':')
+)
+
+# A tree of the segments of the ignored JSON paths. A segment mapped to None is ignored along with
+# everything below it.
+JsonPathTree = Dict[str, 'JsonPathTree | None']
+
+_NOT_IGNORED: Final[object] = object()
+
+
+def _update_with_length_prefix(digest: 'hashlib._Hash', value: str):
+    # Each value is prefixed with its length so the encoding of a sequence of values
+    # is unambiguous. I.e. ['ab', 'c'] and ['a', 'bc'] produce different digests.
+    encoded = value.encode('utf-8')
+    digest.update(len(encoded).to_bytes(4, 'big'))
+    digest.update(encoded)
+
+
+def digest_pairs(pairs: List[NameValuePair]) -> str:
+    """
+    Computes a deterministic digest of the name value pairs. The pairs are sorted by name before
+    being digested so the order in which the pairs were originally specified does not matter.
+
+    Unlike the built-in hash function the digest is the same across every process and
+    so can be persisted or shared between processes.
+
+    :param pairs: The name value pairs to digest.
+    :return: The hex encoded 64-bit digest or an empty string if there are no pairs.
+    """
+    if len(pairs) == 0:
+        return ''
+
+    digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    for pair in sorted(pairs, key=lambda x: x.name):
+        _update_with_length_prefix(digest, pair.name)
+        _update_with_length_prefix(digest, pair.value)
+    return digest.hexdigest()
+
+
+def digest_text(text: str) -> str:
+    """
+    Computes a deterministic digest of the text.
+
+    :param text: The text to digest.
+    :return: The hex encoded 64-bit digest.
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=_DIGEST_SIZE).hexdigest()
+
+
+def create_digest() -> 'hashlib._Hash':
+    """
+    Creates an incremental digest using the same algorithm and size as the other digest functions, so the
+    hex digest of a body streamed into the incremental digest is the same as the result of digest_bytes.
+
+    :return: The incremental digest.
+    """
+    return hashlib.blake2b(digest_size=_DIGEST_SIZE)
+
+
+def digest_bytes(data: bytes) -> str:
+    """
+    Computes a deterministic digest of raw bytes, such as a text or binary request body.
+
+    :param data: The bytes to digest.
+    :return: The hex encoded 64-bit digest or an empty string if there are no bytes.
+    """
+    if len(data) == 0:
+        return ''
+    return hashlib.blake2b(data, digest_size=_DIGEST_SIZE).hexdigest()
+
+
+def digest_multipart(parts: List[MultipartPart]) -> str:
+    """
+    Computes a deterministic digest of the names and contents of the parts of a multipart body. The parts are
+    sorted by name so neither the boundary nor the order of the parts affect the digest. Like the names of
+    other name value pairs the part names are case-insensitive.
+
+    :param parts: The parts of the multipart body.
+    :return: The hex encoded 64-bit digest or an empty string if there are no parts.
+    """
+    if len(parts) == 0:
+        return ''
+
+    digest = create_digest()
+    for part in sorted(parts, key=lambda x: x.name.lower()):
+        _update_with_length_prefix(digest, part.name.lower())
+        digest.update(len(part.content).to_bytes(8, 'big'))
+        digest.update(part.content)
+    return digest.hexdigest()
+
+
+def compile_json_paths(paths: List[str]) -> JsonPathTree:
+    """
+    Compiles dot separated JSON paths, such as meta.requestId or items.*.timestamp, into a tree that can be
+    passed to digest_json. A * segment matches any key of an object or any element of an array and a numeric
+    segment matches the element of an array at that index.
+
+    The paths below a * segment are merged into each of its literal siblings so a key, or index, matched by both
+    a literal segment and a * segment is subject to the paths below both of them.
+
+    :param paths: The JSON paths to compile.
+    :return: The compiled path tree.
+    """
+    tree: JsonPathTree = dict()
+    for path in paths:
+        node = tree
+        segments = path.split('.')
+        for segment in segments[:-1]:
+            child = node.setdefault(segment, dict())
+            if child is None:
+                # A shorter path already ignores everything below this segment.
+                break
+            node = child
+        else:
+            node[segments[-1]] = None
+    return _merge_wildcards(tree)
+
+
+def _merge_wildcards(node: JsonPathTree) -> JsonPathTree:
+    wildcard = node.get(_WILDCARD_SEGMENT, _NOT_IGNORED)
+    for key, child in node.items():
+        if key != _WILDCARD_SEGMENT and wildcard is not _NOT_IGNORED:
+            child = _merge_path_trees(child, wildcard)  # type: ignore
+        node[key] = None if child is None else _merge_wildcards(child)
+    return node
+
+
+def _merge_path_trees(first: JsonPathTree | None, second: JsonPathTree | None) -> JsonPathTree | None:
+    # None means everything below the segment is ignored which takes precedence over any longer path.
+    if first is None or second is None:
+        return None
+    merged = dict(first)
+    for key, child in second.items():
+        merged[key] = _merge_path_trees(merged[key], child) if key in merged else child
+    return merged
+
+
+def digest_json(value: Any, ignored_paths: JsonPathTree | None = None) -> str:
+    """
+    Computes a deterministic digest of a parsed JSON value. Objects are digested with their keys sorted so the
+    order in which the keys were originally specified does not matter.
+
+    The value is encoded into its canonical form in a single pass of the native JSON encoder. Values at the
+    ignored paths are removed beforehand by copying only the objects and arrays along the ignored paths.
+
+    :param value: The parsed JSON value.
+    :param ignored_paths: The paths, compiled by compile_json_paths, of the values that should not affect the digest.
+    :return: The hex encoded 64-bit digest.
+    """
+    if ignored_paths:
+        value = _remove_ignored_paths(value, ignored_paths)
+    encoded = _CANONICAL_JSON_ENCODER.encode(value).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=_DIGEST_SIZE).hexdigest()
+
+
+def _remove_ignored_paths(value: Any, node: JsonPathTree) -> Any:
+    if isinstance(value, dict):
+        result = dict()
+        for key, item in value.items():
+            child = node.get(key, node.get(_WILDCARD_SEGMENT, _NOT_IGNORED))
+            if child is _NOT_IGNORED:
+                result[key] = item
+            elif child is not None:
+                result[key] = _remove_ignored_paths(item, child)  # type: ignore
+        return result
+
+    if isinstance(value, list):
+        result_list = []
+        for index, item in enumerate(value):
+            child = node.get(str(index), node.get(_WILDCARD_SEGMENT, _NOT_IGNORED))
+            if child is _NOT_IGNORED:
+                result_list.append(item)
+            elif child is not None:
+                result_list.append(_remove_ignored_paths(item, child))  # type: ignore
+        return result_list
+
+    return value
@@ -0,0 +1,51 @@
+from typing import Final, List, NamedTuple
+import re
+
+
+_CRLF: Final[bytes] = b'\r\n'
+_HEADER_SEPARATOR: Final[bytes] = b'\r\n\r\n'
+_CLOSING_DELIMITER_SUFFIX: Final[bytes] = b'--'
+_DISPOSITION_NAME: Final[re.Pattern[str]] = re.compile(r';\s*name\s*=\s*(?:"([^"]*)"|([^;\s]*))', re.IGNORECASE)
+
+
+class MultipartPart(NamedTuple):
+    name: str
+    content: bytes
+
+
+def parse_multipart(body: bytes) -> List[MultipartPart]:
+    """
+    Parses a multipart/form-data body into its parts.
+
+    The boundary is read from the first line of the body, rather than the Content-Type header, so the
+    body can be parsed even if the case of the header was not preserved, as is the case for the mime type
+    of a har entry request.
+
+    :param body: The complete multipart body.
+    :return: The parts of the body, in the order they appear, or an empty list if the body is not a
+        multipart body.
+    """
+    body = body.lstrip(_CRLF)
+    delimiter_end = body.find(_CRLF)
+    if not body.startswith(b'--') or delimiter_end == -1:
+        return []
+    delimiter = _CRLF + body[:delimiter_end]
+
+    parts: List[MultipartPart] = []
+    for raw_part in (_CRLF + body).split(delimiter)[1:]:
+        if raw_part.startswith(_CLOSING_DELIMITER_SUFFIX):
+            break
+        raw_headers, _, content = raw_part[len(_CRLF):].partition(_HEADER_SEPARATOR)
+        parts.append(MultipartPart(_parse_name(raw_headers.decode('latin-1')), content))
+    return parts
+
+
+def _parse_name(raw_headers: str) -> str:
+    for header in raw_headers.split('\r\n'):
+        header_name, _, value = header.partition(':')
+        if header_name.strip().lower() != 'content-disposition':
+            continue
+        match = _DISPOSITION_NAME.search(value)
+        if match is not None:
+            return match.group(1) if match.group(1) is not None else match.group(2)
+    return ''
@@ -1,14 +1,13 @@
-from typing import Annotated, List, Type, Final, Dict
+from typing import Annotated, Callable, List, Tuple, Type, Final
 from functools import lru_cache
 from enum import Enum
 import logging
-import json
 
 from fastapi import Depends
 
 from server.core.config import with_config_loader, ConfigLoader
 from server.core.har import HarEntryRequest
-from server.core.har.models import NameValuePair, RequestHashes, SupportedBodyContentTypes
+from server.core.har.models import RequestHashes, SupportedBodyContentTypes
 from server.core.rules.base import RuleContainer, RuleFailedException
 
 from .rules import (
@@ -17,6 +16,8 @@ from .rules import (
     RemoveCookieRequestRewriteRule,
     RequestRewriteRule
 )
+from .digest import compile_json_paths, digest_bytes, digest_json, digest_multipart, digest_pairs
+from .multipart import MultipartPart, parse_multipart
 
 
 _log = logging.getLogger(__file__)
@@ -41,10 +42,24 @@ class RequestRewriter:
             RequestRewriter._REQUEST_REWRITE_RULES
         )
 
-        rewrite_rules = config_loader.get_app_config().rewrite.request.rules
+        app_config = config_loader.get_app_config()
+        rewrite_rules = app_config.rewrite.request.rules
         _log.info(f'Configured request rewrite rules: [{rewrite_rules}]')
         self._rule_container.enable_rules(config_loader, rewrite_rules)
 
+        ignored_json_paths = app_config.request_matching.ignored_json_paths
+        self._ignored_json_paths = compile_json_paths(ignored_json_paths) if len(ignored_json_paths) > 0 else None
+
+        # Only the properties used to match requests are hashed. The hashes of every other property are left empty.
+        matching_rules = app_config.request_matching.rules
+        hash_functions: List[Tuple[str, str, Callable[[HarEntryRequest], str]]] = [
+            ('query-params', 'query_params', lambda request: digest_pairs(request.query_params)),
+            ('headers', 'headers', lambda request: digest_pairs(request.headers)),
+            ('cookies', 'cookies', lambda request: digest_pairs(request.cookies)),
+            ('body', 'post_data', self._hash_body)
+        ]
+        self._hash_functions = [(field, function) for rule, field, function in hash_functions if rule in matching_rules]
+
     def _apply_request_rewrite_rules(self, request: HarEntryRequest, modification_type: _ModificationType)\
             -> HarEntryRequest:
 
@@ -98,32 +113,26 @@ class RequestRewriter:
         :raise RequestRuleFailedException: if any of the rewrite rules raised an exception.
         """
         return self._apply_request_rewrite_rules(request, _ModificationType.ENTRY)
-    
-    def _hash_pairs(self, pairs: List[NameValuePair]) -> str:
-        if len(pairs) == 0:
-            return ''
-
-        sorted_pairs = sorted(pairs, key=lambda x: x.name)
-        pairs_string = '&'.join([f'{pair.name}={pair.value}' for pair in sorted_pairs])
-        return str(hash(pairs_string))
 
     def _hash_body(self, request: HarEntryRequest) -> str:
-        if request.post_data.mime_type == SupportedBodyContentTypes.APPLICATION_JSON:
-            json_text = json.dumps(request.post_data.parsed_json, sort_keys=True)
-            return str(hash(json_text))
-        elif request.post_data.mime_type == SupportedBodyContentTypes.FORM_URL_ENCODED:
-            return self._hash_pairs(request.post_data.params)
-        return ''
+        post_data = request.post_data
+        if post_data.body_digest != '':
+            return post_data.body_digest
+
+        mime_type = post_data.mime_type
+        if SupportedBodyContentTypes.APPLICATION_JSON in mime_type:
+            return digest_json(post_data.parsed_json, self._ignored_json_paths)
+        elif SupportedBodyContentTypes.FORM_URL_ENCODED in mime_type:
+            return digest_pairs(post_data.params)
+        elif SupportedBodyContentTypes.MULTIPART_FORM_DATA in mime_type:
+            # Har files record multipart bodies either as the raw text or as the parsed params.
+            if post_data.text != '':
+                return digest_multipart(parse_multipart(post_data.text.encode('utf-8')))
+            return digest_multipart([MultipartPart(param.name, param.value.encode('utf-8')) for param in post_data.params])
+        return digest_bytes(post_data.text.encode('utf-8'))
 
     def _hash_request_properties(self, request: HarEntryRequest) -> RequestHashes:
-        hashes: Dict[str, str] = dict()
-
-        hashes['query_params'] = self._hash_pairs(request.query_params)
-        hashes['headers'] = self._hash_pairs(request.headers)
-        hashes['cookies'] = self._hash_pairs(request.cookies)
-        hashes['post_data'] = self._hash_body(request)
-
-        return RequestHashes(**hashes)
+        return RequestHashes.model_construct(**{field: function(request) for field, function in self._hash_functions})
 
 
 @lru_cache()
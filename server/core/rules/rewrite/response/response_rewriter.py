@@ -1,4 +1,4 @@
-from typing import Annotated, List, Type, Final
+from typing import Annotated, List, Type, Tuple, Final
 from functools import lru_cache
 import logging
 
@@ -10,12 +10,15 @@ from server.core.rules.base import RuleContainer, RuleFailedException
 
 from .rules import (
     ResponseRewriteRule,
+    HtmlResponseRewriteRule,
     RewriteUrlResponseRewriteRule,
     RemoveHeaderResponseRewriteRule,
     RemoveCookiesResponseRewriteRule,
     RemoveHtmlScriptTagsResponseRewriteRule,
-    RemoveIntegrityAttributeResponseRewriteRule
+    RemoveIntegrityAttributeResponseRewriteRule,
+    rewrite_html
 )
+from .rules.html_stream import TagRewriter
 
 
 _log = logging.getLogger(__file__)
@@ -37,9 +40,25 @@ class ResponseRewriter:
             ResponseRewriter._RESPONSE_REWRITE_RULES
         )
 
-        rules = config_loader.get_app_config().rewrite.response.rules
+        response_config = config_loader.get_app_config().rewrite.response
+        rules = response_config.rules
         _log.info(f'Configured response rewrite rules: [{rules}]')
         self._rule_container.enable_rules(config_loader, rules)
+        self._is_lazy = response_config.lazy and self._rule_container.has_any_rules_enabled()
+
+        self._html_rewriters: List[Tuple[str, TagRewriter]] = [
+            (name, rule.rewrite_tag) for name, rule in self._rule_container.get_enabled_rules()
+            if isinstance(rule, HtmlResponseRewriteRule)
+        ]
+
+    def is_lazy(self) -> bool:
+        """
+        Checks if the responses should be rewritten the first time they are served rather than when the
+        .har files are processed.
+
+        :return: True if lazy rewriting is enabled and at least one rule is enabled, otherwise false.
+        """
+        return self._is_lazy
 
     def apply_response_rewrite_rules(self, response: HarEntryResponse) -> HarEntryResponse:
         """
@@ -51,6 +70,9 @@ class ResponseRewriter:
         If no response rewrite rules have been configured then this will return the original input response without
         modification or copying.
 
+        The rules that rewrite the tags of HTML content are applied together, at the position of the first of said
+        rules, so the HTML content is only streamed through once regardless of how many of them are enabled.
+
         :param response: The response, pulled from a har file entry, to be modified then returned to the consuming
             client.
         :return: A modified copy of the input har response.
@@ -60,7 +82,13 @@ class ResponseRewriter:
         if not self._rule_container.has_any_rules_enabled():
             return response
 
+        applied_html_rewriters = False
         for name, rule in self._rule_container.get_enabled_rules():
+            if isinstance(rule, HtmlResponseRewriteRule):
+                if not applied_html_rewriters:
+                    applied_html_rewriters = True
+                    response = rewrite_html(response, self._html_rewriters)
+                continue
             try:
                 response = rule.rewrite_response(response)
             except Exception as e:
@@ -3,5 +3,6 @@ from .remove_header_response_rewrite_rule import RemoveHeaderResponseRewriteRule
 from .remove_integrity_attribute_response_rewrite_rule import RemoveIntegrityAttributeResponseRewriteRule as RemoveIntegrityAttributeResponseRewriteRule
 from .rewrite_url_response_rewrite_rule import RewriteUrlResponseRewriteRule as RewriteUrlResponseRewriteRule
 from .remove_html_script_tags import RemoveHtmlScriptTagsResponseRewriteRule as RemoveHtmlScriptTagsResponseRewriteRule
-from .base import ResponseRewriteRule as ResponseRewriteRule
+from .base import ResponseRewriteRule as ResponseRewriteRule, HtmlResponseRewriteRule as HtmlResponseRewriteRule
+from .html_stream import HtmlTag as HtmlTag, HtmlStreamRewriter as HtmlStreamRewriter, rewrite_html as rewrite_html
 
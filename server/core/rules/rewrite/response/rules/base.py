@@ -3,9 +3,33 @@ from abc import ABC, abstractmethod
 from server.core.rules.base import Rule
 from server.core.har import HarEntryResponse
 
+from .html_stream import HtmlTag, rewrite_html
+
 
 class ResponseRewriteRule(Rule, ABC):
 
     @abstractmethod
     def rewrite_response(self, response: HarEntryResponse) -> HarEntryResponse:
         pass
+
+
+class HtmlResponseRewriteRule(ResponseRewriteRule, ABC):
+    """
+    A rule that rewrites the tags of an HTML response.
+
+    The ResponseRewriter streams the content of an HTML response through every enabled HtmlResponseRewriteRule
+    in a single pass. When a rule is applied on its own the content is streamed through just said rule.
+    """
+
+    def rewrite_response(self, response: HarEntryResponse) -> HarEntryResponse:
+        return rewrite_html(response, [(self.get_name(), self.rewrite_tag)])
+
+    @abstractmethod
+    def rewrite_tag(self, tag: HtmlTag) -> bool:
+        """
+        Rewrites a start tag of the HTML content.
+
+        :param tag: The start tag. Attributes removed from the tag are removed from the output.
+        :return: False if the element, including its content, should be removed from the output, otherwise true.
+        """
+        pass
@@ -0,0 +1,179 @@
+from typing import Callable, Final, FrozenSet, List, Tuple
+from html import escape
+from html.parser import HTMLParser
+import logging
+
+from server.core.har import HarEntryResponse
+
+
+_log = logging.getLogger(__file__)
+
+
+# The elements that never have any content or end tag. Dropping one of these only drops the tag itself.
+_VOID_ELEMENTS: Final[FrozenSet[str]] = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'
+])
+
+# Written in place of a token to leave the token out of the output.
+_DROP: Final[object] = object()
+
+# The number of characters fed to the parser at once when rewriting a complete document.
+_CHUNK_SIZE: Final[int] = 64 * 1024
+
+
+class HtmlTag:
+    """
+    A start tag encountered while streaming through an HTML document.
+    """
+
+    def __init__(self, name: str, attrs: List[Tuple[str, str | None]]):
+        self.name = name
+        self._attrs = attrs
+        self._modified = False
+
+    def remove_attribute(self, name: str):
+        attrs = [attr for attr in self._attrs if attr[0] != name]
+        if len(attrs) != len(self._attrs):
+            self._attrs = attrs
+            self._modified = True
+
+    def is_modified(self) -> bool:
+        return self._modified
+
+    def render(self, self_closing: bool) -> str:
+        rendered_attrs = ''.join(
+            f' {name}' if value is None else f' {name}="{escape(value)}"' for name, value in self._attrs
+        )
+        return f'<{self.name}{rendered_attrs}{" /" if self_closing else ""}>'
+
+
+TagRewriter = Callable[[HtmlTag], bool]
+
+
+class HtmlStreamRewriter(HTMLParser):
+    """
+    Rewrites an HTML document in a single forward pass over its tokens without building a tree of the document.
+
+    Each start tag is passed to every tag rewriter. A rewriter can remove attributes from the tag or drop the
+    element by returning False, in which case the tag, its content, and its end tag are all left out of the output.
+    Every other token is copied to the output exactly as it appears in the document.
+
+    The document can be fed in chunks of any size. The parser holds back an incomplete trailing token until the
+    next chunk arrives. The memory used is therefore bounded by the size of a chunk plus the largest token held
+    back, which includes the entire content of an inline <script> or <style> element since the parser waits for
+    the end tag of said elements before handing over their content.
+    """
+
+    def __init__(self, tag_rewriters: List[TagRewriter]):
+        super().__init__(convert_charrefs=False)
+        self._tag_rewriters = tag_rewriters
+        self._output: List[str] = []
+        self._dropped_tag: str | None = None
+        self._dropped_depth = 0
+        # What to write in place of the token currently being parsed. None writes the token as it appears in the
+        # document, unless the token is within a dropped element, _DROP writes nothing, and a string writes the
+        # string instead.
+        self._replacement: str | object | None = None
+
+    def feed(self, data: str) -> str:
+        """
+        Feeds the next chunk of the document to the rewriter.
+
+        :param data: The next chunk of the document.
+        :return: The rewritten output that could be produced from the document fed so far.
+        """
+        super().feed(data)
+        return self._take_output()
+
+    def close(self) -> str:
+        """
+        Signals the end of the document.
+
+        :return: The remaining rewritten output.
+        """
+        super().close()
+        # The parser never hands over the content of a <script> or <style> element whose end tag is missing, such as
+        # in a truncated document, so said content is still held back once the parser has been closed.
+        if self.rawdata != '':
+            if self._dropped_tag is None:
+                self._output.append(self.rawdata)
+            self.rawdata = ''
+        return self._take_output()
+
+    def updatepos(self, i: int, j: int) -> int:
+        # The parser calls updatepos with the start and end of each token once the token has been handled, so the
+        # original text of the token can be copied as is rather than being rebuilt from the parsed values.
+        if i < j:
+            replacement = self._replacement
+            self._replacement = None
+            if replacement is None:
+                if self._dropped_tag is None:
+                    self._output.append(self.rawdata[i:j])
+            elif replacement is not _DROP:
+                self._output.append(replacement)  # type: ignore
+        return super().updatepos(i, j)
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, str | None]]):
+        self._handle_tag(tag, attrs, False)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, str | None]]):
+        self._handle_tag(tag, attrs, True)
+
+    def handle_endtag(self, tag: str):
+        if self._dropped_tag is None:
+            return
+        self._replacement = _DROP
+        if tag == self._dropped_tag:
+            self._dropped_depth = self._dropped_depth - 1
+            if self._dropped_depth == 0:
+                self._dropped_tag = None
+
+    def _handle_tag(self, name: str, attrs: List[Tuple[str, str | None]], self_closing: bool):
+        if self._dropped_tag is not None:
+            if name == self._dropped_tag and not self_closing:
+                self._dropped_depth = self._dropped_depth + 1
+            return
+
+        tag = HtmlTag(name, attrs)
+        for tag_rewriter in self._tag_rewriters:
+            if not tag_rewriter(tag):
+                self._replacement = _DROP
+                if not self_closing and name not in _VOID_ELEMENTS:
+                    self._dropped_tag = name
+                    self._dropped_depth = 1
+                return
+
+        if tag.is_modified():
+            self._replacement = tag.render(self_closing)
+
+    def _take_output(self) -> str:
+        output = ''.join(self._output)
+        self._output.clear()
+        return output
+
+
+def rewrite_html(response: HarEntryResponse, rewriters: List[Tuple[str, TagRewriter]]) -> HarEntryResponse:
+    """
+    Streams the HTML content of the response through each of the tag rewriters in a single pass.
+
+    If the content could not be rewritten the error is logged and the response is left unchanged.
+
+    :param response: The response whose content is to be rewritten.
+    :param rewriters: The name of each rule along with the function that rewrites each start tag.
+    :return: The response with the rewritten content.
+    """
+    if 'text/html' not in response.content.mime_type:
+        return response
+
+    content = response.content.text
+    try:
+        stream_rewriter = HtmlStreamRewriter([tag_rewriter for _, tag_rewriter in rewriters])
+        output = [stream_rewriter.feed(content[index:index + _CHUNK_SIZE]) for index in range(0, len(content), _CHUNK_SIZE)]
+        output.append(stream_rewriter.close())
+    except Exception as e:
+        names = [name for name, _ in rewriters]
+        _log.error(f'{names}: Could not rewrite the HTML content because it could not be parsed: [{e}]')
+        return response
+
+    response.content.text = ''.join(output)
+    return response
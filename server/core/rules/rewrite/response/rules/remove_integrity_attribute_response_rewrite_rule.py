@@ -1,21 +1,10 @@
-from typing import List
-import logging
-
-from bs4 import BeautifulSoup
-
-from server.core.har import HarEntryResponse
 from server.core.config import ConfigLoader
 
-from .base import ResponseRewriteRule
-
-
-_log = logging.getLogger(__file__)
-
+from .base import HtmlResponseRewriteRule
+from .html_stream import HtmlTag
 
-class RemoveIntegrityAttributeResponseRewriteRule(ResponseRewriteRule):
 
-    def __init__(self):
-        self._removable: List[str] = []
+class RemoveIntegrityAttributeResponseRewriteRule(HtmlResponseRewriteRule):
 
     def get_name(self) -> str:
         return 'remove-integrity-attribute'
@@ -23,21 +12,7 @@ class RemoveIntegrityAttributeResponseRewriteRule(ResponseRewriteRule):
     def initialize(self, config_loader: ConfigLoader):
         pass
 
-    def rewrite_response(self, response: HarEntryResponse) -> HarEntryResponse:
-        if 'text/html' not in response.content.mime_type:
-            return response
-
-        try:
-            parsed = BeautifulSoup(response.content.text, 'html.parser')
-
-            for script in parsed.find_all('script'):
-                del script['integrity']
-            
-            for link in parsed.find_all('link'):
-                del link['integrity']
-
-            response.content.text = str(parsed)
-        except Exception as e:
-            _log.error(f'remove-integrity-attribute: Could not remove integrity attributes because the HTML content could not be parsed: [{e}]')
-
-        return response
+    def rewrite_tag(self, tag: HtmlTag) -> bool:
+        if tag.name == 'script' or tag.name == 'link':
+            tag.remove_attribute('integrity')
+        return True
@@ -1,9 +1,9 @@
 from __future__ import annotations
-from typing import List
+from typing import FrozenSet, List
 import logging
 
 from server.core.config import ConfigLoader
-from server.core.har import HarEntryResponse
+from server.core.har import HarEntryResponse, ORIGIN_PATH_PREFIX, get_origin_of_url
 
 from .base import ResponseRewriteRule
 from .url_origin_captor import UrlOriginCaptor, CapturedOrigin
@@ -18,16 +18,18 @@ _LOCALHOST_TEMPLATE = 'http://localhost:{}'
 class RewriteUrlResponseRewriteRule(ResponseRewriteRule):
 
     def __init__(self):
-        self._excluded_domains: List[str] = []
+        self._excluded_domains: FrozenSet[str] = frozenset()
         self._localhost_url = _LOCALHOST_TEMPLATE.format(8080)
+        self._preserve_origins = False
 
     def get_name(self) -> str:
         return 'urls-in-response'
 
     def initialize(self, config_loader: ConfigLoader):
         app_config = config_loader.get_app_config()
-        self._excluded_domains = app_config.rewrite.response.config.excluded_domains
+        self._excluded_domains = frozenset(app_config.rewrite.response.config.excluded_domains)
         self._localhost_url = _LOCALHOST_TEMPLATE.format(app_config.port)
+        self._preserve_origins = app_config.rewrite.response.config.preserve_origins
 
     def rewrite_response(self, response: HarEntryResponse) -> HarEntryResponse:
         content = response.content.text
@@ -44,27 +46,33 @@ class RewriteUrlResponseRewriteRule(ResponseRewriteRule):
     def _replace_all_captured_origins(self,
                                       content: str,
                                       capture_results: List[CapturedOrigin],
-                                      excluded_domains: List[str]) -> str:
+                                      excluded_domains: FrozenSet[str]) -> str:
 
-        # The modifier is used to capture the change in the length of the input content string as each
-        # captured domain is replaced with the localhost domain.
-        modifier = 0
+        # The unchanged slices between the captured origins and the replacements are collected and joined
+        # once so the content is only copied once regardless of the number of captured origins.
+        parts: List[str] = []
+        last_index = 0
         for captured in capture_results:
-            new_content = self._replace_captured_origin(content, captured, modifier, excluded_domains)
-            modifier = modifier + (len(content) - len(new_content))
-            content = new_content
-        return content
-
-    def _replace_captured_origin(self,
-                                 content: str,
-                                 captured: CapturedOrigin,
-                                 modifier: int,
-                                 excluded_domains: List[str]) -> str:
-
-        start_index = captured.start_index - modifier
-        origin = content[start_index:start_index + captured.length]
-        if origin in excluded_domains:
-            _log.debug(f'Skipping excluded domain: [{origin}]')
+            end_index = captured.start_index + captured.length
+            origin = content[captured.start_index:end_index]
+            if origin in excluded_domains:
+                _log.debug(f'Skipping excluded domain: [{origin}]')
+                continue
+            _log.debug(f'Replacing with localhost: [{origin}]')
+            parts.append(content[last_index:captured.start_index])
+            parts.append(self._get_replacement(origin))
+            last_index = end_index
+        if last_index == 0:
             return content
-        _log.debug(f'Replacing with localhost: [{origin}]')
-        return content[:start_index] + self._localhost_url + content[start_index + captured.length:]
+        parts.append(content[last_index:])
+        return ''.join(parts)
+
+    def _get_replacement(self, origin: str) -> str:
+        # When preserving origins the replaced origin is moved into the path so the request matcher can
+        # tell apart the requests for the same path on different origins.
+        if not self._preserve_origins:
+            return self._localhost_url
+        host = get_origin_of_url(origin)
+        if host == '':
+            return self._localhost_url
+        return f'{self._localhost_url}{ORIGIN_PATH_PREFIX}{host}'
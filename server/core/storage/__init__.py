@@ -0,0 +1,2 @@
+from .body_store import BodyStore as BodyStore, with_body_store as with_body_store
+from .route_snapshot import RouteSnapshot as RouteSnapshot, with_route_snapshot as with_route_snapshot
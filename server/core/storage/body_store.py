@@ -0,0 +1,129 @@
+from typing import BinaryIO
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+import logging
+import mmap
+import shutil
+import tempfile
+
+from server.core.har import BodyHandle
+
+
+_log = logging.getLogger(__file__)
+
+
+class BodyStore:
+    """
+    Packs response bodies back to back into a single file that is memory-mapped for reading.
+
+    Bodies are written to an anonymous temporary file while the har files are being processed. Alternatively
+    the store can be pointed at a previously saved bodies file, such as the one stored in a route snapshot, in
+    which case the store becomes read-only.
+    """
+
+    def __init__(self):
+        self._file: BinaryIO | None = None
+        self._is_read_only = False
+        self._size = 0
+        self._mapped: mmap.mmap | None = None
+        self._lock = Lock()
+
+    def is_read_only(self) -> bool:
+        return self._is_read_only
+
+    def write(self, body: bytes) -> BodyHandle:
+        """
+        Appends the body to the end of the store.
+
+        :param body: The decoded body to store.
+        :return: The handle used to read the body back from the store.
+        :raise RuntimeError: if the store was loaded from an existing bodies file.
+        """
+        if self._is_read_only:
+            raise RuntimeError('Cannot write to a body store that was loaded from an existing bodies file.')
+
+        with self._lock:
+            if self._file is None:
+                self._file = tempfile.TemporaryFile(prefix='har-server-bodies-')
+            handle = BodyHandle(offset=self._size, length=len(body))
+            self._file.seek(self._size)
+            self._file.write(body)
+            self._size = self._size + len(body)
+            return handle
+
+    def read(self, handle: BodyHandle) -> bytes:
+        """
+        Reads a previously written body from the store.
+
+        :param handle: The handle returned when the body was written.
+        :return: The body.
+        """
+        if handle.length == 0:
+            return b''
+
+        end = handle.offset + handle.length
+        mapped = self._mapped
+        if mapped is None or end > len(mapped):
+            mapped = self._map()
+        return mapped[handle.offset:end]
+
+    def save_to(self, path: Path):
+        """
+        Copies the contents of the store to the specified file.
+
+        :param path: The file the bodies should be written to.
+        """
+        with self._lock:
+            with open(path, 'wb') as destination:
+                if self._file is not None:
+                    self._file.flush()
+                    self._file.seek(0)
+                    shutil.copyfileobj(self._file, destination)
+
+    def load_from(self, path: Path):
+        """
+        Replaces the contents of the store with a previously saved bodies file. The file is memory-mapped
+        in place so the store becomes read-only.
+
+        :param path: The bodies file to load.
+        """
+        with self._lock:
+            self._close()
+            self._file = open(path, 'rb')
+            self._is_read_only = True
+            self._size = path.stat().st_size
+        _log.info(f'Loaded [{self._size}] bytes of response bodies from: [{path}]')
+
+    def close(self):
+        """
+        Releases the file backing the store along with its memory map. The store must no longer be read from.
+        """
+        with self._lock:
+            if self._mapped is not None:
+                self._mapped.close()
+            self._close()
+
+    def _map(self) -> mmap.mmap:
+        with self._lock:
+            if self._mapped is not None and len(self._mapped) == self._size:
+                return self._mapped
+            if self._file is None or self._size == 0:
+                raise ValueError('Cannot read from an empty body store.')
+            self._file.flush()
+            self._mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mapped
+
+    def _close(self):
+        # The previous map is intentionally not closed since requests being served
+        # may still be reading from it. It will be released once it is no longer referenced.
+        self._mapped = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._size = 0
+
+
+@lru_cache()
+def with_body_store() -> BodyStore:
+    return BodyStore()
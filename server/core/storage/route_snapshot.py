@@ -0,0 +1,198 @@
+from typing import Annotated, Any, Dict, Final, List, Tuple
+from functools import lru_cache
+from pathlib import Path
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import time
+
+from fastapi import Depends
+
+from server.core.config import get_root_path
+from server.core.har import HarParser, HarEntry, with_har_parser
+from server.core.metrics import MetricRecorder, with_metric_recorder
+from server.core.rules.matching import RequestMatcher, with_request_matcher
+
+from .body_store import BodyStore, with_body_store
+
+
+_log = logging.getLogger(__file__)
+
+
+# Increment whenever the layout of the snapshot files changes so snapshots written
+# by an older version are rebuilt rather than loaded.
+_SNAPSHOT_VERSION: Final[int] = 11
+
+_INDEX_FILE_SUFFIX: Final[str] = '.index'
+_BODIES_FILE_SUFFIX: Final[str] = '.bodies'
+_TEMP_FILE_SUFFIX: Final[str] = '.tmp'
+_CONFIG_FILE_NAME: Final[str] = '_config.yml'
+
+_CACHE_DIR_VARIABLE: Final[str] = 'HAR_SERVER_CACHE_DIR'
+
+
+class RouteSnapshot:
+    """
+    Saves and loads the fully processed entries of a har folder.
+
+    Snapshots are kept in a cache directory owned by the server, rather than in the har folder, since
+    the index is unpickled when loaded and the har folder may come from an untrusted source. Each har
+    folder gets its own sub-directory of the cache directory and the snapshot files within it are named
+    after the fingerprint of the inputs they were built from.
+    """
+
+    def __init__(self,
+                 har_parser: HarParser,
+                 request_matcher: RequestMatcher,
+                 body_store: BodyStore,
+                 metric_recorder: MetricRecorder):
+
+        self._har_parser = har_parser
+        self._request_matcher = request_matcher
+        self._body_store = body_store
+        self._metric_recorder = metric_recorder
+
+    def compute_fingerprint(self) -> str:
+        """
+        Computes a fingerprint of the inputs the route table is built from: the path, size, and
+        modification time of each .har file plus the contents of the _config.yml file.
+
+        :return: The hex encoded fingerprint.
+        """
+        root_path = get_root_path()
+        digest = hashlib.sha256(str(_SNAPSHOT_VERSION).encode('utf-8'))
+        for har_path in self._har_parser.get_har_file_paths():
+            stat = har_path.stat()
+            relative_path = har_path.relative_to(root_path).as_posix()
+            digest.update(f'{relative_path}\0{stat.st_size}\0{stat.st_mtime_ns}\0'.encode('utf-8'))
+
+        config_path = root_path.joinpath(_CONFIG_FILE_NAME)
+        if config_path.is_file():
+            digest.update(config_path.read_bytes())
+        return digest.hexdigest()
+
+    def is_up_to_date(self) -> bool:
+        """
+        Checks if a snapshot exists and was built from the current .har files and configuration.
+
+        :return: True if the snapshot can be loaded, otherwise false.
+        """
+        return self._read_index() is not None
+
+    def load(self) -> bool:
+        """
+        Attempts to populate the request matcher using a previously saved snapshot.
+
+        The snapshot will only be used if its fingerprint matches the fingerprint of the current .har
+        files and configuration. The bodies file of the snapshot is memory-mapped in place by the body store.
+
+        :return: True if the snapshot was loaded, otherwise false.
+        """
+        start = time.perf_counter()
+        index = self._read_index()
+        if index is None:
+            return False
+
+        _, bodies_path = self._get_paths(index['fingerprint'])
+        self._body_store.load_from(bodies_path)
+        entries: List[HarEntry] = index['entries']
+        for entry in entries:
+            self._request_matcher.accumulate(entry)
+        self._metric_recorder.restore_body_deduplication(index['body_deduplication'])
+
+        _log.info(f'Loaded [{len(entries)}] entries from route snapshot in [{time.perf_counter() - start:.3f}] seconds.')
+        return True
+
+    def save(self):
+        """
+        Writes the entries currently accumulated by the request matcher to the snapshot files.
+
+        The contents of the body store are copied to the bodies file and the entries, which only hold the
+        offset and length of their body within the body store, are written to the index file.
+        """
+        fingerprint = self.compute_fingerprint()
+        index_path, bodies_path = self._get_paths(fingerprint)
+        index_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+        # The temporary files are given unique names so concurrent builders, such as the snapshot command and
+        # the parent process of a multi-worker server, never write to or replace each other's files.
+        temp_bodies_path = self._create_temp_file(bodies_path)
+        temp_index_path = self._create_temp_file(index_path)
+        try:
+            self._body_store.save_to(temp_bodies_path)
+            entries = self._request_matcher.get_entries()
+
+            index = {
+                'version': _SNAPSHOT_VERSION,
+                'fingerprint': fingerprint,
+                'entries': entries,
+                'body_deduplication': self._metric_recorder.get_body_deduplication()
+            }
+            with open(temp_index_path, 'wb') as file:
+                pickle.dump(index, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            # The index is replaced last since it holds the fingerprint that marks the snapshot as usable.
+            os.replace(temp_bodies_path, bodies_path)
+            os.replace(temp_index_path, index_path)
+        finally:
+            temp_bodies_path.unlink(missing_ok=True)
+            temp_index_path.unlink(missing_ok=True)
+
+        _log.info(f'Saved [{len(entries)}] entries to route snapshot: [{index_path}]')
+        self._remove_stale_snapshots(fingerprint)
+
+    def _create_temp_file(self, path: Path) -> Path:
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name + '.', suffix=_TEMP_FILE_SUFFIX, delete=False) as file:
+            return Path(file.name)
+
+    def _remove_stale_snapshots(self, fingerprint: str):
+        # Only completed snapshot files are removed. The temporary files of another builder are left alone.
+        snapshot_dir = self._get_paths(fingerprint)[0].parent
+        for path in snapshot_dir.iterdir():
+            if path.suffix not in (_INDEX_FILE_SUFFIX, _BODIES_FILE_SUFFIX) or path.stem == fingerprint:
+                continue
+            try:
+                path.unlink()
+            except OSError as e:
+                # The bodies of a stale snapshot may still be memory-mapped by a running server.
+                _log.debug(f'Could not remove stale route snapshot file: [{path}]. Cause: [{e}]')
+
+    def _read_index(self) -> Dict[str, Any] | None:
+        fingerprint = self.compute_fingerprint()
+        index_path, bodies_path = self._get_paths(fingerprint)
+        if not index_path.is_file() or not bodies_path.is_file():
+            _log.info(f'No route snapshot of the current har files and configuration found at: [{index_path}]')
+            return None
+
+        with open(index_path, 'rb') as file:
+            index: Dict[str, Any] = pickle.load(file)
+
+        if index.get('version') != _SNAPSHOT_VERSION or index.get('fingerprint') != fingerprint:
+            _log.info('Route snapshot is out of date with the current har files or configuration and will be ignored.')
+            return None
+        return index
+
+    def _get_paths(self, fingerprint: str) -> Tuple[Path, Path]:
+        root_key = hashlib.sha256(str(get_root_path().resolve()).encode('utf-8')).hexdigest()
+        snapshot_dir = _get_cache_dir().joinpath(root_key)
+        return snapshot_dir.joinpath(fingerprint + _INDEX_FILE_SUFFIX), snapshot_dir.joinpath(fingerprint + _BODIES_FILE_SUFFIX)
+
+
+def _get_cache_dir() -> Path:
+    cache_dir = os.environ.get(_CACHE_DIR_VARIABLE)
+    if cache_dir is not None:
+        return Path(cache_dir)
+    cache_home = os.environ.get('XDG_CACHE_HOME')
+    base_dir = Path(cache_home) if cache_home else Path.home().joinpath('.cache')
+    return base_dir.joinpath('har-server', 'snapshots')
+
+
+@lru_cache()
+def with_route_snapshot(har_parser: Annotated[HarParser, Depends(with_har_parser)],
+                        request_matcher: Annotated[RequestMatcher, Depends(with_request_matcher)],
+                        body_store: Annotated[BodyStore, Depends(with_body_store)],
+                        metric_recorder: Annotated[MetricRecorder, Depends(with_metric_recorder)]) -> RouteSnapshot:
+
+    return RouteSnapshot(har_parser, request_matcher, body_store, metric_recorder)
@@ -1,2 +1,2 @@
 from .application import app as app
-
+from .app_factory import create_app as create_app
@@ -0,0 +1,17 @@
+from starlette.types import ASGIApp
+
+from server.core.config import with_config_loader, with_config_parser
+
+from .application import app
+from .lean_application import LeanApplication
+
+
+def create_app() -> ASGIApp:
+    """
+    Creates the application to serve based on the serving configuration.
+
+    :return: The lean ASGI application, if enabled, otherwise the FastAPI application.
+    """
+    if with_config_loader(with_config_parser()).get_app_config().serving.lean_asgi:
+        return LeanApplication(app)
+    return app
@@ -1,12 +1,12 @@
 from typing import Annotated
 import logging
 
-from fastapi import FastAPI, Request, Depends, HTTPException, Response
+from fastapi import FastAPI, Request, Depends, Response
 from fastapi.responses import JSONResponse
 
 from server.core.config import with_config_loader, with_config_parser
 from server.core.routing import RouteMap, with_route_map
-from server.core.metrics import MetricRecorder, with_metric_recorder
+from server.core.metrics import MetricRecorder, MissLog, with_metric_recorder, with_miss_log
 
 from .response_transformer import with_response_transformer, ResponseTransformer
 from .lifespan import lifespan
@@ -27,16 +27,29 @@ async def get(request: Request,
               full_path: str,
               route_map: Annotated[RouteMap, Depends(with_route_map)],
               response_transformer: Annotated[ResponseTransformer, Depends(with_response_transformer)],
-              metric_recorder: Annotated[MetricRecorder, Depends(with_metric_recorder)]):
+              metric_recorder: Annotated[MetricRecorder, Depends(with_metric_recorder)],
+              miss_log: Annotated[MissLog, Depends(with_miss_log)]):
 
     if metric_recorder.is_enabled() and full_path == '__metrics__':
         metrics = metric_recorder.get_metrics()
         _log.debug(f'Serving metrics [{metrics}]')
         return JSONResponse(metrics)
 
+    if metric_recorder.is_enabled() and full_path == '__stats__':
+        stats = metric_recorder.get_stats()
+        _log.debug(f'Serving stats [{stats}]')
+        return JSONResponse(stats)
+
+    if miss_log.is_enabled() and full_path == '__misses__':
+        misses = miss_log.get_misses()
+        _log.debug(f'Serving misses [{misses}]')
+        return JSONResponse(misses)
+
     entry = await route_map.find_entry_for_request(request)
     if entry is None:
-        raise HTTPException(status_code=404, detail='No har entry matching request found.')
+        if miss_log.is_enabled():
+            miss_log.record(request.method, request.url.path)
+        return response_transformer.create_not_found_response()
     return response_transformer.map_to_fastapi_response(entry)
 
 
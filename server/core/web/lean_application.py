@@ -0,0 +1,87 @@
+from typing import Final, List, Tuple
+from threading import Lock
+import logging
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from server.core.config import with_config_loader
+from server.core.dependencies import resolve_dependency
+from server.core.har import ORIGIN_PATH_PREFIX
+from server.core.metrics import MissLog, with_miss_log
+from server.core.rendering import ResponseRenderer, with_response_renderer
+from server.core.routing import RouteMap, with_route_map
+
+from .response_transformer import NOT_FOUND_BODY, NOT_FOUND_HEADERS
+
+
+_log = logging.getLogger(__file__)
+
+
+_ADMIN_PATH_PREFIX: Final[str] = '/__'
+
+_SERVER_ERROR_HEADERS: Final[List[Tuple[bytes, bytes]]] = [(b'content-length', b'0')]
+
+
+class LeanApplication:
+    """
+    An ASGI application that serves the har entries without going through the FastAPI routing and
+    dependency injection. The incoming request is matched directly from the ASGI scope and the
+    pre-rendered response of the matching entry is handed directly to the ASGI send calls.
+
+    Lifespan events and requests to admin paths, such as /__metrics__, are delegated to the
+    FastAPI application.
+    """
+
+    def __init__(self, admin_app: ASGIApp):
+        self._admin_app = admin_app
+        self._components: Tuple[RouteMap, ResponseRenderer, MissLog] | None = None
+        self._lock = Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http' or self._is_admin_path(scope['path']):
+            return await self._admin_app(scope, receive, send)
+
+        components = self._components
+        if components is None:
+            # Resolved from a worker thread, like FastAPI resolves the synchronous dependencies, since
+            # creating the route map loads the har files.
+            components = await run_in_threadpool(self._resolve_components)
+        route_map, response_renderer, miss_log = components
+
+        try:
+            response = await route_map.find_entry_for_scope(scope, receive)
+            if response is None:
+                if miss_log.is_enabled():
+                    miss_log.record(scope['method'], scope['path'])
+                return await self._send(send, 404, NOT_FOUND_HEADERS, NOT_FOUND_BODY)
+
+            rendered = response.rendered
+            if rendered is None:
+                rendered = response_renderer.render(response)
+            body = response_renderer.get_body(response, rendered)
+            await self._send(send, rendered.status, rendered.raw_headers, body)
+        except Exception as e:
+            _log.error(f'Handling uncaught exception: [{e}]')
+            if resolve_dependency(with_config_loader).get_app_config().debug.log_stack_traces:
+                _log.exception(e)
+            await self._send(send, 500, _SERVER_ERROR_HEADERS, b'')
+
+    def _is_admin_path(self, path: str) -> bool:
+        return path.startswith(_ADMIN_PATH_PREFIX) and not path.startswith(ORIGIN_PATH_PREFIX)
+
+    async def _send(self, send: Send, status: int, raw_headers: List[Tuple[bytes, bytes]], body: bytes):
+        await send({'type': 'http.response.start', 'status': status, 'headers': raw_headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    def _resolve_components(self) -> Tuple[RouteMap, ResponseRenderer, MissLog]:
+        # Resolved from the same dependency graph FastAPI resolves so the admin endpoints share the
+        # same instances, such as the metric recorder.
+        with self._lock:
+            if self._components is None:
+                self._components = (
+                    resolve_dependency(with_route_map),
+                    resolve_dependency(with_response_renderer),
+                    resolve_dependency(with_miss_log)
+                )
+            return self._components
@@ -1,44 +1,72 @@
+from typing import Annotated, Final, List, Tuple
 from functools import lru_cache
-import base64
+import json
 
-from fastapi import Response
+from fastapi import Depends, Response
 
 from server.core.har import HarEntryResponse
+from server.core.rendering import ResponseRenderer, with_response_renderer
+
+
+NOT_FOUND_BODY: Final[bytes] = json.dumps({'detail': 'No har entry matching request found.'}).encode('utf-8')
+NOT_FOUND_HEADERS: Final[List[Tuple[bytes, bytes]]] = [
+    (b'content-length', str(len(NOT_FOUND_BODY)).encode('latin-1')),
+    (b'content-type', b'application/json')
+]
+
+
+class PreRenderedResponse(Response):
+    """
+    A response built from a previously rendered response. The raw headers are used as is rather
+    than being rebuilt from the header dict, media type, and cookies on every request.
+    """
+
+    def __init__(self, status_code: int, media_type: str, raw_headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.body = body
+        # Copied since the headers of the response can be modified after it has been created.
+        self.raw_headers = list(raw_headers)
 
 
 class ResponseTransformer:
 
+    def __init__(self, response_renderer: ResponseRenderer):
+        self._response_renderer = response_renderer
+
     def map_to_fastapi_response(self, response: HarEntryResponse) -> Response:
-        if response.content.encoding == 'base64':
-            return self._map_base64_response(response)
-        else:
-            return self._map_text_response(response)
-
-    def _map_base64_response(self, response: HarEntryResponse) -> Response:
-        if response.content.text != '':
-            content = base64.b64decode(response.content.text)
-        else:
-            content = ''
-
-        return Response(
-            content=content,
-            status_code=response.status,
-            media_type=response.content.mime_type
-        )
+        """
+        Maps the har response to the response sent back to the browser.
+
+        Responses that were rendered while the entries were loaded are sent as is. Any other response
+        is rendered on demand.
 
-    def _map_text_response(self, response: HarEntryResponse) -> Response:
-        headers = {header.name: header.value for header in response.headers}
-        api_response = Response(
-            content=response.content.text,
-            status_code=response.status,
-            media_type=response.content.mime_type,
-            headers=headers
+        :param response: The response from the matching har entry.
+        :return: The response to send back to the browser.
+        """
+        rendered = response.rendered
+        if rendered is None:
+            rendered = self._response_renderer.render(response)
+        return PreRenderedResponse(
+            rendered.status,
+            rendered.media_type,
+            rendered.raw_headers,
+            self._response_renderer.get_body(response, rendered)
         )
-        for cookie in response.cookies:
-            api_response.set_cookie(cookie.name, cookie.value)
-        return api_response
+
+    def create_not_found_response(self) -> Response:
+        """
+        Creates the response sent back to the browser when no har entry matches the request. The response is
+        built from a pre-built body and headers rather than by raising, and handling, an HTTPException.
+
+        :return: The 404 response to send back to the browser.
+        """
+        return PreRenderedResponse(404, 'application/json', NOT_FOUND_HEADERS, NOT_FOUND_BODY)
 
 
 @lru_cache()
-def with_response_transformer() -> ResponseTransformer:
-    return ResponseTransformer()
+def with_response_transformer(response_renderer: Annotated[ResponseRenderer, Depends(with_response_renderer)])\
+        -> ResponseTransformer:
+
+    return ResponseTransformer(response_renderer)
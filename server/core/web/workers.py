@@ -0,0 +1,17 @@
+from starlette.types import ASGIApp
+
+from server.core.config import set_root_path, get_worker_root_path
+from server.logging_conf import configure_logging
+
+from .app_factory import create_app
+
+
+def create_worker_app() -> ASGIApp:
+    """
+    The application factory used by uvicorn to create the application within each worker process.
+
+    :return: The application created after setting the root path from the environment shared by the parent process.
+    """
+    configure_logging()
+    set_root_path(get_worker_root_path())
+    return create_app()
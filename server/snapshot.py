@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import click
+
+from server.core.config import set_root_path
+from server.core.dependencies import resolve_dependency
+from server.core.routing import with_har_loader
+from server.core.storage import with_route_snapshot
+
+from server.logging_conf import configure_logging, logging
+
+
+_log = logging.getLogger(__file__)
+
+
+def build_snapshot():
+    """
+    Processes every .har file within the root folder and saves the result as a new route snapshot.
+    """
+    resolve_dependency(with_har_loader).build_snapshot()
+
+
+def ensure_snapshot():
+    """
+    Builds a new route snapshot only if there is no snapshot or the existing snapshot is out of date.
+    """
+    if resolve_dependency(with_route_snapshot).is_up_to_date():
+        _log.info('Existing route snapshot is up to date.')
+        return
+    build_snapshot()
+
+
+@click.command()
+@click.argument('har')
+def snapshot(har: str):
+
+    configure_logging()
+
+    har_folder = Path(har)
+    if not har_folder.is_dir():
+        return print('har argument must point to a directory.')
+    set_root_path(har_folder)
+
+    _log.info(f'Building route snapshot for: [{har_folder}].')
+    build_snapshot()
+
+
+if __name__ == '__main__':
+    snapshot()
@@ -2,8 +2,11 @@ import unittest
 
 from .config import *
 from .har import *
+from .metrics import *
+from .rendering import *
 from .routing import *
 from .rules import *
+from .storage import *
 from .web import *
 
 
@@ -1,3 +1,4 @@
 from .functions_test import FunctionsTests
 from .config_loader_test import ConfigLoaderTests
 from .config_parser_test import ConfigParserTests
+from .workers_test import WorkersTests
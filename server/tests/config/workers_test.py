@@ -0,0 +1,20 @@
+from pathlib import Path
+from unittest.mock import patch
+import os
+import unittest
+
+from server.core.config import prepare_worker_environment, is_worker_process, get_worker_root_path
+
+
+class WorkersTests(unittest.TestCase):
+
+    def test_prepare_worker_environment(self):
+        with patch.dict(os.environ, clear=True):
+            self.assertFalse(is_worker_process())
+            with self.assertRaises(RuntimeError):
+                get_worker_root_path()
+
+            prepare_worker_environment(Path('har'))
+
+            self.assertTrue(is_worker_process())
+            self.assertEqual(Path('har').absolute(), get_worker_root_path())
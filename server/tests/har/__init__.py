@@ -1 +1,4 @@
 from .har_parser_tests import HarParserTest
+from .har_stream_reader_test import HarStreamReaderTest
+from .models_test import ModelsTest
+from .origin_test import OriginTest
@@ -26,15 +26,15 @@ class HarParserTest(unittest.TestCase):
             set_root_path(test_har_path)
 
             parser = HarParser()
-            har_file_contents = list(parser.get_har_file_contents())
+            har_file_contents = [list(entries) for entries in parser.get_har_file_contents()]
 
             self.assertIsNotNone(har_file_contents)
             self.assertEqual(1, len(har_file_contents))
-            self.assertEqual(1, len(har_file_contents[0].log.entries))
+            self.assertEqual(1, len(har_file_contents[0]))
 
-            self._assert_request(har_file_contents[0].log.entries[0].request)
+            self._assert_request(har_file_contents[0][0].request)
 
-            self._assert_response(har_file_contents[0].log.entries[0].response)
+            self._assert_response(har_file_contents[0][0].response)
 
         finally:
             set_root_path(previous_path)
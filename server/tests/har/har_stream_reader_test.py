@@ -0,0 +1,58 @@
+import io
+import json
+import unittest
+
+from server.core.har.har_stream_reader import HarStreamReader
+
+
+def _create_entry(index: int):
+    return {
+        'request': {'method': 'GET', 'url': f'http://www.test.com/{index}', 'queryString': [], 'headers': [], 'cookies': []},
+        'response': {'status': 200, 'headers': [], 'cookies': [], 'content': {'text': 'response ' * index}}
+    }
+
+
+class HarStreamReaderTest(unittest.TestCase):
+
+    def test_read_entries(self):
+        har = {
+            'log': {
+                'version': 1.2,
+                'creator': {'name': 'test', 'version': '1'},
+                'pages': [{'id': 'page_1', 'title': 'page'}],
+                'entries': [_create_entry(index) for index in range(5)],
+                'comment': 'trailing property'
+            }
+        }
+        content = json.dumps(har, indent=2)
+
+        # Use a range of small chunk sizes so values are split across read boundaries.
+        for chunk_size in [1, 7, 64, 1024]:
+            with self.subTest(chunk_size=chunk_size):
+                reader = HarStreamReader(io.StringIO(content), chunk_size)
+
+                actual = list(reader.read_entries())
+
+                self.assertEqual(har['log']['entries'], actual)
+
+    def test_read_entries_with_no_entries(self):
+        reader = HarStreamReader(io.StringIO('{"log": {"entries": []}}'))
+
+        actual = list(reader.read_entries())
+
+        self.assertEqual([], actual)
+
+    def test_read_entries_raises_exception_when_entries_are_missing(self):
+        test_cases = [
+            '{}',
+            '{"log": {"version": "1.2"}}',
+            '{"log": {"entries": [',
+            '[]'
+        ]
+
+        for test_case in test_cases:
+            with self.subTest(content=test_case):
+                reader = HarStreamReader(io.StringIO(test_case))
+
+                with self.assertRaises(ValueError):
+                    list(reader.read_entries())
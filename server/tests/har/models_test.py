@@ -0,0 +1,55 @@
+import unittest
+
+from server.core.har.models import (
+    HarEntry,
+    HarEntryRequest,
+    HarEntryResponse,
+    ResponseContent,
+    NameValuePair,
+    FrozenModelError
+)
+
+
+def _create_entry() -> HarEntry:
+    return HarEntry(
+        request=HarEntryRequest(method='GET', url='http://localhost/path', queryString=[], headers=[], cookies=[]),
+        response=HarEntryResponse(
+            status=200,
+            headers=[NameValuePair(name='name', value='value')],
+            cookies=[],
+            content=ResponseContent(text='body')
+        )
+    )
+
+
+class ModelsTest(unittest.TestCase):
+
+    def test_freeze_prevents_modification_of_nested_models(self):
+        entry = _create_entry()
+        entry.freeze()
+
+        test_cases = [
+            ('entry', lambda: setattr(entry, 'id', 'other')),
+            ('response', lambda: setattr(entry.response, 'status', 404)),
+            ('content', lambda: setattr(entry.response.content, 'text', 'other')),
+            ('header', lambda: setattr(entry.response.headers[0], 'value', 'other'))
+        ]
+
+        for name, modify in test_cases:
+            with self.subTest(model=name):
+                with self.assertRaises(FrozenModelError):
+                    modify()
+
+    def test_mutable_copy(self):
+        entry = _create_entry()
+        entry.freeze()
+
+        actual = entry.mutable_copy()
+        actual.response.content.text = 'other'
+        actual.response.headers[0].value = 'other'
+
+        self.assertFalse(actual.is_frozen())
+        self.assertFalse(actual.response.is_frozen())
+        self.assertTrue(entry.is_frozen())
+        self.assertEqual('body', entry.response.content.text)
+        self.assertEqual('value', entry.response.headers[0].value)
@@ -0,0 +1,43 @@
+import unittest
+
+from server.core.har import get_origin_of_url, get_origin_of_host, split_origin_path
+
+
+class OriginTest(unittest.TestCase):
+
+    def test_get_origin_of_url(self):
+        test_cases = [
+            ('https://www.Example.com/index.html', 'www.example.com'),
+            ('http://www.example.com:8080', 'www.example.com'),
+            ('//www.example.com/index.html', 'www.example.com'),
+            ('/index.html', '')
+        ]
+
+        for url, expected in test_cases:
+            with self.subTest(url=url):
+                self.assertEqual(expected, get_origin_of_url(url))
+
+    def test_get_origin_of_host(self):
+        test_cases = [
+            ('www.example.com', 'www.example.com'),
+            ('www.example.com:8443', 'www.example.com'),
+            ('localhost:8080', ''),
+            ('127.0.0.1', ''),
+            ('[::1]:8080', ''),
+            (None, '')
+        ]
+
+        for host, expected in test_cases:
+            with self.subTest(host=host):
+                self.assertEqual(expected, get_origin_of_host(host))
+
+    def test_split_origin_path(self):
+        test_cases = [
+            ('/__origin__/www.example.com/js/app.js', ('www.example.com', '/js/app.js')),
+            ('/__origin__/www.example.com', ('www.example.com', '/')),
+            ('/js/app.js', ('', '/js/app.js'))
+        ]
+
+        for path, expected in test_cases:
+            with self.subTest(path=path):
+                self.assertEqual(expected, split_origin_path(path))
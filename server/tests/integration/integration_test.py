@@ -2,7 +2,7 @@ import unittest
 
 from fastapi.testclient import TestClient
 
-from server.core.web import app
+from server.core.web import app, create_app
 from server.logging_conf import configure_logging
 
 from .test_data import TestData
@@ -76,18 +76,87 @@ class IntegrationTests(unittest.TestCase):
                 self.assertTrue('second-response-cookie-name' in response.cookies)
                 self.assertEqual('second-response-cookie-value', response.cookies['second-response-cookie-name'])
 
+    def test_rewrite_response_lazily(self):
+        with TestData(TestData.DataSets.LAZY_REWRITE_RESPONSE):
+            with TestClient(app) as client:
+                for _ in range(2):
+                    response = client.get('/rewrite/endpoint')
+                    self.assertEqual(200, response.status_code)
+                    self.assertEqual('Test Rewrite Response', response.content.decode('utf-8'))
+
+                    self.assertFalse('response-header-name' in response.headers)
+                    self.assertTrue('second-response-header-name' in response.headers)
+
+                    self.assertFalse('response-cookie-name' in response.cookies)
+                    self.assertTrue('second-response-cookie-name' in response.cookies)
+
     def test_metrics(self):
         with TestData(TestData.DataSets.METRICS):
             with TestClient(app) as client:
-                response = client.get('/matching/endpoint')
-                self.assertEqual(200, response.status_code)
+                for _ in range(2):
+                    response = client.get('/matching/endpoint')
+                    self.assertEqual(200, response.status_code)
+
+                    response = client.get('/missing/endpoint')
+                    self.assertEqual(404, response.status_code)
+                    self.assertEqual({'detail': 'No har entry matching request found.'}, response.json())
 
                 metric_response = client.get('/__metrics__')
                 self.assertEqual(200, metric_response.status_code)
 
-                body = metric_response.json()
-                self.assertEqual(1, len(body))
-                self.assertEqual('test-entry-1', body[0]['entry_id'])
-                self.assertEqual(1, len(body[0]['requests']))
-                self.assertIsNotNone(body[0].get('response'))
+                entries = metric_response.json()
+                self.assertEqual(1, len(entries))
+                self.assertEqual('test-entry-1', entries[0]['entry_id'])
+                self.assertEqual(2, len(entries[0]['requests']))
+                self.assertIsNotNone(entries[0].get('response'))
+
+                stats_response = client.get('/__stats__')
+                self.assertEqual(200, stats_response.status_code)
+
+                stats = stats_response.json()
+                self.assertEqual(0, stats['body_deduplication']['duplicate_bodies'])
+                self.assertEqual({'hits': 1, 'misses': 2, 'known_misses': 1}, stats['resolution_cache'])
+
+                miss_response = client.get('/__misses__')
+                self.assertEqual(200, miss_response.status_code)
+                self.assertEqual({
+                    'total': 2,
+                    'misses': [{'method': 'GET', 'path': '/missing/endpoint', 'count': 2}]
+                }, miss_response.json())
+
+    def test_parallel_ingestion(self):
+        with TestData(TestData.DataSets.PARALLEL_INGESTION):
+            with TestClient(app) as client:
+                response = client.get('/parallel/endpoint')
+                self.assertEqual(200, response.status_code)
+                self.assertEqual('First Response', response.content.decode('utf-8'))
+
+                response = client.get('/parallel/other')
+                self.assertEqual(200, response.status_code)
+                self.assertEqual('Other Response', response.content.decode('utf-8'))
+
+    def test_lean_asgi(self):
+        with TestData(TestData.DataSets.LEAN_ASGI):
+            with TestClient(create_app()) as client:
+                client.cookies = {'request-cookie-name': 'request-cookie-value'}
+                response = client.post(
+                    '/matching/endpoint',
+                    headers={'request-header-name': 'request-header-value'},
+                    params={'query-param-name': 'query-param-value'},
+                    json={
+                        'name': 'test_name',
+                        'password': 'test_password'
+                    }
+                )
+                self.assertEqual(200, response.status_code)
+                self.assertEqual('Test Matching Response', response.content.decode('utf-8'))
+                self.assertEqual('response-header-value', response.headers['response-header-name'])
+                self.assertEqual('response-cookie-value', response.cookies['response-cookie-name'])
+
+                response = client.get('/matching/endpoint')
+                self.assertEqual(404, response.status_code)
+                self.assertEqual('No har entry matching request found.', response.json()['detail'])
 
+                metric_response = client.get('/__metrics__')
+                self.assertEqual(200, metric_response.status_code)
+                self.assertEqual(1, len(metric_response.json()))
@@ -8,6 +8,7 @@ from server.core.rules.exclusions import with_exclusion_filter
 from server.core.rules.matching import with_request_matcher
 from server.core.rules.rewrite.response import with_response_rewriter
 from server.core.rules.rewrite.request import with_request_rewriter
+from server.core.storage import with_body_store
 
 
 _CACHES: List[Any] = [
@@ -16,6 +17,7 @@ _CACHES: List[Any] = [
     with_request_matcher,
     with_response_rewriter,
     with_request_rewriter,
+    with_body_store,
 ]
 
 
@@ -26,6 +28,9 @@ class TestData:
         FORM_REQUEST_MATCHING = 'form_request_matching'
         REWRITE_RESPONSE = 'rewrite_response'
         METRICS = 'metrics'
+        PARALLEL_INGESTION = 'parallel_ingestion'
+        LEAN_ASGI = 'lean_asgi'
+        LAZY_REWRITE_RESPONSE = 'lazy_rewrite_response'
 
     def __init__(self, folder_name: str):
         self._test_data_path = Path(__file__).absolute().parent.joinpath('test_data').joinpath(folder_name)
@@ -0,0 +1 @@
+from .miss_log_test import MissLogTest as MissLogTest
@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import Mock
+
+from server.core.metrics.miss_log import MissLog
+
+
+def _create_config_loader(miss_log_size: int) -> Mock:
+    debug_config = Mock(enable_miss_log=True, miss_log_size=miss_log_size)
+    return Mock(get_app_config=Mock(return_value=Mock(debug=debug_config)))
+
+
+class MissLogTest(unittest.TestCase):
+
+    def test_get_misses_orders_by_count(self):
+        miss_log = MissLog(_create_config_loader(2))
+
+        miss_log.record('GET', '/one')
+        miss_log.record('GET', '/two')
+        miss_log.record('GET', '/two')
+        miss_log.record('POST', '/two')
+        miss_log.record('GET', '/three')
+        miss_log.record('GET', '/three')
+        miss_log.record('GET', '/three')
+
+        actual = miss_log.get_misses()
+
+        self.assertEqual({
+            'total': 7,
+            'misses': [
+                {'method': 'GET', 'path': '/three', 'count': 3},
+                {'method': 'GET', 'path': '/two', 'count': 2}
+            ]
+        }, actual)
+
+    def test_record_replaces_least_missed_path_when_full(self):
+        # A report size of one tracks up to ten paths.
+        miss_log = MissLog(_create_config_loader(1))
+
+        for _ in range(2):
+            miss_log.record('GET', '/one')
+        for index in range(9):
+            miss_log.record('GET', f'/filler-{index}')
+        miss_log.record('GET', '/two')
+        miss_log.record('GET', '/two')
+
+        self.assertEqual({
+            'total': 13,
+            'misses': [{'method': 'GET', 'path': '/two', 'count': 3}]
+        }, miss_log.get_misses())
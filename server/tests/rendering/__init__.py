@@ -0,0 +1 @@
+from .response_renderer_test import ResponseRendererTest
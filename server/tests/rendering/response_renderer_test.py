@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import Mock
+
+from fastapi import Response
+
+from server.core.har import NameValuePair
+from server.core.har.models import BodyHandle, HarEntryResponse, ResponseContent
+from server.core.rendering import ResponseRenderer
+
+
+class ResponseRendererTest(unittest.TestCase):
+
+    def test_render_text_response(self):
+        response = HarEntryResponse(
+            status=200,
+            headers=[NameValuePair(name='Header-Name', value='header-value')],
+            cookies=[NameValuePair(name='cookie-name', value='cookie-value')],
+            content=ResponseContent(mimeType='text/plain', text='response_content')
+        )
+
+        actual = ResponseRenderer(Mock()).render(response)
+
+        expected = Response(
+            content=b'response_content',
+            status_code=200,
+            media_type='text/plain',
+            headers={'header-name': 'header-value'}
+        )
+        expected.set_cookie('cookie-name', 'cookie-value')
+
+        self.assertEqual(200, actual.status)
+        self.assertEqual(b'response_content', actual.body)
+        self.assertCountEqual(expected.raw_headers, actual.raw_headers)
+
+    def test_render_base64_response_omits_recorded_headers(self):
+        response = HarEntryResponse(
+            status=200,
+            headers=[NameValuePair(name='header-name', value='header-value')],
+            cookies=[NameValuePair(name='cookie-name', value='cookie-value')],
+            content=ResponseContent(mimeType='image/png', encoding='base64', text='cmVzcG9uc2VfY29udGVudA==')
+        )
+
+        actual = ResponseRenderer(Mock()).render(response)
+
+        self.assertEqual(b'response_content', actual.body)
+        self.assertCountEqual([(b'content-length', b'16'), (b'content-type', b'image/png')], actual.raw_headers)
+
+    def test_render_stored_body_does_not_read_body_store(self):
+        body_handle = BodyHandle(offset=10, length=16)
+        response = HarEntryResponse(
+            status=200,
+            headers=[],
+            cookies=[],
+            content=ResponseContent(mimeType='image/png', encoding='base64'),
+            body_handle=body_handle
+        )
+        body_store = Mock(read=Mock(return_value=b'response_content'))
+        sut = ResponseRenderer(body_store)
+
+        actual = sut.render(response)
+
+        body_store.read.assert_not_called()
+        self.assertEqual(b'', actual.body)
+        self.assertIn((b'content-length', b'16'), actual.raw_headers)
+        self.assertEqual(b'response_content', sut.get_body(response, actual))
+        body_store.read.assert_called_once_with(body_handle)
+
+    def test_render_no_content_response_has_no_content_length(self):
+        response = HarEntryResponse(status=204, headers=[], cookies=[], content=ResponseContent())
+
+        actual = ResponseRenderer(Mock()).render(response)
+
+        self.assertNotIn(b'content-length', [name for name, _ in actual.raw_headers])
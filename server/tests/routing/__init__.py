@@ -1,3 +1,6 @@
 from .request_mapper_test import RequestMapperTest as RequestMapperTest
 from .route_map_test import RouteMapTest as RouteMapTest
 from .pre_processor_test import PreProcessTest as PreProcessTest
+from .har_loader_test import HarLoaderTest as HarLoaderTest
+from .resolution_cache_test import ResolutionCacheTest as ResolutionCacheTest
+from .lazy_response_rewriter_test import LazyResponseRewriterTest as LazyResponseRewriterTest
@@ -0,0 +1,111 @@
+import unittest
+from unittest.mock import patch, Mock, MagicMock, call
+
+from server.core.config import ConfigLoader, AppConfig
+from server.core.config.models import Ingestion
+from server.core.har import HarParser
+from server.core.routing import HarLoader, PreProcessor
+from server.core.routing import har_loader
+from server.core.storage import RouteSnapshot
+
+from server.tests.util import fully_qualified_name
+
+
+class HarLoaderTest(unittest.TestCase):
+
+    @patch(fully_qualified_name(RouteSnapshot))
+    @patch(fully_qualified_name(PreProcessor))
+    @patch(fully_qualified_name(HarParser))
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_load_serially(self,
+                           mock_config_loader: ConfigLoader,
+                           mock_har_parser: HarParser,
+                           mock_pre_processor: PreProcessor,
+                           mock_route_snapshot: RouteSnapshot):
+
+        mock_config_loader.get_app_config = Mock(return_value=AppConfig())
+        mock_route_snapshot.load = Mock(return_value=False)
+
+        first_file = Mock()
+        second_file = Mock()
+        mock_har_parser.get_har_file_contents = Mock(return_value=iter([first_file, second_file]))
+        mock_pre_processor.process_content = Mock()
+
+        HarLoader(mock_config_loader, mock_har_parser, mock_pre_processor, mock_route_snapshot).load()
+
+        mock_pre_processor.process_content.assert_has_calls([call(first_file), call(second_file)])
+        mock_route_snapshot.load.assert_called_once()
+
+    @patch(fully_qualified_name(RouteSnapshot))
+    @patch(fully_qualified_name(PreProcessor))
+    @patch(fully_qualified_name(HarParser))
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_load_in_parallel_accumulates_in_file_order(self,
+                                                         mock_config_loader: ConfigLoader,
+                                                         mock_har_parser: HarParser,
+                                                         mock_pre_processor: PreProcessor,
+                                                         mock_route_snapshot: RouteSnapshot):
+
+        mock_config_loader.get_app_config = Mock(return_value=AppConfig(ingestion=Ingestion(processes=2)))
+        mock_route_snapshot.load = Mock(return_value=False)
+
+        paths = [Mock(), Mock()]
+        mock_har_parser.get_har_file_paths = Mock(return_value=iter(paths))
+        mock_pre_processor.accumulate_processed_content = Mock()
+
+        first_entries = [Mock()]
+        second_entries = [Mock()]
+        mock_executor = MagicMock()
+        mock_executor.__enter__.return_value.map = Mock(return_value=iter([first_entries, second_entries]))
+
+        with patch.object(har_loader, 'ProcessPoolExecutor', Mock(return_value=mock_executor)) as mock_executor_type:
+            HarLoader(mock_config_loader, mock_har_parser, mock_pre_processor, mock_route_snapshot).load()
+
+        self.assertEqual(2, mock_executor_type.call_args.kwargs['max_workers'])
+        self.assertEqual('spawn', mock_executor_type.call_args.kwargs['mp_context'].get_start_method())
+        mock_executor.__enter__.return_value.map.assert_called_once_with(har_loader._process_har_file_in_worker, paths)
+        mock_pre_processor.accumulate_processed_content.assert_has_calls([call(first_entries), call(second_entries)])
+        mock_har_parser.get_har_file_contents.assert_not_called()
+
+    @patch(fully_qualified_name(RouteSnapshot))
+    @patch(fully_qualified_name(PreProcessor))
+    @patch(fully_qualified_name(HarParser))
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_load_uses_snapshot(self,
+                                mock_config_loader: ConfigLoader,
+                                mock_har_parser: HarParser,
+                                mock_pre_processor: PreProcessor,
+                                mock_route_snapshot: RouteSnapshot):
+
+        mock_config_loader.get_app_config = Mock(return_value=AppConfig())
+        mock_route_snapshot.load = Mock(return_value=True)
+        mock_har_parser.get_har_file_contents = Mock()
+
+        HarLoader(mock_config_loader, mock_har_parser, mock_pre_processor, mock_route_snapshot).load()
+
+        mock_route_snapshot.load.assert_called_once()
+        mock_har_parser.get_har_file_contents.assert_not_called()
+
+    @patch(fully_qualified_name(RouteSnapshot))
+    @patch(fully_qualified_name(PreProcessor))
+    @patch(fully_qualified_name(HarParser))
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_build_snapshot(self,
+                            mock_config_loader: ConfigLoader,
+                            mock_har_parser: HarParser,
+                            mock_pre_processor: PreProcessor,
+                            mock_route_snapshot: RouteSnapshot):
+
+        mock_config_loader.get_app_config = Mock(return_value=AppConfig())
+        mock_route_snapshot.load = Mock()
+        mock_route_snapshot.save = Mock()
+
+        har_file = Mock()
+        mock_har_parser.get_har_file_contents = Mock(return_value=iter([har_file]))
+        mock_pre_processor.process_content = Mock()
+
+        HarLoader(mock_config_loader, mock_har_parser, mock_pre_processor, mock_route_snapshot).build_snapshot()
+
+        mock_pre_processor.process_content.assert_called_once_with(har_file)
+        mock_route_snapshot.save.assert_called_once()
+        mock_route_snapshot.load.assert_not_called()
@@ -0,0 +1,58 @@
+import asyncio
+import unittest
+from unittest.mock import Mock
+
+from server.core.config import AppConfig
+from server.core.har import HarEntry, HarEntryRequest, HarEntryResponse, ResponseContent
+from server.core.rendering import ResponseRenderer
+from server.core.routing.lazy_response_rewriter import LazyResponseRewriter
+from server.core.storage import BodyStore
+
+
+def _create_entry(body_store: BodyStore) -> HarEntry:
+    response = HarEntryResponse(
+        status=200,
+        headers=[],
+        cookies=[],
+        content=ResponseContent(size=8, mimeType='text/plain', text='')
+    )
+    response.body_handle = body_store.write(b'original')
+    entry = HarEntry(
+        request=HarEntryRequest(method='GET', url='http://localhost/app.js', headers=[], queryString=[], cookies=[]),
+        response=response
+    )
+    entry.freeze()
+    return entry
+
+
+def _rewrite(response: HarEntryResponse) -> HarEntryResponse:
+    response.content.text = response.content.text.upper()
+    return response
+
+
+class LazyResponseRewriterTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_get_response_rewrites_once(self):
+        test_cases = [False, True]
+
+        for memoize_to_disk in test_cases:
+            with self.subTest(memoize_to_disk=memoize_to_disk):
+                stub_config = AppConfig()
+                stub_config.rewrite.response.lazy_memoize_to_disk = memoize_to_disk
+                config_loader = Mock(get_app_config=Mock(return_value=stub_config))
+                response_rewriter = Mock(is_lazy=Mock(return_value=True), apply_response_rewrite_rules=Mock(side_effect=_rewrite))
+                body_store = BodyStore()
+                response_renderer = ResponseRenderer(body_store)
+                entry = _create_entry(body_store)
+
+                sut = LazyResponseRewriter(config_loader, response_rewriter, response_renderer, body_store)
+                first, second = await asyncio.gather(sut.get_response(entry), sut.get_response(entry))
+                third = await sut.get_response(entry)
+
+                self.assertIs(first, second)
+                self.assertIs(first, third)
+                self.assertTrue(first.is_frozen())
+                self.assertEqual(b'ORIGINAL', response_renderer.get_body(first, first.rendered))
+                self.assertEqual(memoize_to_disk, first.body_handle is not None)
+                self.assertEqual(b'original', body_store.read(entry.response.body_handle))
+                response_rewriter.apply_response_rewrite_rules.assert_called_once()
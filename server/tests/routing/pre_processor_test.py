@@ -6,12 +6,15 @@ from server.core.rules.rewrite.request import RequestRewriter
 from server.core.rules.matching import RequestMatcher
 from server.core.routing import PreProcessor
 from server.core.rules.rewrite.response.response_rewriter import ResponseRewriter
+from server.core.storage import BodyStore
+from server.core.metrics import MetricRecorder
 
 from ..util import fully_qualified_name
 
 
 class PreProcessTest(unittest.TestCase):
 
+    @patch(fully_qualified_name(BodyStore))
     @patch(fully_qualified_name(ResponseRewriter))
     @patch(fully_qualified_name(RequestMatcher))
     @patch(fully_qualified_name(RequestRewriter))
@@ -20,7 +23,8 @@ class PreProcessTest(unittest.TestCase):
                              mock_exclusion_filter: ExclusionFilter,
                              mock_request_rewriter: RequestRewriter,
                              mock_request_matcher: RequestMatcher,
-                             mock_response_rewriter: ResponseRewriter):
+                             mock_response_rewriter: ResponseRewriter,
+                             mock_body_store: BodyStore):
         
         # Stub values.
         to_rewrite_request = Mock()
@@ -41,26 +45,30 @@ class PreProcessTest(unittest.TestCase):
                 response = to_rewrite_response
             )
         ]
-        har_content = MagicMock(log = MagicMock(entries = entries))
 
         modified_request = Mock()
-        modified_response = Mock()
+        modified_response = Mock(content=Mock(encoding='', text='response'))
+        body_handle = Mock()
 
         # Mock return values.
         mock_exclusion_filter.should_exclude_entry = Mock(side_effect=[True, False, False])
         mock_request_rewriter.apply_entry_request_rewrite_rules = Mock(return_value=modified_request)
+        mock_response_rewriter.is_lazy = Mock(return_value=False)
         mock_response_rewriter.apply_response_rewrite_rules = Mock(return_value=modified_response)
         mock_request_matcher.accumulate = Mock(side_effect=[False, True])
+        mock_body_store.write = Mock(return_value=body_handle)
 
         # Execute.
         sut = PreProcessor(
             mock_exclusion_filter,
             mock_request_rewriter,
             mock_request_matcher,
-            mock_response_rewriter
+            mock_response_rewriter,
+            mock_body_store,
+            None
         )
 
-        sut.process_content(har_content)
+        actual = sut.process_content(iter(entries))
 
         # Assert expectations.
         mock_exclusion_filter.should_exclude_entry.assert_has_calls(
@@ -79,3 +87,60 @@ class PreProcessTest(unittest.TestCase):
         )
 
         mock_response_rewriter.apply_response_rewrite_rules.assert_called_once_with(to_rewrite_response)
+
+        mock_body_store.write.assert_called_once_with(b'response')
+        self.assertEqual([entries[2]], actual)
+        self.assertEqual(body_handle, actual[0].response.body_handle)
+        self.assertEqual('', actual[0].response.content.text)
+
+
+    @patch(fully_qualified_name(MetricRecorder))
+    @patch(fully_qualified_name(BodyStore))
+    @patch(fully_qualified_name(ResponseRewriter))
+    @patch(fully_qualified_name(RequestMatcher))
+    @patch(fully_qualified_name(RequestRewriter))
+    @patch(fully_qualified_name(ExclusionFilter))
+    def test_process_entries_deduplicates_bodies(self,
+                                                 mock_exclusion_filter: ExclusionFilter,
+                                                 mock_request_rewriter: RequestRewriter,
+                                                 mock_request_matcher: RequestMatcher,
+                                                 mock_response_rewriter: ResponseRewriter,
+                                                 mock_body_store: BodyStore,
+                                                 mock_metric_recorder: MetricRecorder):
+
+        # Stub values.
+        entries = [
+            MagicMock(request=Mock(), response=Mock()),
+            MagicMock(request=Mock(), response=Mock())
+        ]
+        body_handle = Mock()
+
+        # Mock return values.
+        mock_exclusion_filter.should_exclude_entry = Mock(return_value=False)
+        mock_request_rewriter.apply_entry_request_rewrite_rules = Mock(side_effect=lambda request: request)
+        mock_response_rewriter.is_lazy = Mock(return_value=False)
+        mock_response_rewriter.apply_response_rewrite_rules = Mock(
+            side_effect=lambda response: Mock(content=Mock(encoding='', text='duplicate'))
+        )
+        mock_request_matcher.accumulate = Mock(return_value=True)
+        mock_body_store.write = Mock(return_value=body_handle)
+        mock_metric_recorder.record_duplicate_body = Mock()
+
+        # Execute.
+        sut = PreProcessor(
+            mock_exclusion_filter,
+            mock_request_rewriter,
+            mock_request_matcher,
+            mock_response_rewriter,
+            mock_body_store,
+            mock_metric_recorder
+        )
+
+        actual = sut.process_content(iter(entries))
+
+        # Assert expectations.
+        mock_body_store.write.assert_called_once_with(b'duplicate')
+        mock_metric_recorder.record_duplicate_body.assert_called_once_with(len(b'duplicate'))
+        self.assertEqual(2, len(actual))
+        self.assertEqual(body_handle, actual[0].response.body_handle)
+        self.assertEqual(body_handle, actual[1].response.body_handle)
@@ -1,7 +1,26 @@
 import unittest
 from unittest.mock import AsyncMock
 
+from fastapi import Request
+
 from server.core.routing import RequestMapper
+from server.core.rules.rewrite.request import MultipartPart, digest_bytes, digest_multipart
+
+
+def _create_scope(path: str = '/endpoint', host: bytes = b'www.test.com'):
+    return {
+        'type': 'http',
+        'method': 'POST',
+        'scheme': 'http',
+        'server': ('www.test.com', 80),
+        'path': path,
+        'query_string': b'query_param_name=query_param_value&other=1',
+        'headers': [
+            (b'host', host),
+            (b'content-type', b'application/json'),
+            (b'cookie', b'cookie_name=cookie_value; other=2')
+        ]
+    }
 
 
 class RequestMapperTest(unittest.IsolatedAsyncioTestCase):
@@ -71,3 +90,118 @@ class RequestMapperTest(unittest.IsolatedAsyncioTestCase):
         self.assertEqual('name', actual.post_data.params[0].name)
         self.assertEqual('Jason', actual.post_data.params[0].value)
         self.assertEqual('application/x-www-form-urlencoded', actual.post_data.mime_type)
+
+    async def test_map_scope_to_har_request_matches_map_to_har_request(self):
+        body = b'{"name":"Jason"}'
+        scope = _create_scope()
+
+        async def receive():
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        expected = await RequestMapper().map_to_har_request(Request(scope, receive))
+        actual = RequestMapper().map_scope_to_har_request(scope, body)
+
+        self.assertEqual(expected.model_dump(), actual.model_dump())
+        self.assertEqual('/endpoint', actual.path)
+        self.assertEqual(2, len(actual.cookies))
+        self.assertEqual({'name': 'Jason'}, actual.post_data.parsed_json)
+
+    def test_map_scope_to_key_request_matches_full_request(self):
+        body = b'{"name":"Jason"}'
+        components = ['method', 'path', 'query-params', 'headers', 'cookies', 'body']
+        paths = ['/endpoint', '/with%25percent', '/with;params', '//double', '/__origin__/cdn.test.com/app.js']
+
+        for path in paths:
+            with self.subTest(path=path):
+                scope = _create_scope(path)
+
+                expected = RequestMapper().map_scope_to_har_request(scope, body)
+                actual = RequestMapper().map_scope_to_key_request(scope, body, components)
+
+                self.assertEqual(expected.method, actual.method)
+                self.assertEqual(expected.path, actual.path)
+                self.assertEqual(expected.origin, actual.origin)
+                self.assertEqual(expected.query_params, actual.query_params)
+                self.assertEqual(expected.headers, actual.headers)
+                self.assertEqual(expected.cookies, actual.cookies)
+                self.assertEqual(expected.post_data.parsed_json, actual.post_data.parsed_json)
+
+    def test_map_scope_to_key_request_skips_disabled_components(self):
+        actual = RequestMapper().map_scope_to_key_request(_create_scope(), b'{"name":"Jason"}', ['method', 'path'])
+
+        self.assertEqual('post', actual.method)
+        self.assertEqual('/endpoint', actual.path)
+        self.assertEqual([], actual.query_params)
+        self.assertEqual([], actual.headers)
+        self.assertEqual([], actual.cookies)
+        self.assertEqual({}, actual.post_data.parsed_json)
+
+    def test_map_scope_to_key_request_resolves_origin(self):
+        test_cases = [
+            ('/__origin__/CDN.test.com/app.js', b'localhost:8080', 'cdn.test.com', '/app.js'),
+            ('/__origin__/cdn.test.com', b'localhost:8080', 'cdn.test.com', '/'),
+            ('/app.js', b'www.test.com', 'www.test.com', '/app.js'),
+            ('/app.js', b'localhost:8080', '', '/app.js'),
+            ('/app.js', b'127.0.0.1:8080', '', '/app.js')
+        ]
+
+        for path, host, expected_origin, expected_path in test_cases:
+            with self.subTest(path=path, host=host):
+                actual = RequestMapper().map_scope_to_key_request(_create_scope(path, host), b'', ['origin', 'method', 'path'])
+
+                self.assertEqual(expected_origin, actual.origin)
+                self.assertEqual(expected_path, actual.path)
+
+    async def test_read_key_body_digests_unparsed_bodies_as_received(self):
+        async def chunks():
+            for chunk in [b'\x00\x01', b'\x02']:
+                yield chunk
+
+        test_cases = [
+            (b'application/octet-stream', (b'', digest_bytes(b'\x00\x01\x02'))),
+            (b'text/plain', (b'', digest_bytes(b'\x00\x01\x02'))),
+            (b'application/json', (b'\x00\x01\x02', '')),
+            (b'multipart/form-data; boundary=b', (b'\x00\x01\x02', ''))
+        ]
+
+        for content_type, expected in test_cases:
+            with self.subTest(content_type=content_type):
+                scope = _create_scope()
+                scope['headers'] = [(b'content-type', content_type)]
+
+                actual = await RequestMapper().read_key_body(scope, chunks())
+
+                self.assertEqual(expected, actual)
+
+    def test_map_scope_to_har_request_parses_body_regardless_of_content_type_case(self):
+        test_cases = [
+            (b'Application/JSON; charset=UTF-8', b'{"name":"Jason"}', 'application/json'),
+            (b'APPLICATION/X-WWW-FORM-URLENCODED', b'name=Jason', 'application/x-www-form-urlencoded')
+        ]
+
+        for content_type, body, expected_mime_type in test_cases:
+            with self.subTest(content_type=content_type):
+                scope = _create_scope()
+                scope['headers'] = [(b'content-type', content_type)]
+
+                actual = RequestMapper().map_scope_to_har_request(scope, body)
+
+                self.assertEqual(expected_mime_type, actual.post_data.mime_type)
+                self.assertEqual('', actual.post_data.body_digest)
+
+    def test_map_scope_to_key_request_digests_other_body_types(self):
+        multipart_body = b'--b\r\nContent-Disposition: form-data; name="a"\r\n\r\n1\r\n--b--\r\n'
+        test_cases = [
+            (b'text/plain', b'query { items }', digest_bytes(b'query { items }')),
+            (b'multipart/form-data; boundary=b', multipart_body, digest_multipart([MultipartPart('a', b'1')]))
+        ]
+
+        for content_type, body, expected in test_cases:
+            with self.subTest(content_type=content_type):
+                scope = _create_scope()
+                scope['headers'] = [(b'content-type', content_type)]
+
+                actual = RequestMapper().map_scope_to_key_request(scope, body, ['method', 'path', 'body'])
+
+                self.assertEqual(expected, actual.post_data.body_digest)
+                self.assertEqual(expected, RequestMapper().map_scope_to_har_request(scope, body).post_data.body_digest)
@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import Mock
+
+from server.core.routing.resolution_cache import ResolutionCache
+
+
+def _create_scope(path: str = '/app.js', query_string: bytes = b'', headers=None):
+    return {'method': 'GET', 'path': path, 'query_string': query_string, 'headers': headers or []}
+
+
+class ResolutionCacheTest(unittest.TestCase):
+
+    def test_fingerprint_only_includes_enabled_components(self):
+        first = _create_scope(query_string=b't=1', headers=[(b'cookie', b'a=1'), (b'user-agent', b'one')])
+        second = _create_scope(query_string=b't=2', headers=[(b'cookie', b'a=2'), (b'user-agent', b'two')])
+
+        test_cases = [
+            (['method', 'path'], True),
+            (['method', 'path', 'query-params'], False),
+            (['method', 'path', 'cookies'], False),
+            (['method', 'path', 'headers'], False)
+        ]
+
+        for components, should_equal in test_cases:
+            with self.subTest(components=components):
+                cache = ResolutionCache(4, 0, components)
+
+                actual = cache.fingerprint(first, b'') == cache.fingerprint(second, b'')
+
+                self.assertEqual(should_equal, actual)
+
+    def test_fingerprint_includes_body_digest(self):
+        cache = ResolutionCache(4, 0, ['method', 'path', 'body'])
+        scope = _create_scope(headers=[(b'content-type', b'application/json')])
+
+        self.assertEqual(cache.fingerprint(scope, b'{"a":1}'), cache.fingerprint(scope, b'{"a":1}'))
+        self.assertNotEqual(cache.fingerprint(scope, b'{"a":1}'), cache.fingerprint(scope, b'{"a":2}'))
+
+    def test_put_evicts_least_recently_used_entry(self):
+        cache = ResolutionCache(2, 0, ['method', 'path'])
+        entries = [Mock(), Mock(), Mock()]
+
+        cache.put('first', entries[0])
+        cache.put('second', entries[1])
+        self.assertIs(entries[0], cache.get('first'))
+        cache.put('third', entries[2])
+
+        self.assertIs(entries[0], cache.get('first'))
+        self.assertIsNone(cache.get('second'))
+        self.assertIs(entries[2], cache.get('third'))
+
+    def test_is_enabled(self):
+        self.assertTrue(ResolutionCache(1, 0, []).is_enabled())
+        self.assertTrue(ResolutionCache(0, 1, []).is_enabled())
+        self.assertFalse(ResolutionCache(0, 0, []).is_enabled())
+
+    def test_put_miss_evicts_least_recently_used_miss(self):
+        cache = ResolutionCache(2, 2, ['method', 'path'])
+
+        cache.put_miss('first')
+        cache.put_miss('second')
+        self.assertTrue(cache.is_known_miss('first'))
+        cache.put_miss('third')
+
+        self.assertTrue(cache.is_known_miss('first'))
+        self.assertFalse(cache.is_known_miss('second'))
+        self.assertTrue(cache.is_known_miss('third'))
+
+    def test_disabled_caches_keep_nothing(self):
+        cache = ResolutionCache(0, 0, ['method', 'path'])
+
+        cache.put('entry', Mock())
+        cache.put_miss('miss')
+
+        self.assertIsNone(cache.get('entry'))
+        self.assertFalse(cache.is_known_miss('miss'))
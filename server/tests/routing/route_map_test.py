@@ -5,8 +5,9 @@ from server.core.rules.matching import RequestMatcher
 from server.core.metrics import MetricRecorder
 from server.core.rules.rewrite.request import RequestRewriter
 from server.core.routing.request_mapper import RequestMapper
-from server.core.har import HarParser
-from server.core.routing import RouteMap, PreProcessor, BrowserOpen
+from server.core.routing import RouteMap, HarLoader, BrowserOpen
+from server.core.routing.resolution_cache import ResolutionCache
+from server.core.rendering import ResponseRenderer
 
 from server.tests.util import fully_qualified_name
 
@@ -14,29 +15,28 @@ from server.tests.util import fully_qualified_name
 class RouteMapTest(unittest.IsolatedAsyncioTestCase):
 
     @patch(fully_qualified_name(BrowserOpen))
+    @patch(fully_qualified_name(ResolutionCache))
+    @patch(fully_qualified_name(ResponseRenderer))
     @patch(fully_qualified_name(MetricRecorder))
-    @patch(fully_qualified_name(PreProcessor))
     @patch(fully_qualified_name(RequestMapper))
     @patch(fully_qualified_name(RequestMatcher))
     @patch(fully_qualified_name(RequestRewriter))
-    @patch(fully_qualified_name(HarParser))
+    @patch(fully_qualified_name(HarLoader))
     async def test_find_entry_for_request(self,
-                                          mock_har_parser: HarParser,
+                                          mock_har_loader: HarLoader,
                                           mock_request_rewriter: RequestRewriter,
                                           mock_request_matcher: RequestMatcher,
                                           mock_request_mapper: RequestMapper,
-                                          mock_pre_processor: PreProcessor,
                                           mock_metric_recorder: MetricRecorder,
+                                          mock_response_renderer: ResponseRenderer,
+                                          mock_resolution_cache: ResolutionCache,
                                           mock_browser_open: BrowserOpen):
 
             mock_browser_open.open_browser_in_background = Mock()
+            mock_resolution_cache.is_enabled = Mock(return_value=False)
 
             har_entry = MagicMock(request=Mock(), response=Mock(), id='entry-id')
-            entries = [har_entry]
-
-            mock_pre_processor.process_content = Mock()
-            har_content = MagicMock(log=MagicMock(entries=entries))
-            mock_har_parser.get_har_file_contents = Mock(return_value=iter([har_content]))
+            mock_har_loader.load = Mock()
 
             incoming_request = Mock()
             mock_request_mapper.map_to_har_request = AsyncMock(return_value=incoming_request)
@@ -44,18 +44,21 @@ class RouteMapTest(unittest.IsolatedAsyncioTestCase):
             rewritten_incoming_request = Mock()
             mock_request_rewriter.apply_browser_request_rewrite_rules = Mock(return_value=rewritten_incoming_request)
 
+            mock_request_matcher.get_replay_cursors = Mock(return_value=None)
             mock_request_matcher.find_matching_entry = Mock(return_value=har_entry)
 
             mock_metric_recorder.record = Mock()
             mock_metric_recorder.is_enabled = Mock(return_value=True)
 
             sut = RouteMap(
-                mock_har_parser,
+                mock_har_loader,
                 mock_request_rewriter,
                 mock_request_matcher,
                 mock_request_mapper,
-                mock_pre_processor,
                 mock_metric_recorder,
+                mock_response_renderer,
+                mock_resolution_cache,
+                Mock(is_enabled=Mock(return_value=False)),
                 mock_browser_open
             )
 
@@ -64,11 +67,218 @@ class RouteMapTest(unittest.IsolatedAsyncioTestCase):
 
             self.assertIsNotNone(actual)
 
-            mock_har_parser.get_har_file_contents.assert_called_once()
+            mock_har_loader.load.assert_called_once()
+            mock_response_renderer.render_entries.assert_called_once_with(mock_request_matcher.get_entries.return_value)
+            mock_request_matcher.freeze_entries.assert_called_once()
             mock_request_mapper.map_to_har_request.assert_called_once_with(request)
             mock_request_rewriter.apply_browser_request_rewrite_rules.assert_called_once_with(incoming_request)
-            mock_request_matcher.find_matching_entry.assert_called_once_with(rewritten_incoming_request)
-            mock_pre_processor.process_content.assert_called_once_with(har_content)
+            mock_request_matcher.find_matching_entry.assert_called_once_with(rewritten_incoming_request, '')
             mock_metric_recorder.is_enabled.assert_called_once()
             mock_metric_recorder.record.assert_called_once_with(har_entry.id, rewritten_incoming_request, har_entry.response)
             mock_browser_open.open_browser_in_background.assert_called_once()
+
+    @patch(fully_qualified_name(BrowserOpen))
+    @patch(fully_qualified_name(ResolutionCache))
+    @patch(fully_qualified_name(ResponseRenderer))
+    @patch(fully_qualified_name(MetricRecorder))
+    @patch(fully_qualified_name(RequestMapper))
+    @patch(fully_qualified_name(RequestMatcher))
+    @patch(fully_qualified_name(RequestRewriter))
+    @patch(fully_qualified_name(HarLoader))
+    async def test_find_entry_for_request_maps_only_key_components(self,
+                                                                   mock_har_loader: HarLoader,
+                                                                   mock_request_rewriter: RequestRewriter,
+                                                                   mock_request_matcher: RequestMatcher,
+                                                                   mock_request_mapper: RequestMapper,
+                                                                   mock_metric_recorder: MetricRecorder,
+                                                                   mock_response_renderer: ResponseRenderer,
+                                                                   mock_resolution_cache: ResolutionCache,
+                                                                   mock_browser_open: BrowserOpen):
+
+            mock_resolution_cache.is_enabled = Mock(return_value=False)
+
+            har_entry = MagicMock(request=Mock(), response=Mock(), id='entry-id')
+
+            key_request = Mock()
+            mock_request_mapper.map_scope_to_key_request = Mock(return_value=key_request)
+
+            rewritten_key_request = Mock()
+            mock_request_rewriter.apply_browser_request_rewrite_rules = Mock(return_value=rewritten_key_request)
+
+            mock_request_matcher.get_enabled_rules = Mock(return_value=['method', 'path'])
+            mock_request_matcher.get_replay_cursors = Mock(return_value=None)
+            mock_request_matcher.find_matching_entry = Mock(return_value=har_entry)
+
+            mock_metric_recorder.is_enabled = Mock(return_value=False)
+
+            sut = RouteMap(
+                mock_har_loader,
+                mock_request_rewriter,
+                mock_request_matcher,
+                mock_request_mapper,
+                mock_metric_recorder,
+                mock_response_renderer,
+                mock_resolution_cache,
+                Mock(is_enabled=Mock(return_value=False)),
+                mock_browser_open
+            )
+
+            request = Mock(body=AsyncMock())
+            actual = await sut.find_entry_for_request(request)
+
+            self.assertEqual(har_entry.response, actual)
+
+            request.body.assert_not_called()
+            mock_request_mapper.map_scope_to_key_request.assert_called_once_with(request.scope, b'', ['method', 'path'], '')
+            mock_request_rewriter.apply_browser_request_rewrite_rules.assert_called_once_with(key_request)
+            mock_request_matcher.find_matching_entry.assert_called_once_with(rewritten_key_request, '')
+            mock_metric_recorder.record.assert_not_called()
+
+    @patch(fully_qualified_name(BrowserOpen))
+    @patch(fully_qualified_name(ResponseRenderer))
+    @patch(fully_qualified_name(MetricRecorder))
+    @patch(fully_qualified_name(RequestMapper))
+    @patch(fully_qualified_name(RequestMatcher))
+    @patch(fully_qualified_name(RequestRewriter))
+    @patch(fully_qualified_name(HarLoader))
+    async def test_find_entry_for_request_serves_cached_entry(self,
+                                                              mock_har_loader: HarLoader,
+                                                              mock_request_rewriter: RequestRewriter,
+                                                              mock_request_matcher: RequestMatcher,
+                                                              mock_request_mapper: RequestMapper,
+                                                              mock_metric_recorder: MetricRecorder,
+                                                              mock_response_renderer: ResponseRenderer,
+                                                              mock_browser_open: BrowserOpen):
+
+            har_entry = MagicMock(request=Mock(), response=Mock(), id='entry-id')
+
+            mock_request_mapper.map_scope_to_key_request = Mock(return_value=Mock())
+            mock_request_rewriter.apply_browser_request_rewrite_rules = Mock(return_value=Mock())
+
+            mock_request_matcher.get_enabled_rules = Mock(return_value=['method', 'path'])
+            mock_request_matcher.get_replay_cursors = Mock(return_value=None)
+            mock_request_matcher.find_matching_entry = Mock(return_value=har_entry)
+
+            mock_metric_recorder.is_enabled = Mock(return_value=False)
+
+            sut = RouteMap(
+                mock_har_loader,
+                mock_request_rewriter,
+                mock_request_matcher,
+                mock_request_mapper,
+                mock_metric_recorder,
+                mock_response_renderer,
+                ResolutionCache(4, 4, ['method', 'path']),
+                Mock(is_enabled=Mock(return_value=False)),
+                mock_browser_open
+            )
+
+            scope = {'method': 'GET', 'path': '/app.js', 'query_string': b'', 'headers': []}
+            first = await sut.find_entry_for_request(Mock(scope=scope))
+            second = await sut.find_entry_for_request(Mock(scope=scope))
+
+            self.assertIs(har_entry.response, first)
+            self.assertIs(har_entry.response, second)
+
+            mock_request_mapper.map_scope_to_key_request.assert_called_once()
+            mock_request_rewriter.apply_browser_request_rewrite_rules.assert_called_once()
+            mock_request_matcher.find_matching_entry.assert_called_once()
+
+    @patch(fully_qualified_name(BrowserOpen))
+    @patch(fully_qualified_name(ResponseRenderer))
+    @patch(fully_qualified_name(MetricRecorder))
+    @patch(fully_qualified_name(RequestMapper))
+    @patch(fully_qualified_name(RequestMatcher))
+    @patch(fully_qualified_name(RequestRewriter))
+    @patch(fully_qualified_name(HarLoader))
+    async def test_find_entry_for_request_caches_only_misses_when_replaying(self,
+                                                                            mock_har_loader: HarLoader,
+                                                                            mock_request_rewriter: RequestRewriter,
+                                                                            mock_request_matcher: RequestMatcher,
+                                                                            mock_request_mapper: RequestMapper,
+                                                                            mock_metric_recorder: MetricRecorder,
+                                                                            mock_response_renderer: ResponseRenderer,
+                                                                            mock_browser_open: BrowserOpen):
+
+            har_entry = MagicMock(request=Mock(), response=Mock(), id='entry-id')
+
+            mock_request_mapper.map_scope_to_key_request = Mock(side_effect=lambda scope, *args: scope['path'])
+            mock_request_rewriter.apply_browser_request_rewrite_rules = Mock(side_effect=lambda request: request)
+
+            mock_request_matcher.get_enabled_rules = Mock(return_value=['method', 'path'])
+            mock_request_matcher.get_replay_cursors = Mock(return_value=Mock(get_client_id=Mock(return_value='client')))
+            mock_request_matcher.find_matching_entry = Mock(
+                side_effect=lambda request, client_id: har_entry if request == '/app.js' else None)
+
+            mock_metric_recorder.is_enabled = Mock(return_value=False)
+
+            sut = RouteMap(
+                mock_har_loader,
+                mock_request_rewriter,
+                mock_request_matcher,
+                mock_request_mapper,
+                mock_metric_recorder,
+                mock_response_renderer,
+                ResolutionCache(4, 4, ['method', 'path']),
+                Mock(is_enabled=Mock(return_value=False)),
+                mock_browser_open
+            )
+
+            for path in ['/app.js', '/app.js', '/missing', '/missing']:
+                scope = {'method': 'GET', 'path': path, 'query_string': b'', 'headers': []}
+                actual = await sut.find_entry_for_request(Mock(scope=scope))
+                self.assertIs(har_entry.response if path == '/app.js' else None, actual)
+
+            self.assertEqual(3, mock_request_matcher.find_matching_entry.call_count)
+
+    @patch(fully_qualified_name(BrowserOpen))
+    @patch(fully_qualified_name(ResolutionCache))
+    @patch(fully_qualified_name(ResponseRenderer))
+    @patch(fully_qualified_name(MetricRecorder))
+    @patch(fully_qualified_name(RequestMapper))
+    @patch(fully_qualified_name(RequestMatcher))
+    @patch(fully_qualified_name(RequestRewriter))
+    @patch(fully_qualified_name(HarLoader))
+    async def test_find_entry_for_request_rewrites_response_lazily(self,
+                                                                   mock_har_loader: HarLoader,
+                                                                   mock_request_rewriter: RequestRewriter,
+                                                                   mock_request_matcher: RequestMatcher,
+                                                                   mock_request_mapper: RequestMapper,
+                                                                   mock_metric_recorder: MetricRecorder,
+                                                                   mock_response_renderer: ResponseRenderer,
+                                                                   mock_resolution_cache: ResolutionCache,
+                                                                   mock_browser_open: BrowserOpen):
+
+            mock_resolution_cache.is_enabled = Mock(return_value=False)
+
+            har_entry = MagicMock(request=Mock(), response=Mock(), id='entry-id')
+            rewritten_response = Mock()
+            mock_lazy_response_rewriter = Mock(
+                is_enabled=Mock(return_value=True),
+                get_response=AsyncMock(return_value=rewritten_response)
+            )
+
+            mock_request_matcher.get_enabled_rules = Mock(return_value=['method', 'path'])
+            mock_request_matcher.get_replay_cursors = Mock(return_value=None)
+            mock_request_matcher.find_matching_entry = Mock(return_value=har_entry)
+
+            mock_metric_recorder.is_enabled = Mock(return_value=False)
+
+            sut = RouteMap(
+                mock_har_loader,
+                mock_request_rewriter,
+                mock_request_matcher,
+                mock_request_mapper,
+                mock_metric_recorder,
+                mock_response_renderer,
+                mock_resolution_cache,
+                mock_lazy_response_rewriter,
+                mock_browser_open
+            )
+
+            actual = await sut.find_entry_for_request(Mock(body=AsyncMock()))
+
+            self.assertEqual(rewritten_response, actual)
+
+            mock_response_renderer.render_entries.assert_not_called()
+            mock_lazy_response_rewriter.get_response.assert_awaited_once_with(har_entry)
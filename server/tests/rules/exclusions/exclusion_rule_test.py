@@ -113,3 +113,35 @@ class ExclusionRuleTest(unittest.TestCase):
             actual = rule.should_filter_out(entry)
 
             self.assertEqual(test_case[2], actual)
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_url_matching_exclusion_rule_with_many_expressions(self, mock_config_loader: ConfigLoader):
+        expression_sets = [
+            ['^https://cdn\\.mock\\.com/', '.*\\.png$', '^https://(a|b)\\.mock\\.com/\\1/', '^https://(www|api)\\.mock\\.com/admin/', '^https://(c\\.)?mock\\.com/(?(1)x|y)/'],
+            ['(?i)^https://CDN\\.mock\\.com/', '.*\\.png$', '^https://(a|b)\\.mock\\.com/\\1/', '^https://(www|api)\\.mock\\.com/admin/', '^https://(c\\.)?mock\\.com/(?(1)x|y)/']
+        ]
+        test_cases = [
+            ('https://cdn.mock.com/app.js', True),
+            ('https://www.mock.com/logo.png', True),
+            ('https://a.mock.com/a/index.html', True),
+            ('https://a.mock.com/b/index.html', False),
+            ('https://api.mock.com/admin/index.html', True),
+            ('https://c.mock.com/x/index.html', True),
+            ('https://c.mock.com/y/index.html', False),
+            ('https://mock.com/y/index.html', True),
+            ('https://www.mock.com/app.js', False)
+        ]
+
+        for expressions in expression_sets:
+            stub_config = AppConfig()
+            stub_config.exclusions.config.removable_url_expressions = expressions
+            mock_config_loader.get_app_config = Mock(return_value=stub_config)
+
+            rule = UrlMatchingExclusionRule()
+            rule.initialize(mock_config_loader)
+
+            for url, expected in test_cases:
+                with self.subTest(expressions=expressions, url=url):
+                    actual = rule.should_filter_out(Mock(request=Mock(url=url)))
+
+                    self.assertEqual(expected, actual)
@@ -1 +1,4 @@
 from .request_matcher_test import RequestMatcherTest as RequestMatcherTest
+from .best_match_test import BestMatchIndexTest as BestMatchIndexTest
+from .replay_test import ReplayCursorsTest as ReplayCursorsTest
+from .path_templates_test import PathTemplateIndexTest as PathTemplateIndexTest
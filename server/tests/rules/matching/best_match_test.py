@@ -0,0 +1,58 @@
+from typing import Dict
+import unittest
+from unittest.mock import MagicMock
+
+from server.core.har import NameValuePair
+from server.core.rules.matching.best_match import BestMatchIndex
+
+
+def _create_entry(entry_id: str, path: str, query_params: Dict[str, str]):
+    return MagicMock(id=entry_id, request=_create_request(path, query_params))
+
+
+def _create_request(path: str, query_params: Dict[str, str]):
+    return MagicMock(
+        method='get',
+        path=path,
+        query_params=[NameValuePair(name=name, value=value) for name, value in query_params.items()],
+        headers=[NameValuePair(name='accept', value='text/html')]
+    )
+
+
+class BestMatchIndexTest(unittest.TestCase):
+
+    def test_find_best_match(self):
+        first = _create_entry('first', '/path', {'page': '1', 'size': '10'})
+        second = _create_entry('second', '/path', {'page': '2', 'size': '10'})
+
+        index = BestMatchIndex(['method', 'path', 'query-params', 'headers'], 10)
+        index.add(first)
+        index.add(second)
+
+        test_cases = [
+            ({'page': '2', 'size': '10', 'cache-buster': '123'}, second),
+            ({'page': '1', 'size': '10', 'cache-buster': '123'}, first),
+            ({'cache-buster': '123'}, first)
+        ]
+
+        for query_params, expected in test_cases:
+            with self.subTest(query_params=query_params):
+                actual = index.find_best_match(_create_request('/path', query_params))
+
+                self.assertIs(expected, actual)
+
+    def test_find_best_match_requires_same_method_and_path(self):
+        index = BestMatchIndex(['method', 'path', 'query-params'], 10)
+        index.add(_create_entry('first', '/path', {'page': '1'}))
+
+        self.assertIsNone(index.find_best_match(_create_request('/other', {'page': '1'})))
+
+    def test_add_limits_candidates(self):
+        first = _create_entry('first', '/path', {'page': '1'})
+        second = _create_entry('second', '/path', {'page': '2'})
+
+        index = BestMatchIndex(['method', 'path', 'query-params'], 1)
+        index.add(first)
+        index.add(second)
+
+        self.assertIs(first, index.find_best_match(_create_request('/path', {'page': '2'})))
@@ -0,0 +1,42 @@
+import unittest
+
+from server.core.rules.matching.path_templates import PathTemplateIndex, InvalidPathTemplateException
+
+
+class PathTemplateIndexTest(unittest.TestCase):
+
+    def test_resolve(self):
+        index = PathTemplateIndex([
+            '/api/items/{id}',
+            '/api/items/latest',
+            '/api/items/{id}/reviews/*',
+            '/static/**',
+            '/api/**'
+        ])
+
+        test_cases = [
+            ('/api/items/12345', '/api/items/{id}'),
+            ('/api/items/latest', '/api/items/latest'),
+            ('/api/items/12345/reviews/9', '/api/items/{id}/reviews/*'),
+            ('/api/items/12345/other', '/api/**'),
+            ('/api/items', '/api/**'),
+            ('/static/js/app.js', '/static/**'),
+            ('/static', '/static/**'),
+            ('/other/12345', None),
+            ('/', None)
+        ]
+
+        for path, expected in test_cases:
+            with self.subTest(path=path):
+                self.assertEqual(expected, index.resolve(path))
+
+    def test_first_equivalent_template_is_kept(self):
+        index = PathTemplateIndex(['/items/{id}', '/items/*'])
+
+        self.assertEqual('/items/{id}', index.resolve('/items/1'))
+
+    def test_invalid_templates_are_rejected(self):
+        for template in ['items/{id}', '/items/**/reviews']:
+            with self.subTest(template=template):
+                with self.assertRaises(InvalidPathTemplateException):
+                    PathTemplateIndex([template])
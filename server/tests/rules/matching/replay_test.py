@@ -0,0 +1,48 @@
+import unittest
+
+from server.core.rules.matching.replay import ReplayCursors
+
+
+def _create_scope(headers=None, client=('10.0.0.1', 5000)):
+    return {'type': 'http', 'headers': headers or [], 'client': client}
+
+
+class ReplayCursorsTest(unittest.TestCase):
+
+    def test_get_client_id(self):
+        test_cases = [
+            (None, _create_scope(), '10.0.0.1'),
+            ('X-Session', _create_scope(), '10.0.0.1'),
+            ('X-Session', _create_scope([(b'x-session', b'abc')]), 'abc'),
+            (None, _create_scope(client=None), '')
+        ]
+
+        for client_header, scope, expected in test_cases:
+            with self.subTest(client_header=client_header, scope=scope):
+                self.assertEqual(expected, ReplayCursors('sequence', client_header, 4).get_client_id(scope))
+
+    def test_next_index(self):
+        test_cases = [
+            ('sequence', [0, 1, 1, 1]),
+            ('round-robin', [0, 1, 0, 1])
+        ]
+
+        for mode, expected in test_cases:
+            with self.subTest(mode=mode):
+                cursors = ReplayCursors(mode, None, 4)
+
+                actual = [cursors.next_index('client', ('get', '/poll'), 2) for _ in expected]
+
+                self.assertEqual(expected, actual)
+                self.assertEqual(0, cursors.next_index('client', ('get', '/other'), 2))
+
+    def test_next_index_evicts_least_recently_used_cursor(self):
+        cursors = ReplayCursors('sequence', None, 2)
+
+        cursors.next_index('first', ('get', '/poll'), 3)
+        cursors.next_index('second', ('get', '/poll'), 3)
+        cursors.next_index('first', ('get', '/poll'), 3)
+        cursors.next_index('third', ('get', '/poll'), 3)
+
+        self.assertEqual(2, cursors.next_index('first', ('get', '/poll'), 3))
+        self.assertEqual(0, cursors.next_index('second', ('get', '/poll'), 3))
@@ -2,8 +2,8 @@ import unittest
 from unittest.mock import patch, Mock, MagicMock
 
 from server.core.config import ConfigLoader, AppConfig
-from server.core.config.models import Matchers
-from server.core.har.models import RequestHashes
+from server.core.config.models import Matchers, MatchingFallback, Replay
+from server.core.har.models import RequestHashes, NameValuePair
 from server.core.rules.matching import RequestMatcher
 
 from server.tests.util import fully_qualified_name
@@ -43,8 +43,164 @@ class RequestMatcherTest(unittest.TestCase):
                 actual = request_matcher.find_matching_entry(request)
 
                 if sub_arguments[2]:
-                    self.assertEqual(har_entry, actual)
+                    self.assertIs(har_entry, actual)
                 else:
                     self.assertIsNone(actual)
 
                 mock_config_loader.get_app_config.assert_called_once()
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_find_matching_entry_only_uses_enabled_rules(self, mock_config_loader: ConfigLoader):
+        test_cases = [
+            ([], 'POST', '/other', True),
+            (['path'], 'POST', '/path', True),
+            (['path'], 'GET', '/other', False),
+            (['method', 'path'], 'POST', '/path', False)
+        ]
+
+        for rules, method, path, should_match in test_cases:
+            with self.subTest(rules=rules, method=method, path=path):
+                mock_config_loader.get_app_config = Mock(return_value=AppConfig(request_matching=Matchers(rules=rules)))
+                hashes = RequestHashes()
+
+                har_entry = MagicMock(request=MagicMock(hashes=hashes, path='/path', method='GET'))
+                request = MagicMock(hashes=hashes, path=path, method=method)
+
+                request_matcher = RequestMatcher(mock_config_loader)
+                request_matcher.accumulate(har_entry)
+
+                actual = request_matcher.find_matching_entry(request)
+
+                if should_match:
+                    self.assertIs(har_entry, actual)
+                else:
+                    self.assertIsNone(actual)
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_find_matching_entry_by_origin(self, mock_config_loader: ConfigLoader):
+        hashes = RequestHashes()
+        first_entry = MagicMock(request=MagicMock(hashes=hashes, origin='cdn-a.com', path='/app.js', method='get'))
+        second_entry = MagicMock(request=MagicMock(hashes=hashes, origin='cdn-b.com', path='/app.js', method='get'))
+
+        test_cases = [
+            ('', 'cdn-a.com', first_entry),
+            ('', 'cdn-b.com', second_entry),
+            ('', '192.168.1.5', first_entry),
+            ('cdn-b.com', 'my-machine', second_entry),
+            ('', '', first_entry),
+            ('cdn-b.com', '', second_entry),
+            ('cdn-c.com', '', first_entry)
+        ]
+
+        for default_origin, origin, expected in test_cases:
+            with self.subTest(default_origin=default_origin, origin=origin):
+                matching_config = Matchers(rules=['origin', 'method', 'path'], default_origin=default_origin)
+                mock_config_loader.get_app_config = Mock(return_value=AppConfig(request_matching=matching_config))
+
+                request_matcher = RequestMatcher(mock_config_loader)
+                self.assertTrue(request_matcher.accumulate(first_entry))
+                self.assertTrue(request_matcher.accumulate(second_entry))
+
+                actual = request_matcher.find_matching_entry(MagicMock(hashes=hashes, origin=origin, path='/app.js', method='get'))
+
+                self.assertIs(expected, actual)
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_find_matching_entry_falls_back_to_best_match(self, mock_config_loader: ConfigLoader):
+        test_cases = [(True, True), (False, False)]
+
+        for fallback_enabled, should_match in test_cases:
+            with self.subTest(fallback_enabled=fallback_enabled):
+                matchers = Matchers(rules=['method', 'path', 'query-params'], fallback=MatchingFallback(enabled=fallback_enabled))
+                mock_config_loader.get_app_config = Mock(return_value=AppConfig(request_matching=matchers))
+
+                har_entry = MagicMock(request=MagicMock(
+                    hashes=RequestHashes(query_params='query'),
+                    path='/path',
+                    method='GET',
+                    query_params=[NameValuePair(name='name', value='value')]
+                ))
+                request = MagicMock(
+                    hashes=RequestHashes(query_params='different'),
+                    path='/path',
+                    method='GET',
+                    query_params=[NameValuePair(name='name', value='value'), NameValuePair(name='buster', value='1')]
+                )
+
+                request_matcher = RequestMatcher(mock_config_loader)
+                request_matcher.accumulate(har_entry)
+
+                actual = request_matcher.find_matching_entry(request)
+
+                if should_match:
+                    self.assertIs(har_entry, actual)
+                else:
+                    self.assertIsNone(actual)
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_find_matching_entry_replays_repeated_requests(self, mock_config_loader: ConfigLoader):
+        test_cases = [
+            ('first', [0, 0, 0, 0], 1),
+            ('sequence', [0, 1, 2, 2], 3),
+            ('round-robin', [0, 1, 2, 0], 3)
+        ]
+
+        for mode, expected_indexes, expected_entry_count in test_cases:
+            with self.subTest(mode=mode):
+                matchers = Matchers(rules=['method', 'path'], replay=Replay(mode=mode))
+                mock_config_loader.get_app_config = Mock(return_value=AppConfig(request_matching=matchers))
+
+                entries = [MagicMock(request=MagicMock(path='/poll', method='get')) for _ in range(3)]
+                request_matcher = RequestMatcher(mock_config_loader)
+                for entry in entries:
+                    request_matcher.accumulate(entry)
+                request_matcher.freeze_entries()
+
+                self.assertEqual(expected_entry_count, len(request_matcher.get_entries()))
+
+                request = MagicMock(path='/poll', method='get')
+                actual = [request_matcher.find_matching_entry(request, 'client') for _ in expected_indexes]
+                self.assertEqual([entries[index] for index in expected_indexes], actual)
+
+                # Each client has its own cursor.
+                self.assertIs(entries[0], request_matcher.find_matching_entry(request, 'other-client'))
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_find_matching_entry_replays_requests_without_origin(self, mock_config_loader: ConfigLoader):
+        matchers = Matchers(rules=['origin', 'method', 'path'], replay=Replay(mode='sequence'))
+        mock_config_loader.get_app_config = Mock(return_value=AppConfig(request_matching=matchers))
+
+        entries = [MagicMock(request=MagicMock(origin='cdn-a.com', path='/poll', method='get')) for _ in range(2)]
+        request_matcher = RequestMatcher(mock_config_loader)
+        for entry in entries:
+            request_matcher.accumulate(entry)
+        request_matcher.freeze_entries()
+
+        request = MagicMock(origin='', path='/poll', method='get')
+        actual = [request_matcher.find_matching_entry(request, 'client') for _ in range(3)]
+
+        self.assertEqual([entries[0], entries[1], entries[1]], actual)
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_find_matching_entry_by_path_template(self, mock_config_loader: ConfigLoader):
+        matchers = Matchers(rules=['method', 'path'], path_templates=['/api/items/{id}'])
+        mock_config_loader.get_app_config = Mock(return_value=AppConfig(request_matching=matchers))
+
+        first_entry = MagicMock(request=MagicMock(path='/api/items/1', method='get'))
+        second_entry = MagicMock(request=MagicMock(path='/api/items/2', method='get'))
+
+        request_matcher = RequestMatcher(mock_config_loader)
+        self.assertTrue(request_matcher.accumulate(first_entry))
+        self.assertFalse(request_matcher.accumulate(second_entry))
+
+        test_cases = [
+            ('/api/items/12345', first_entry),
+            ('/api/items/12345/reviews', None),
+            ('/api/other', None)
+        ]
+
+        for path, expected in test_cases:
+            with self.subTest(path=path):
+                actual = request_matcher.find_matching_entry(MagicMock(path=path, method='get'))
+
+                self.assertIs(expected, actual)
@@ -1,2 +1,4 @@
 from .request_rewriter_test import RequestRewriterTest
 from .request_rewrite_rule_test import RequestRewriteRuleTest
+from .digest_test import DigestTest
+from .multipart_test import MultipartTest
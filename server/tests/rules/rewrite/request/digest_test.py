@@ -0,0 +1,99 @@
+import unittest
+import json
+
+from server.core.har.models import NameValuePair
+from server.core.rules.rewrite.request import (
+    MultipartPart,
+    compile_json_paths,
+    create_digest,
+    digest_bytes,
+    digest_json,
+    digest_multipart,
+    digest_pairs,
+    digest_text
+)
+
+
+class DigestTest(unittest.TestCase):
+
+    def test_digest_pairs_is_stable(self):
+        pairs = [NameValuePair(name='name', value='value')]
+
+        self.assertEqual('eacbf7661ca53c02', digest_pairs(pairs))
+
+    def test_digest_pairs_ignores_order(self):
+        first = [NameValuePair(name='a', value='1'), NameValuePair(name='b', value='2')]
+        second = [NameValuePair(name='b', value='2'), NameValuePair(name='a', value='1')]
+
+        self.assertEqual(digest_pairs(first), digest_pairs(second))
+
+    def test_digest_pairs_is_unambiguous(self):
+        first = [NameValuePair(name='ab', value='c')]
+        second = [NameValuePair(name='a', value='bc')]
+
+        self.assertNotEqual(digest_pairs(first), digest_pairs(second))
+
+    def test_digest_pairs_returns_empty_string_for_no_pairs(self):
+        self.assertEqual('', digest_pairs([]))
+
+    def test_digest_text_is_fixed_width(self):
+        self.assertEqual(16, len(digest_text('')))
+        self.assertEqual(16, len(digest_text('some longer text to digest')))
+
+    def test_digest_json_ignores_key_order_and_whitespace(self):
+        first = json.loads('{"b": [1, {"d": null, "c": "é"}], "a": true}')
+        second = json.loads('{"a":true,"b":[1,{"c":"é","d":null}]}')
+
+        self.assertEqual(digest_json(first), digest_json(second))
+        self.assertNotEqual(digest_json(first), digest_json({'a': True, 'b': [{'c': 'é', 'd': None}, 1]}))
+
+    def test_digest_json_skips_ignored_paths(self):
+        ignored_paths = compile_json_paths(['requestId', 'meta.timestamp', 'items.*.id'])
+        expected = digest_json({'meta': {'page': 1}, 'items': [{'name': 'a'}, {'name': 'b'}]})
+
+        test_cases = [
+            {'requestId': 'abc', 'meta': {'page': 1, 'timestamp': 1}, 'items': [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]},
+            {'requestId': 'xyz', 'meta': {'page': 1, 'timestamp': 2}, 'items': [{'id': 3, 'name': 'a'}, {'name': 'b'}]}
+        ]
+
+        for test_case in test_cases:
+            with self.subTest(test_case=test_case):
+                self.assertEqual(expected, digest_json(test_case, ignored_paths))
+
+        self.assertNotEqual(expected, digest_json({'meta': {'page': 2}, 'items': [{'name': 'a'}, {'name': 'b'}]}, ignored_paths))
+
+    def test_digest_json_applies_wildcard_and_literal_paths_together(self):
+        ignored_paths = compile_json_paths(['items.*.id', 'items.0.name', 'meta.*', 'meta.page.size'])
+
+        first = {'items': [{'id': 1, 'name': 'a', 'kind': 'x'}, {'id': 2, 'name': 'b'}], 'meta': {'page': {'size': 1}}}
+        second = {'items': [{'id': 3, 'name': 'c', 'kind': 'x'}, {'id': 4, 'name': 'b'}], 'meta': {'page': {'size': 2}}}
+
+        self.assertEqual(digest_json(first, ignored_paths), digest_json(second, ignored_paths))
+        self.assertNotEqual(digest_json(first, ignored_paths), digest_json({**first, 'items': [{'kind': 'y'}]}, ignored_paths))
+
+    def test_digest_json_does_not_modify_value(self):
+        value = {'meta': {'timestamp': 1, 'page': 1}}
+
+        digest_json(value, compile_json_paths(['meta.timestamp']))
+
+        self.assertEqual({'meta': {'timestamp': 1, 'page': 1}}, value)
+
+    def test_compile_json_paths_prefers_shorter_paths(self):
+        self.assertEqual({'meta': None}, compile_json_paths(['meta.timestamp', 'meta']))
+        self.assertEqual({'meta': None}, compile_json_paths(['meta', 'meta.timestamp']))
+
+    def test_digest_bytes_matches_incremental_digest(self):
+        digest = create_digest()
+        for chunk in [b'first ', b'second ', b'third']:
+            digest.update(chunk)
+
+        self.assertEqual(digest_bytes(b'first second third'), digest.hexdigest())
+        self.assertEqual('', digest_bytes(b''))
+
+    def test_digest_multipart_ignores_order_and_name_case(self):
+        first = [MultipartPart('Field', b'value'), MultipartPart('upload', b'\x00')]
+        second = [MultipartPart('upload', b'\x00'), MultipartPart('field', b'value')]
+
+        self.assertEqual(digest_multipart(first), digest_multipart(second))
+        self.assertNotEqual(digest_multipart(first), digest_multipart([MultipartPart('field', b'value')]))
+        self.assertEqual('', digest_multipart([]))
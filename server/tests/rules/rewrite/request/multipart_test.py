@@ -0,0 +1,33 @@
+import unittest
+
+from server.core.rules.rewrite.request import MultipartPart, parse_multipart
+
+
+_BODY = (
+    b'--Boundary\r\n'
+    b'Content-Disposition: form-data; name="field"\r\n'
+    b'\r\n'
+    b'value\r\n'
+    b'--Boundary\r\n'
+    b'Content-Disposition: form-data; name=upload; filename="data.bin"\r\n'
+    b'Content-Type: application/octet-stream\r\n'
+    b'\r\n'
+    b'\x00\x01\r\n\x02\r\n'
+    b'--Boundary--\r\n'
+)
+
+
+class MultipartTest(unittest.TestCase):
+
+    def test_parse_multipart(self):
+        expected = [
+            MultipartPart('field', b'value'),
+            MultipartPart('upload', b'\x00\x01\r\n\x02')
+        ]
+
+        self.assertEqual(expected, parse_multipart(_BODY))
+
+    def test_parse_multipart_returns_no_parts_for_non_multipart_body(self):
+        for body in [b'', b'plain text', b'--no-line-break']:
+            with self.subTest(body=body):
+                self.assertEqual([], parse_multipart(body))
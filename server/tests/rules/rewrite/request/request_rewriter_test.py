@@ -2,8 +2,8 @@ import unittest
 from unittest.mock import Mock, patch, PropertyMock, MagicMock
 
 from server.core.config import ConfigLoader, AppConfig
-from server.core.har.models import NameValuePair
-from server.core.rules.rewrite.request import RequestRewriter
+from server.core.har.models import NameValuePair, RequestPostData
+from server.core.rules.rewrite.request import RequestRewriter, MultipartPart, digest_bytes, digest_json, digest_multipart, digest_pairs
 from server.core.rules.base import RuleFailedException
 
 from server.tests.util import fully_qualified_name, fully_qualified_property_name
@@ -22,13 +22,14 @@ class RequestRewriterTest(unittest.TestCase):
 
         stub_config = AppConfig()
         stub_config.rewrite.request.rules = [_RULE_NAME]
+        stub_config.request_matching.rules = ['query-params', 'headers', 'cookies', 'body']
         mock_config_loader.get_app_config = Mock(return_value=stub_config)
 
         expected_request = MagicMock(
             query_params=[NameValuePair(name='query_name', value='query_value')],
             headers=[NameValuePair(name='header_name', value='header_value')],
             cookies=[NameValuePair(name='cookie_name', value='cookie_value')],
-            post_data=MagicMock(mime_type='application/x-www-form-urlencoded', params=[NameValuePair(name='body_name', value='body_value')])
+            post_data=MagicMock(body_digest='', mime_type='application/x-www-form-urlencoded', params=[NameValuePair(name='body_name', value='body_value')])
         )
 
         mock_rule = Mock(
@@ -42,10 +43,10 @@ class RequestRewriterTest(unittest.TestCase):
         actual = RequestRewriter(mock_config_loader).apply_browser_request_rewrite_rules(request)
 
         self.assertEqual(expected_request, actual)
-        self.assertEqual(str(hash('query_name=query_value')), actual.hashes.query_params)
-        self.assertEqual(str(hash('cookie_name=cookie_value')), actual.hashes.cookies)
-        self.assertEqual(str(hash('header_name=header_value')), actual.hashes.headers)
-        self.assertEqual(str(hash('body_name=body_value')), actual.hashes.post_data)
+        self.assertEqual(digest_pairs([NameValuePair(name='query_name', value='query_value')]), actual.hashes.query_params)
+        self.assertEqual(digest_pairs([NameValuePair(name='cookie_name', value='cookie_value')]), actual.hashes.cookies)
+        self.assertEqual(digest_pairs([NameValuePair(name='header_name', value='header_value')]), actual.hashes.headers)
+        self.assertEqual(digest_pairs([NameValuePair(name='body_name', value='body_value')]), actual.hashes.post_data)
 
         mock_config_loader.get_app_config.assert_called_once()
         mock_rule.rewrite_incoming_http_request.assert_called_once_with(request)
@@ -58,13 +59,14 @@ class RequestRewriterTest(unittest.TestCase):
                                                mock_rules: Mock):
         stub_config = AppConfig()
         stub_config.rewrite.request.rules = [_RULE_NAME]
+        stub_config.request_matching.rules = ['query-params', 'headers', 'cookies', 'body']
         mock_config_loader.get_app_config = Mock(return_value=stub_config)
 
         expected_request = MagicMock(
             query_params=[NameValuePair(name='query_name', value='query_value')],
             headers=[NameValuePair(name='header_name', value='header_value')],
             cookies=[NameValuePair(name='cookie_name', value='cookie_value')],
-            post_data=MagicMock(mime_type='application/x-www-form-urlencoded', params=[NameValuePair(name='body_name', value='body_value')])
+            post_data=MagicMock(body_digest='', mime_type='application/x-www-form-urlencoded', params=[NameValuePair(name='body_name', value='body_value')])
         )
 
         mock_rule = Mock(
@@ -78,10 +80,10 @@ class RequestRewriterTest(unittest.TestCase):
         actual = RequestRewriter(mock_config_loader).apply_entry_request_rewrite_rules(request)
 
         self.assertEqual(expected_request, actual)
-        self.assertEqual(str(hash('query_name=query_value')), actual.hashes.query_params)
-        self.assertEqual(str(hash('cookie_name=cookie_value')), actual.hashes.cookies)
-        self.assertEqual(str(hash('header_name=header_value')), actual.hashes.headers)
-        self.assertEqual(str(hash('body_name=body_value')), actual.hashes.post_data)
+        self.assertEqual(digest_pairs([NameValuePair(name='query_name', value='query_value')]), actual.hashes.query_params)
+        self.assertEqual(digest_pairs([NameValuePair(name='cookie_name', value='cookie_value')]), actual.hashes.cookies)
+        self.assertEqual(digest_pairs([NameValuePair(name='header_name', value='header_value')]), actual.hashes.headers)
+        self.assertEqual(digest_pairs([NameValuePair(name='body_name', value='body_value')]), actual.hashes.post_data)
 
         mock_config_loader.get_app_config.assert_called_once()
         mock_rule.rewrite_har_entry_request.assert_called_once_with(request)
@@ -94,6 +96,7 @@ class RequestRewriterTest(unittest.TestCase):
                                                                                              mock_rules: Mock):
         stub_config = AppConfig()
         stub_config.rewrite.request.rules = [_RULE_NAME]
+        stub_config.request_matching.rules = ['query-params', 'headers', 'cookies', 'body']
         mock_config_loader.get_app_config = Mock(return_value=stub_config)
 
         mock_rule = Mock(
@@ -112,3 +115,61 @@ class RequestRewriterTest(unittest.TestCase):
         mock_config_loader.get_app_config.assert_called_once()
         mock_rule.rewrite_incoming_http_request.assert_called_once_with(request)
         mock_rule.rewrite_har_entry_request.assert_not_called()
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_hashes_only_properties_used_for_matching(self, mock_config_loader: ConfigLoader):
+        stub_config = AppConfig()
+        stub_config.request_matching.rules = ['method', 'path', 'headers']
+        mock_config_loader.get_app_config = Mock(return_value=stub_config)
+
+        request = MagicMock(
+            query_params=[NameValuePair(name='query_name', value='query_value')],
+            headers=[NameValuePair(name='header_name', value='header_value')],
+            cookies=[NameValuePair(name='cookie_name', value='cookie_value')]
+        )
+
+        actual = RequestRewriter(mock_config_loader).apply_browser_request_rewrite_rules(request)
+
+        self.assertEqual(digest_pairs([NameValuePair(name='header_name', value='header_value')]), actual.hashes.headers)
+        self.assertEqual('', actual.hashes.query_params)
+        self.assertEqual('', actual.hashes.cookies)
+        self.assertEqual('', actual.hashes.post_data)
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_hashes_json_body_without_ignored_json_paths(self, mock_config_loader: ConfigLoader):
+        stub_config = AppConfig()
+        stub_config.request_matching.rules = ['method', 'path', 'body']
+        stub_config.request_matching.ignored_json_paths = ['requestId']
+        mock_config_loader.get_app_config = Mock(return_value=stub_config)
+
+        rewriter = RequestRewriter(mock_config_loader)
+
+        first = MagicMock(post_data=MagicMock(body_digest='', mime_type='application/json', parsed_json={'requestId': 1, 'query': 'a'}))
+        second = MagicMock(post_data=MagicMock(body_digest='', mime_type='application/json', parsed_json={'query': 'a', 'requestId': 2}))
+
+        first_hash = rewriter.apply_browser_request_rewrite_rules(first).hashes.post_data
+        second_hash = rewriter.apply_browser_request_rewrite_rules(second).hashes.post_data
+
+        self.assertEqual(digest_json({'query': 'a'}), first_hash)
+        self.assertEqual(first_hash, second_hash)
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_hashes_multipart_and_text_bodies(self, mock_config_loader: ConfigLoader):
+        stub_config = AppConfig()
+        stub_config.request_matching.rules = ['body']
+        mock_config_loader.get_app_config = Mock(return_value=stub_config)
+
+        multipart_text = '--b\r\nContent-Disposition: form-data; name="a"\r\n\r\n1\r\n--b--\r\n'
+        test_cases = [
+            (RequestPostData(mimeType='text/plain', text='query { items }'), digest_bytes(b'query { items }')),
+            (RequestPostData(mimeType='multipart/form-data; boundary=b', text=multipart_text), digest_multipart([MultipartPart('a', b'1')])),
+            (RequestPostData(mimeType='multipart/form-data; boundary=b', params=[NameValuePair(name='a', value='1')]), digest_multipart([MultipartPart('a', b'1')])),
+            (RequestPostData(body_digest='precomputed'), 'precomputed'),
+            (RequestPostData(), '')
+        ]
+
+        for post_data, expected in test_cases:
+            with self.subTest(post_data=post_data):
+                actual = RequestRewriter(mock_config_loader).apply_browser_request_rewrite_rules(MagicMock(post_data=post_data))
+
+                self.assertEqual(expected, actual.hashes.post_data)
@@ -1,3 +1,4 @@
 from .rewrite_url_response_rewrite_rule_test import RewriteUrlResponseRewriteRuleTest
 from .response_rewriter_test import ResponseRewriterTest
 from .response_rewrite_rule_test import ResponseRewriteRuleTest
+from .html_stream_test import HtmlStreamRewriterTest
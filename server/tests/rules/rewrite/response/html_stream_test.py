@@ -0,0 +1,101 @@
+from html.parser import HTMLParser
+from typing import List
+import unittest
+
+from server.core.rules.rewrite.response.rules import HtmlStreamRewriter, HtmlTag
+
+
+def _remove_scripts_and_integrity(tag: HtmlTag) -> bool:
+    tag.remove_attribute('integrity')
+    return tag.name != 'script'
+
+
+def _keep_everything(tag: HtmlTag) -> bool:
+    return True
+
+
+class _SpanRecordingParser(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.spans: List[str] = []
+
+    def updatepos(self, i: int, j: int) -> int:
+        if i < j:
+            self.spans.append(self.rawdata[i:j])
+        return super().updatepos(i, j)
+
+
+class HtmlStreamRewriterTest(unittest.TestCase):
+
+    def test_parser_passes_every_token_through_updatepos(self):
+        # The rewriter relies on the undocumented updatepos hook of the parser to copy each token as is. This pins
+        # the behaviour of the supported CPython versions: the spans of a complete document cover it exactly once.
+        html = ('<!DOCTYPE html><html><!-- note --><?pi x?><body a=1>text &amp; &#169<br/><![CDATA[c]]>'
+                '<script>if (a < b) {}</script><style>p{}</style></BODY ></html>')
+
+        parser = _SpanRecordingParser()
+        parser.feed(html)
+        parser.close()
+
+        self.assertEqual(html, ''.join(parser.spans))
+
+
+    def test_feed_preserves_unmodified_content(self):
+        html = ('<!DOCTYPE html><HTML lang=en><!-- note --><!bogus><body class="a &amp; b">'
+                '<p>1 &lt; 2 &#169 &amp</p><br/><img src=x.png><![if IE]><p>ie</p><![endif]></DIV ></body></HTML>')
+
+        rewriter = HtmlStreamRewriter([_remove_scripts_and_integrity])
+        actual = rewriter.feed(html) + rewriter.close()
+
+        self.assertEqual(html, actual)
+
+    def test_feed_preserves_cdata_sections(self):
+        html = '<svg><![CDATA[a<b && c>d]]><text>1</text></svg><math><![CDATA[x]]></math>'
+
+        for chunk_size in [1, len(html)]:
+            with self.subTest(chunk_size=chunk_size):
+                rewriter = HtmlStreamRewriter([_remove_scripts_and_integrity])
+                chunks = [html[index:index + chunk_size] for index in range(0, len(html), chunk_size)]
+                actual = ''.join(rewriter.feed(chunk) for chunk in chunks) + rewriter.close()
+
+                self.assertEqual(html, actual)
+
+    def test_close_preserves_unterminated_script_and_style_content(self):
+        documents = ['<html><body><script>var x = 1', '<style>body{}', '<p>a</p><script>a</scr']
+
+        for html in documents:
+            for chunk_size in [1, len(html)]:
+                with self.subTest(html=html, chunk_size=chunk_size):
+                    rewriter = HtmlStreamRewriter([_keep_everything])
+                    chunks = [html[index:index + chunk_size] for index in range(0, len(html), chunk_size)]
+                    actual = ''.join(rewriter.feed(chunk) for chunk in chunks) + rewriter.close()
+
+                    self.assertEqual(html, actual)
+
+    def test_close_drops_unterminated_content_of_dropped_element(self):
+        rewriter = HtmlStreamRewriter([_remove_scripts_and_integrity])
+        actual = rewriter.feed('<p>a</p><script>var x = 1') + rewriter.close()
+
+        self.assertEqual('<p>a</p>', actual)
+
+    def test_feed_removes_elements_and_attributes(self):
+        html = ('<head><script src="a.js" integrity="sha-1"></script>'
+                '<link rel="stylesheet" integrity="sha-2" href="a.css?x=1&amp;y=2">'
+                '<script>if (a < b && c > d) { a = "</div>"; }</script></head>')
+
+        rewriter = HtmlStreamRewriter([_remove_scripts_and_integrity])
+        actual = rewriter.feed(html) + rewriter.close()
+
+        self.assertEqual('<head><link rel="stylesheet" href="a.css?x=1&amp;y=2"></head>', actual)
+
+    def test_feed_handles_tags_split_across_chunks(self):
+        html = '<div><script integrity="abc">var a = 1;</script><link integrity="def" href="a.css"></div>'
+
+        for chunk_size in range(1, len(html) + 1):
+            with self.subTest(chunk_size=chunk_size):
+                rewriter = HtmlStreamRewriter([_remove_scripts_and_integrity])
+                chunks = [html[index:index + chunk_size] for index in range(0, len(html), chunk_size)]
+                actual = ''.join(rewriter.feed(chunk) for chunk in chunks) + rewriter.close()
+
+                self.assertEqual('<div><link href="a.css"></div>', actual)
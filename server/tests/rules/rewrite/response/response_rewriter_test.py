@@ -3,6 +3,7 @@ from unittest.mock import Mock, patch, PropertyMock
 
 from server.core.config import ConfigLoader, AppConfig
 from server.core.rules.rewrite.response import ResponseRewriter
+from server.core.rules.rewrite.response.rules import rewrite_html
 from server.core.rules.base import RuleFailedException
 
 from server.tests.util import fully_qualified_name, fully_qualified_property_name
@@ -63,3 +64,21 @@ class ResponseRewriterTest(unittest.TestCase):
 
         mock_config_loader.get_app_config.assert_called_once()
         mock_rule.rewrite_response.assert_called_once_with(response)
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_apply_response_rewrite_rules_streams_html_once(self, mock_config_loader: ConfigLoader):
+        stub_config = AppConfig()
+        stub_config.rewrite.response.rules = ['remove-html-script-tags', 'urls-in-response', 'remove-integrity-attribute']
+        mock_config_loader.get_app_config = Mock(return_value=stub_config)
+
+        response = Mock(content=Mock(
+            mime_type='text/html',
+            text='<html><head><link href="https://www.mock.ca/a.css" integrity="abc"/><script></script></head></html>'
+        ))
+
+        with patch('server.core.rules.rewrite.response.response_rewriter.rewrite_html',
+                   wraps=rewrite_html) as mock_rewrite_html:
+            actual = ResponseRewriter(mock_config_loader).apply_response_rewrite_rules(response)
+
+        self.assertEqual('<html><head><link href="http://localhost:8080/a.css" /></head></html>', actual.content.text)
+        mock_rewrite_html.assert_called_once()
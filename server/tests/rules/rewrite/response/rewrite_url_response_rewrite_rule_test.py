@@ -44,6 +44,46 @@ class RewriteUrlResponseRewriteRuleTest(unittest.TestCase):
 
                 mock_config_loader.get_app_config.assert_called_once()
     
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_rewrite_response_content_urls_preserves_origins(self, mock_config_loader: ConfigLoader):
+
+        stub_config = AppConfig()
+        stub_config.rewrite.response.config.excluded_domains = []
+        stub_config.rewrite.response.config.preserve_origins = True
+        mock_config_loader.get_app_config = Mock(return_value=stub_config)
+
+        test_cases = [
+            ('https://www.mock.ca/app.js', f'{_LOCALHOST}/__origin__/www.mock.ca/app.js'),
+            ('http://WWW.mock.com:443', f'{_LOCALHOST}/__origin__/www.mock.com'),
+            ('//www.mock.com/index.html', f'{_LOCALHOST}/__origin__/www.mock.com/index.html')
+        ]
+
+        for url, expected_url in test_cases:
+            with self.subTest(url=url):
+                response = Mock(content=Mock(text=_CONTENT_TEMPLATE.format(url)))
+                rule = RewriteUrlResponseRewriteRule()
+                rule.initialize(mock_config_loader)
+                actual = rule.rewrite_response(response)
+
+                self.assertEqual(_CONTENT_TEMPLATE.format(expected_url), actual.content.text)
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_rewrite_response_content_urls_replaces_every_origin(self, mock_config_loader: ConfigLoader):
+
+        stub_config = AppConfig()
+        stub_config.rewrite.response.config.excluded_domains = ['https://excluded.mock.com']
+        mock_config_loader.get_app_config = Mock(return_value=stub_config)
+
+        content = 'fetch(`https://www.mock.ca/a.js`); "https://excluded.mock.com/b"; //cdn.mock.com:8443/c'
+        expected = 'fetch(`http://localhost:8080/a.js`); "https://excluded.mock.com/b"; http://localhost:8080/c'
+
+        response = Mock(content=Mock(text=content))
+        rule = RewriteUrlResponseRewriteRule()
+        rule.initialize(mock_config_loader)
+        actual = rule.rewrite_response(response)
+
+        self.assertEqual(expected, actual.content.text)
+
     @patch(fully_qualified_name(ConfigLoader))
     def test_rewrite_response_contents_urls_when_orign_has_trailing_colon(self, mock_config_loader: ConfigLoader):
         input_content = 'http://www.testing.ca:'
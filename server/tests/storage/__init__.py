@@ -0,0 +1,2 @@
+from .body_store_test import BodyStoreTest as BodyStoreTest
+from .route_snapshot_test import RouteSnapshotTest as RouteSnapshotTest
@@ -0,0 +1,42 @@
+from pathlib import Path
+import tempfile
+import unittest
+
+from server.core.har import BodyHandle
+from server.core.storage import BodyStore
+
+
+class BodyStoreTest(unittest.TestCase):
+
+    def test_write_and_read(self):
+        body_store = BodyStore()
+
+        first = body_store.write(b'first body')
+        empty = body_store.write(b'')
+        second = body_store.write(b'second body')
+
+        self.assertEqual(b'first body', body_store.read(first))
+        self.assertEqual(b'', body_store.read(empty))
+        self.assertEqual(b'second body', body_store.read(second))
+
+        # Bodies written after the store has been mapped should still be readable.
+        third = body_store.write(b'third body')
+        self.assertEqual(b'third body', body_store.read(third))
+
+    def test_save_and_load(self):
+        body_store = BodyStore()
+        handle = body_store.write(b'first body')
+        body_store.write(b'second body')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bodies_path = Path(temp_dir).joinpath('bodies')
+            body_store.save_to(bodies_path)
+
+            loaded_store = BodyStore()
+            loaded_store.load_from(bodies_path)
+
+            self.assertEqual(b'first body', loaded_store.read(handle))
+            self.assertEqual(b'second body', loaded_store.read(BodyHandle(offset=10, length=11)))
+
+            with self.assertRaises(RuntimeError):
+                loaded_store.write(b'body')
@@ -0,0 +1,136 @@
+from pathlib import Path
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from server.core.config import ConfigLoader, AppConfig, get_root_path, set_root_path
+from server.core.config.models import Matchers
+from server.core.har import HarParser
+from server.core.metrics import MetricRecorder
+from server.core.rules.matching import RequestMatcher
+from server.core.rules.rewrite.request import RequestRewriter
+from server.core.storage import RouteSnapshot, BodyStore
+
+from server.tests.util import fully_qualified_name
+
+
+def _create_entry(path: str, text: str):
+    return {
+        'request': {'method': 'GET', 'url': f'https://www.test.com{path}', 'queryString': [], 'headers': [], 'cookies': []},
+        'response': {'status': 200, 'headers': [], 'cookies': [], 'content': {'mimeType': 'text/plain', 'text': text}}
+    }
+
+
+class RouteSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self._previous_root_path = get_root_path()
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._root_path = Path(self._temp_dir.name)
+        set_root_path(self._root_path)
+
+        self._cache_dir = tempfile.TemporaryDirectory()
+        self._environ_patch = patch.dict(os.environ, {'HAR_SERVER_CACHE_DIR': self._cache_dir.name})
+        self._environ_patch.start()
+
+        self._har_path = self._root_path.joinpath('data.har')
+        entries = [_create_entry('/first', 'First Response'), _create_entry('/second', 'Second é Response')]
+        self._har_path.write_text(json.dumps({'log': {'entries': entries}}), encoding='utf-8')
+        self._config_path = self._root_path.joinpath('_config.yml')
+        self._config_path.write_text('port: 8080\n', encoding='utf-8')
+
+    def tearDown(self):
+        set_root_path(self._previous_root_path)
+        self._environ_patch.stop()
+        self._temp_dir.cleanup()
+        self._cache_dir.cleanup()
+
+    def _create_components(self, mock_config_loader: ConfigLoader):
+        mock_config_loader.get_app_config = Mock(return_value=AppConfig(request_matching=Matchers(rules=['method', 'path'])))
+        har_parser = HarParser()
+        request_rewriter = RequestRewriter(mock_config_loader)
+        request_matcher = RequestMatcher(mock_config_loader)
+        body_store = BodyStore()
+        self.addCleanup(body_store.close)
+        self._metric_recorder = MetricRecorder(mock_config_loader)
+        snapshot = RouteSnapshot(har_parser, request_matcher, body_store, self._metric_recorder)
+        return snapshot, har_parser, request_rewriter, request_matcher, body_store
+
+    def _save_snapshot(self, mock_config_loader: ConfigLoader):
+        snapshot, har_parser, request_rewriter, request_matcher, body_store = self._create_components(mock_config_loader)
+        for entry in har_parser.parse_har_file(self._har_path):
+            entry.request = request_rewriter.apply_entry_request_rewrite_rules(entry.request)
+            entry.response.body_handle = body_store.write(entry.response.content.text.encode('utf-8'))
+            entry.response.content.text = ''
+            request_matcher.accumulate(entry)
+        self._metric_recorder.record_duplicate_body(4)
+        snapshot.save()
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_save_and_load(self, mock_config_loader: ConfigLoader):
+        self._save_snapshot(mock_config_loader)
+
+        snapshot, _, _, request_matcher, body_store = self._create_components(mock_config_loader)
+        actual = snapshot.load()
+
+        self.assertTrue(actual)
+        entries = request_matcher.get_entries()
+        self.assertEqual(2, len(entries))
+        self.assertEqual('/first', entries[0].request.path)
+        self.assertEqual('First Response'.encode('utf-8'), body_store.read(entries[0].response.body_handle))  # type: ignore
+        self.assertEqual('Second é Response'.encode('utf-8'), body_store.read(entries[1].response.body_handle))  # type: ignore
+        self.assertEqual({'duplicate_bodies': 1, 'bytes_saved': 4}, self._metric_recorder.get_body_deduplication())
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_save_writes_to_cache_dir_and_removes_stale_snapshots(self, mock_config_loader: ConfigLoader):
+        self._save_snapshot(mock_config_loader)
+        snapshot_dir = next(Path(self._cache_dir.name).iterdir())
+        # The in-progress temporary file of another builder must survive the removal of stale snapshots.
+        other_builder_temp_file = snapshot_dir.joinpath('other.index.abc123.tmp')
+        other_builder_temp_file.write_bytes(b'')
+        self._config_path.write_text('port: 8081\n', encoding='utf-8')
+        self._save_snapshot(mock_config_loader)
+
+        self.assertEqual({'data.har', '_config.yml'}, {path.name for path in self._root_path.iterdir()})
+        fingerprint = self._create_components(mock_config_loader)[0].compute_fingerprint()
+        self.assertEqual(
+            {fingerprint + '.index', fingerprint + '.bodies', other_builder_temp_file.name},
+            {path.name for path in snapshot_dir.iterdir()}
+        )
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_is_up_to_date(self, mock_config_loader: ConfigLoader):
+        snapshot, _, _, request_matcher, _ = self._create_components(mock_config_loader)
+        self.assertFalse(snapshot.is_up_to_date())
+
+        self._save_snapshot(mock_config_loader)
+
+        self.assertTrue(snapshot.is_up_to_date())
+        self.assertEqual(0, len(request_matcher.get_entries()))
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_load_returns_false_when_snapshot_is_missing(self, mock_config_loader: ConfigLoader):
+        snapshot, _, _, request_matcher, _ = self._create_components(mock_config_loader)
+
+        self.assertFalse(snapshot.load())
+        self.assertEqual(0, len(request_matcher.get_entries()))
+
+    @patch(fully_qualified_name(ConfigLoader))
+    def test_load_returns_false_when_inputs_change(self, mock_config_loader: ConfigLoader):
+        test_cases = [
+            ('har file', lambda: self._har_path.write_text('{"log": {"entries": []}}', encoding='utf-8')),
+            ('config file', lambda: self._config_path.write_text('port: 8081\n', encoding='utf-8')),
+            ('new har file', lambda: self._root_path.joinpath('other.har').write_text('{"log": {"entries": []}}', encoding='utf-8'))
+        ]
+
+        for name, change in test_cases:
+            with self.subTest(changed=name):
+                self._save_snapshot(mock_config_loader)
+                change()
+
+                snapshot, _, _, request_matcher, _ = self._create_components(mock_config_loader)
+
+                self.assertFalse(snapshot.load())
+                self.assertEqual(0, len(request_matcher.get_entries()))
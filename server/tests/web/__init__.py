@@ -1 +1,2 @@
 from .response_transformer_test import ResponseTransformerTest
+from .dependencies_test import DependenciesTests
@@ -0,0 +1,59 @@
+from typing import Annotated
+from functools import lru_cache
+import unittest
+
+from fastapi import Depends
+
+from server.core.dependencies import UnresolvableDependencyException, resolve_dependency
+
+
+class _Leaf:
+    pass
+
+
+class _Branch:
+
+    def __init__(self, leaf: _Leaf):
+        self.leaf = leaf
+
+
+class _Root:
+
+    def __init__(self, leaf: _Leaf, branch: _Branch):
+        self.leaf = leaf
+        self.branch = branch
+
+
+@lru_cache()
+def _with_leaf() -> _Leaf:
+    return _Leaf()
+
+
+@lru_cache()
+def _with_branch(leaf: Annotated[_Leaf, Depends(_with_leaf)]) -> _Branch:
+    return _Branch(leaf)
+
+
+@lru_cache()
+def _with_root(leaf: Annotated[_Leaf, Depends(_with_leaf)],
+               branch: Annotated[_Branch, Depends(_with_branch)]) -> _Root:
+    return _Root(leaf, branch)
+
+
+def _with_unannotated(leaf: _Leaf) -> _Branch:
+    return _Branch(leaf)
+
+
+class DependenciesTests(unittest.TestCase):
+
+    def test_resolve_dependency_shares_instances_with_keyword_calls(self):
+        root = resolve_dependency(_with_root)
+
+        self.assertIs(root.leaf, root.branch.leaf)
+        self.assertIs(root.leaf, _with_leaf())
+        self.assertIs(root.branch, _with_branch(leaf=root.leaf))
+        self.assertIs(root, resolve_dependency(_with_root))
+
+    def test_resolve_dependency_raises_for_parameter_without_depends(self):
+        with self.assertRaises(UnresolvableDependencyException):
+            resolve_dependency(_with_unannotated)
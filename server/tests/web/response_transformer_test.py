@@ -2,6 +2,8 @@ import unittest
 from unittest.mock import Mock
 
 from server.core.har import NameValuePair
+from server.core.har.models import BodyHandle, RenderedResponse
+from server.core.rendering import ResponseRenderer
 from server.core.web.response_transformer import ResponseTransformer
 
 
@@ -15,10 +17,12 @@ class ResponseTransformerTest(unittest.TestCase):
                 mime_type='text/plain'
             ),
             headers=[NameValuePair(name='header-name', value='header-value')],
-            cookies=[NameValuePair(name='cookie-name', value='cookie-value')]
+            cookies=[NameValuePair(name='cookie-name', value='cookie-value')],
+            body_handle=None,
+            rendered=None
         )
 
-        actual = ResponseTransformer().map_to_fastapi_response(initial_response)
+        actual = ResponseTransformer(ResponseRenderer(Mock())).map_to_fastapi_response(initial_response)
 
         self.assertEqual(initial_response.status, actual.status_code)
         self.assertEqual(initial_response.content.mime_type, actual.media_type)
@@ -37,12 +41,53 @@ class ResponseTransformerTest(unittest.TestCase):
                 mime_type='image/png'
             ),
             headers=[NameValuePair(name='header-name', value='header-value')],
-            cookies=[NameValuePair(name='cookie-name', value='cookie-value')]
+            cookies=[NameValuePair(name='cookie-name', value='cookie-value')],
+            body_handle=None,
+            rendered=None
         )
 
-        actual = ResponseTransformer().map_to_fastapi_response(initial_response)
+        actual = ResponseTransformer(ResponseRenderer(Mock())).map_to_fastapi_response(initial_response)
 
         self.assertIsNotNone(actual)
         self.assertEqual('response_content', actual.body.decode('utf-8'))  # type: ignore
         self.assertEqual(initial_response.status, actual.status_code)
         self.assertEqual(initial_response.content.mime_type, actual.media_type)
+
+    def test_map_to_fastapi_response_reads_body_from_body_store(self):
+        body_handle = BodyHandle(offset=10, length=16)
+        initial_response = Mock(
+            status=200,
+            content=Mock(
+                encoding='base64',
+                text='',
+                mime_type='image/png'
+            ),
+            headers=[],
+            cookies=[],
+            body_handle=body_handle,
+            rendered=None
+        )
+        body_store = Mock(read=Mock(return_value=b'response_content'))
+
+        actual = ResponseTransformer(ResponseRenderer(body_store)).map_to_fastapi_response(initial_response)
+
+        self.assertEqual(b'response_content', actual.body)
+        body_store.read.assert_called_once_with(body_handle)
+
+    def test_map_to_fastapi_response_uses_rendered_response(self):
+        rendered = RenderedResponse(
+            status=201,
+            media_type='text/plain',
+            raw_headers=[(b'header-name', b'header-value')],
+            body=b'rendered'
+        )
+        initial_response = Mock(body_handle=None, rendered=rendered)
+        response_renderer = Mock(get_body=Mock(return_value=b'rendered'))
+
+        actual = ResponseTransformer(response_renderer).map_to_fastapi_response(initial_response)
+
+        self.assertEqual(201, actual.status_code)
+        self.assertEqual(b'rendered', actual.body)
+        self.assertEqual([(b'header-name', b'header-value')], actual.raw_headers)
+        self.assertIsNot(rendered.raw_headers, actual.raw_headers)
+        response_renderer.render.assert_not_called()